@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,7 +12,16 @@ from ai_bom.core.security import get_current_user
 from ai_bom.core.rbac import require_project_role
 from ai_bom.db.models import BOM, BOMVersion, Project, User
 from ai_bom.db.session import get_session
+from ai_bom.services.bom_digest import version_digest
 from ai_bom.services.exporter import export_bom
+from ai_bom.services.signer import (
+    MERKLE_SIGNATURE_ALGORITHM,
+    component_proof,
+    signatures_valid,
+    signed_digests,
+    verify_component_proof,
+    verify_signed_digests,
+)
 from ai_bom.services.storage import (
     presign_put,
     presign_get,
@@ -57,6 +66,11 @@ class BOMIn(BaseModel):
     parent_bom: str | None = None
 
 
+class SignatureCheckOut(BaseModel):
+    ok: bool
+    signatures: list[dict]
+
+
 class BOMOut(BaseModel):
     id: str
     project_id: str
@@ -68,10 +82,25 @@ class BOMOut(BaseModel):
     created_at: datetime
 
 
+def _bom_out(version: BOMVersion, project_id: str, name: str, description: str | None) -> BOMOut:
+    return BOMOut(
+        id=version.id,
+        project_id=project_id,
+        name=name,
+        version=version.version,
+        description=description,
+        components=version.components if isinstance(version.components, list) else [],
+        signatures=version.signatures,
+        created_at=version.created_at,
+    )
+
+
 @router.post("/projects/{project_id}/boms", response_model=BOMOut, status_code=201)
 async def create_bom(
     project_id: str,
     data: BOMIn,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
     _: User = Depends(lambda project_id=Depends(lambda: None): None),
@@ -82,50 +111,76 @@ async def create_bom(
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
-    bom = BOM(project_id=project_id, name=data.name, description=data.description, created_by=user.id)
-    session.add(bom)
-    await session.flush()
     version = BOMVersion(
-        bom_id=bom.id,
         version=data.version,
         components=[c.model_dump() for c in data.components],
         evaluations=[e.model_dump() for e in (data.evaluations or [])],
         risk_assessment=data.risk_assessment,
         signatures=data.signatures,
     )
+    version.digest = version_digest(data.name, data.description, version)
+    if data.signatures:
+        # Signatures cover the document as the client sent it, before BOMIn drops or fills in fields.
+        version.signed_digests = signed_digests(await request.json()) or None
+    # An identical re-upload (same content and signatures) returns the version already stored.
+    result = await session.execute(
+        select(BOMVersion, BOM.name, BOM.description)
+        .join(BOM, BOMVersion.bom_id == BOM.id)
+        .where(BOM.project_id == project_id, BOMVersion.digest == version.digest)
+    )
+    for existing, name, description in result.all():
+        if (existing.signatures or None) == (data.signatures or None) and existing.signed_digests == version.signed_digests:
+            await write_audit_log(session, project_id=project_id, actor_id=user.id, entity_type="BOM", entity_id=existing.bom_id, action="CREATE", data={"version_id": existing.id, "digest": existing.digest, "duplicate": True})
+            response.status_code = status.HTTP_200_OK
+            return _bom_out(existing, project_id, name, description)
+
+    bom = BOM(project_id=project_id, name=data.name, description=data.description, created_by=user.id)
+    session.add(bom)
+    await session.flush()
+    version.bom_id = bom.id
     session.add(version)
     await session.commit()
-    await write_audit_log(session, project_id=project_id, actor_id=user.id, entity_type="BOM", entity_id=bom.id, action="CREATE", data={"version_id": version.id})
+    await write_audit_log(session, project_id=project_id, actor_id=user.id, entity_type="BOM", entity_id=bom.id, action="CREATE", data={"version_id": version.id, "digest": version.digest})
 
-    return BOMOut(
-        id=version.id,
-        project_id=project_id,
-        name=bom.name,
-        version=version.version,
-        description=bom.description,
-        components=version.components if isinstance(version.components, list) else [],
-        signatures=version.signatures,
-        created_at=version.created_at,
-    )
+    return _bom_out(version, project_id, bom.name, bom.description)
 
 
-@router.get("/boms/{version_id}", response_model=BOMOut)
-async def get_bom(version_id: str, session: AsyncSession = Depends(get_session), user: User = Depends(get_current_user)) -> Any:
+async def _load_version(session: AsyncSession, version_id: str) -> tuple[BOMVersion, str, str, str | None]:
+    """The version with its project id, name and description.
+
+    Read-only: a digest the backfill has not reached yet stays ``None`` here.
+    """
     result = await session.execute(select(BOMVersion, BOM.project_id, BOM.name, BOM.description).join(BOM, BOMVersion.bom_id == BOM.id).where(BOMVersion.id == version_id))
     row = result.first()
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="BOM not found")
     version, project_id, name, description = row
-    return BOMOut(
-        id=version.id,
-        project_id=project_id,
-        name=name,
-        version=version.version,
-        description=description,
-        components=version.components if isinstance(version.components, list) else [],
-        signatures=version.signatures,
-        created_at=version.created_at,
-    )
+    return version, project_id, name, description
+
+
+@router.get("/boms/{version_id}", response_model=BOMOut)
+async def get_bom(version_id: str, request: Request, response: Response, session: AsyncSession = Depends(get_session), user: User = Depends(get_current_user)) -> Any:
+    version, project_id, name, description = await _load_version(session, version_id)
+    if version.digest is not None:
+        # Versions are immutable, so the content digest is a strong validator for this URL.
+        etag = f'"{version.digest}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+    return _bom_out(version, project_id, name, description)
+
+
+@router.get("/boms/{version_id}/signatures/verify", response_model=SignatureCheckOut)
+async def verify_bom_signatures(version_id: str, session: AsyncSession = Depends(get_session), user: User = Depends(get_current_user)) -> Any:
+    """Check the stored signatures against the digests of the document they were uploaded with.
+
+    Versions uploaded before those digests were recorded report each signature
+    as unverifiable rather than invalid.
+    """
+    version, project_id, _, _ = await _load_version(session, version_id)
+    await require_project_role(project_id, ["owner", "editor", "viewer"], session=session, user=user)
+    results = verify_signed_digests(version.signatures or [], version.signed_digests or {})
+    return SignatureCheckOut(ok=signatures_valid(results), signatures=results)
 
 
 @router.get("/boms/{version_id}/export")
@@ -135,11 +190,7 @@ async def export_bom_endpoint(
     session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
 ) -> Any:
-    result = await session.execute(select(BOMVersion, BOM.name).join(BOM, BOMVersion.bom_id == BOM.id).where(BOMVersion.id == version_id))
-    row = result.first()
-    if not row:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="BOM not found")
-    version, name = row
+    version, _, name, _ = await _load_version(session, version_id)
     bom = {
         "bom_id": version.id,
         "project_id": "",
@@ -150,10 +201,40 @@ async def export_bom_endpoint(
         "created_by": "api",
         "created_at": version.created_at.replace(tzinfo=timezone.utc).isoformat(),
     }
-    out_path = export_bom(bom, format)
+    # The export embeds the version id and signatures, so key on those as well as the content.
+    # Not cached until the backfill has set the digest.
+    cache_key = f"{version.digest[:16]}-{version.id}-{len(version.signatures or [])}" if version.digest else None
+    out_path = export_bom(bom, format, cache_key=cache_key)
     return {"path": out_path}
 
 
+@router.get("/boms/{version_id}/components/{component_id}/proof")
+async def get_component_proof(version_id: str, component_id: str, session: AsyncSession = Depends(get_session), user: User = Depends(get_current_user)) -> Any:
+    result = await session.execute(select(BOMVersion, BOM.project_id).join(BOM, BOMVersion.bom_id == BOM.id).where(BOMVersion.id == version_id))
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="BOM not found")
+    version, project_id = row
+    await require_project_role(project_id, ["owner", "editor", "viewer"], session=session, user=user)
+    components = version.components if isinstance(version.components, list) else []
+    index = next((i for i, c in enumerate(components) if c.get("component_id") == component_id), None)
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Component not found")
+    merkle = [s for s in version.signatures or [] if s.get("algorithm") == MERKLE_SIGNATURE_ALGORITHM]
+    if not merkle or "header_hash" not in (merkle[-1].get("merkle") or {}):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="BOM has no Merkle signature")
+    # Only the components are stored, so the header hash comes from the signature record;
+    # a wrong one fails verification rather than producing a false proof.
+    bom = {"bom_id": version.id, "components": components, "signatures": version.signatures}
+    return component_proof(bom, index, header_hex=merkle[-1]["merkle"]["header_hash"])
+
+
+@router.post("/proofs/verify", response_model=SignatureCheckOut)
+async def verify_proof(proof: dict, user: User = Depends(get_current_user)) -> Any:
+    results = verify_component_proof(proof)
+    return SignatureCheckOut(ok=signatures_valid(results), signatures=results)
+
+
 @router.post("/projects/{project_id}/uploads/presign")
 async def create_presigned_upload(project_id: str, key: str, mime: str | None = None, size_bytes: int | None = None, user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)) -> Any:
     await require_project_role(project_id, ["owner", "editor"], session=session, user=user)
@@ -1,21 +1,149 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from starlette.concurrency import run_in_threadpool
 
-from ai_bom.services.scanner import scan_repository
+from ai_bom.core.config import get_settings
+from ai_bom.services.results import iter_result
+from ai_bom.services.scan_jobs import FINISHED_STATES, JOB_SUCCEEDED, ScanJobs, get_scan_jobs
+from ai_bom.services.scanner import ScanOptions
 
 
 router = APIRouter()
 
+EVENT_INTERVAL_SECONDS = 0.5
+
+
+class ScanRequestOptions(BaseModel):
+    """The :class:`ScanOptions` an API client may set; the rest keep their defaults.
+
+    Strategies that read whole datasets, extra digest algorithms, merkle and
+    backend tuning are left out, and the hashing threads and archive limits are
+    capped by the server settings, so one request cannot pin a worker.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    jobs: int | None = Field(default=None, ge=1)
+    dataset_strategy: Literal["head", "sampled"] = "head"
+    trust_cas: bool = True
+    use_git_index: bool = False
+    include_untracked: bool = False
+    sniff_no_suffix: bool = True
+    extract_metadata: bool = True
+    scan_archives: bool = False
+    archive_max_depth: int | None = Field(default=None, ge=1)
+    archive_max_bytes: int | None = Field(default=None, gt=0)
+    deterministic: bool = False
+
+    def to_scan_options(self) -> ScanOptions:
+        settings = get_settings()
+        # Hashing threads and archive limits come from the server's budget, not the client's request.
+        limits = {
+            "jobs": min(self.jobs or settings.scan_max_jobs, settings.scan_max_jobs),
+            "archive_max_depth": min(self.archive_max_depth or settings.scan_max_archive_depth, settings.scan_max_archive_depth),
+            "archive_max_bytes": min(self.archive_max_bytes or settings.scan_max_archive_bytes, settings.scan_max_archive_bytes),
+        }
+        return ScanOptions(**{**self.model_dump(exclude=set(limits)), **limits})
+
 
 class ScanRequest(BaseModel):
     dir: str = "."
+    options: ScanRequestOptions = Field(default_factory=ScanRequestOptions)
+
+
+async def _get_job(jobs: ScanJobs, job_id: str, include_result: bool = True) -> dict[str, Any]:
+    job = await run_in_threadpool(jobs.get, job_id, include_result)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scan job not found")
+    return job
+
+
+@router.post("/scan", status_code=status.HTTP_202_ACCEPTED)
+async def scan(data: ScanRequest, jobs: ScanJobs = Depends(get_scan_jobs)) -> Any:
+    job_id = await run_in_threadpool(jobs.submit, data.dir, data.options.to_scan_options())
+    return {
+        "job_id": job_id,
+        "status_url": f"/api/v1/scan/{job_id}",
+        "events_url": f"/api/v1/scan/{job_id}/events",
+        "result_url": f"/api/v1/scan/{job_id}/result",
+    }
+
+
+@router.get("/scan/{job_id}")
+async def scan_status(job_id: str, jobs: ScanJobs = Depends(get_scan_jobs)) -> Any:
+    return await _get_job(jobs, job_id, include_result=False)
+
+
+@router.get("/scan/{job_id}/result")
+async def scan_result(job_id: str, request: Request, jobs: ScanJobs = Depends(get_scan_jobs)) -> Any:
+    """The BOM of a finished scan, streamed from the result store when the job left a reference.
+
+    Stored payloads are gzip-compressed and sent as-is to clients that accept gzip.
+    """
+    job = await _get_job(jobs, job_id)
+    if job["status"] != JOB_SUCCEEDED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Scan job is {job['status']}")
+    ref = job.get("result_ref")
+    if ref is None:
+        return JSONResponse(job["result"])
+    etag = f'"{ref["digest"]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    gzip_ok = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {"ETag": etag}
+    if gzip_ok:
+        headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(ref["stored_size"])
+    else:
+        headers["Content-Length"] = str(ref["size"])
+    return StreamingResponse(iter_result(ref, decompress=not gzip_ok), media_type="application/json", headers=headers)
+
+
+@router.get("/scan/{job_id}/events")
+async def scan_events(
+    job_id: str,
+    request: Request,
+    cancel_on_disconnect: bool = True,
+    jobs: ScanJobs = Depends(get_scan_jobs),
+) -> StreamingResponse:
+    """Server-sent ``progress`` events until the job finishes, then one ``done`` event.
+
+    Closing the stream before the job finishes cancels it unless ``cancel_on_disconnect=false``.
+    """
+    await _get_job(jobs, job_id, include_result=False)
+
+    async def stream() -> AsyncIterator[str]:
+        finished = False
+        try:
+            while not finished:
+                if await request.is_disconnected():
+                    break
+                job = await _get_job(jobs, job_id, include_result=False)
+                finished = job["status"] in FINISHED_STATES
+                yield f"event: {'done' if finished else 'progress'}\ndata: {json.dumps(job)}\n\n"
+                if not finished:
+                    await asyncio.sleep(EVENT_INTERVAL_SECONDS)
+        finally:
+            if not finished and cancel_on_disconnect:
+                await run_in_threadpool(jobs.cancel, job_id)
 
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-@router.post("/scan")
-async def scan(data: ScanRequest) -> Any:
-    return scan_repository(data.dir)
 
+@router.delete("/scan/{job_id}")
+async def cancel_scan(job_id: str, jobs: ScanJobs = Depends(get_scan_jobs)) -> Any:
+    await _get_job(jobs, job_id, include_result=False)
+    await run_in_threadpool(jobs.cancel, job_id)
+    return await _get_job(jobs, job_id, include_result=False)
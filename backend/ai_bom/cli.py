@@ -1,23 +1,42 @@
 from __future__ import annotations
 
+import contextlib
+import filecmp
 import json
 import os
 import pathlib
 import sys
+import time
 import uuid
+from collections.abc import Iterable
 from datetime import datetime, timezone
-from typing import Optional
+from typing import TextIO
 
 import typer
+from pydantic import ValidationError
 
 from ai_bom.core.config import get_settings
-from ai_bom.services.scanner import scan_repository
+from ai_bom.services.bulk_verify import expand_targets, verify_many
+from ai_bom.services.cache import CACHE_FILENAME, FingerprintCache
+from ai_bom.services.component_table import dump_json
+from ai_bom.services.fingerprint_verify import verify_fingerprints
+from ai_bom.services.identity import ensure_project_config
+from ai_bom.services.remote_cache import get_remote_cache
+from ai_bom.services.scanner import ScanOptions, bom_header, iter_components, scan_repository
 from ai_bom.services.signer import (
+    component_proof,
     compute_bom_hash,
+    detached_signature_path,
     ed25519_keygen,
     load_private_key,
+    load_public_key,
+    read_detached_signature,
     sign_bom,
+    sign_detached,
+    signatures_valid,
     verify_bom_signature,
+    verify_component_proof,
+    verify_detached,
 )
 from ai_bom.services.exporter import export_bom
 
@@ -35,7 +54,7 @@ def init(dir: str = ".") -> None:
     keys_dir.mkdir(parents=True, exist_ok=True)
     sample_bom = {
         "bom_id": str(uuid.uuid4()),
-        "project_id": str(uuid.uuid4()),
+        "project_id": ensure_project_config(base),
         "name": "sample-model",
         "version": "0.1.0",
         "description": "Sample AI-BOM",
@@ -47,12 +66,161 @@ def init(dir: str = ".") -> None:
     typer.echo(f"Initialized ai-bom in {base}")
 
 
+def _write_json_stream(out: TextIO, header: dict, components: Iterable[dict]) -> int:
+    out.write("{\n")
+    out.writelines(f"  {json.dumps(key)}: {json.dumps(value)},\n" for key, value in header.items())
+    out.write('  "components": [')
+    count = 0
+    for component in components:
+        out.write(",\n    " if count else "\n    ")
+        out.write(json.dumps(component))
+        out.flush()
+        count += 1
+    out.write("\n  ]\n}\n" if count else "]\n}\n")
+    return count
+
+
+def _write_ndjson(out: TextIO, header: dict, components: Iterable[dict]) -> int:
+    out.write(json.dumps({"header": header}) + "\n")
+    count = 0
+    for component in components:
+        out.write(json.dumps({"component": component}) + "\n")
+        out.flush()
+        count += 1
+    footer = {"component_count": count, "completed_at": datetime.now(timezone.utc).isoformat()}
+    out.write(json.dumps({"footer": footer}) + "\n")
+    return count
+
+
+def _write_bom(path: pathlib.Path, bom: dict, keep_identical: bool = False) -> bool:
+    """Write ``bom`` as indented JSON; with ``keep_identical`` an identical existing file is left alone.
+
+    Returns True when the file was already up to date.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as out:
+        dump_json(bom, out, indent=2)
+    if keep_identical and path.is_file() and filecmp.cmp(tmp, path, shallow=False):
+        # Leave the file (and its mtime) alone so downstream steps keyed on it stay cached.
+        tmp.unlink()
+        return True
+    os.replace(tmp, path)
+    return False
+
+
 @app.command()
-def scan(dir: str = ".", output: str = "bom.json") -> None:
+def scan(
+    dir: str = ".",
+    output: str = typer.Option("bom.json", help="Output path, or - for stdout"),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse fingerprints from .ai-bom/fingerprints.db"),
+    remote_cache: bool = typer.Option(
+        False,
+        "--remote-cache",
+        help="Share full-file fingerprints through the configured remote cache (REMOTE_CACHE_*). Hits are matched"
+        " on path, size and sampled blocks, so a same-size edit elsewhere can reuse a stale digest; they are"
+        ' tagged "source": "remote-cache" in the BOM',
+    ),
+    jobs: int = typer.Option(0, "--jobs", "-j", help="Hashing threads (0 = one per CPU)"),
+    format: str = typer.Option("json", "--format", help="json|ndjson; ndjson always streams"),
+    stream: bool = typer.Option(False, "--stream", help="Write components as they are fingerprinted"),
+    algorithms: str = typer.Option(
+        "sha256", "--algorithms", help="Comma-separated digests computed in one read: sha256,sha512,blake2b"
+    ),
+    model_algorithm: str = typer.Option("sha256", help="Model fingerprint algorithm: sha256|sha256-merkle"),
+    merkle_chunk_mb: int = typer.Option(8, help="Chunk size in MiB for sha256-merkle"),
+    merkle_chunks: bool = typer.Option(False, "--merkle-chunks", help="Record sha256-merkle leaf hashes in the BOM"),
+    hash_backend: str = typer.Option("readinto", help="File read strategy for hashing: readinto|mmap"),
+    drop_page_cache: bool = typer.Option(False, "--drop-page-cache", help="Release hashed pages from the OS page cache"),
+    dataset_strategy: str = typer.Option("head", help="Dataset fingerprint strategy: head|sampled|full|cdc"),
+    dataset_strategy_for: list[str] = typer.Option(
+        [], "--dataset-strategy-for", help="GLOB=STRATEGY override for matching dataset paths (repeatable)"
+    ),
+    dataset_samples: int = typer.Option(16, help="Evenly spaced blocks hashed by the sampled strategy"),
+    cdc_avg_kb: int = typer.Option(1024, "--cdc-avg-kb", help="Average content-defined chunk size for the cdc strategy (KiB)"),
+    trust_cas: bool = typer.Option(
+        True, "--trust-cas/--no-trust-cas", help="Take digests from git-lfs pointers, HF cache blobs and .dvc files"
+    ),
+    verify_cas: float = typer.Option(0.0, "--verify-cas", help="Fraction of trusted digests to re-hash (0-1)"),
+    git_index: bool = typer.Option(False, "--git-index", help="Enumerate tracked files from .git/index"),
+    untracked: bool = typer.Option(
+        False, "--untracked/--no-untracked", help="With --git-index, also list directories for untracked files"
+    ),
+    archives: bool = typer.Option(False, "--archives", help="Stream zip/tar members and list them as child components"),
+    archive_max_depth: int = typer.Option(2, "--archive-max-depth", help="Archive levels to open, the outer one included"),
+    archive_max_gb: float = typer.Option(64.0, "--archive-max-gb", help="Decompressed bytes to read per archive (GiB)"),
+    deterministic: bool = typer.Option(
+        False, "--deterministic", help="Stable ids, timestamp (SOURCE_DATE_EPOCH) and order: identical inputs, identical BOM"
+    ),
+) -> None:
     """Scan repository to generate draft BOM JSON."""
-    bom = scan_repository(dir)
-    pathlib.Path(output).write_text(json.dumps(bom, indent=2), encoding="utf-8")
-    typer.echo(f"Wrote {output}")
+    if format not in ("json", "ndjson"):
+        raise typer.BadParameter("format must be json or ndjson", param_hint="--format")
+    if deterministic and (format == "ndjson" or stream):
+        raise typer.BadParameter("a deterministic BOM is sorted and identified once complete, so it cannot stream")
+    to_stdout = output == "-"
+    rules = []
+    for rule in dataset_strategy_for:
+        pattern, sep, strategy = rule.rpartition("=")
+        if not sep:
+            raise typer.BadParameter("expected GLOB=STRATEGY", param_hint="--dataset-strategy-for")
+        rules.append((pattern, strategy))
+    try:
+        options = ScanOptions(
+            jobs=jobs or None,
+            algorithms=[a.strip() for a in algorithms.split(",") if a.strip()],
+            model_algorithm=model_algorithm,
+            merkle_chunk_size=merkle_chunk_mb * 1024 * 1024,
+            merkle_keep_chunks=merkle_chunks,
+            hash_backend=hash_backend,
+            drop_page_cache=drop_page_cache,
+            dataset_strategy=dataset_strategy,
+            dataset_strategy_rules=rules,
+            dataset_samples=dataset_samples,
+            dataset_cdc_avg_size=cdc_avg_kb * 1024,
+            trust_cas=trust_cas,
+            cas_verify_fraction=verify_cas,
+            use_git_index=git_index,
+            include_untracked=untracked,
+            scan_archives=archives,
+            archive_max_depth=archive_max_depth,
+            archive_max_bytes=int(archive_max_gb * 1024**3),
+            deterministic=deterministic,
+        )
+    except ValidationError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    fp_cache = FingerprintCache.for_directory(dir) if cache else None
+    remote = get_remote_cache(enabled=True) if remote_cache else None
+    unchanged = False
+    try:
+        if format == "ndjson" or stream:
+            writer = _write_ndjson if format == "ndjson" else _write_json_stream
+            components = iter_components(dir, cache=fp_cache, options=options, remote_cache=remote)
+            if to_stdout:
+                writer(sys.stdout, bom_header(dir), components)
+            else:
+                with open(output, "w", encoding="utf-8") as out:
+                    writer(out, bom_header(dir), components)
+        else:
+            bom = scan_repository(dir, cache=fp_cache, options=options, remote_cache=remote, compact=True)
+            if to_stdout:
+                dump_json(bom, sys.stdout, indent=2)
+                sys.stdout.write("\n")
+            else:
+                unchanged = _write_bom(pathlib.Path(output), bom, keep_identical=deterministic)
+    finally:
+        if fp_cache is not None:
+            fp_cache.close()
+    if fp_cache is not None:
+        typer.echo(f"Fingerprint cache: {fp_cache.hits} hits, {fp_cache.misses} misses", err=to_stdout)
+    if remote is not None:
+        stats = remote.stats()
+        typer.echo(
+            f"Remote fingerprint cache: {stats['hits']} hits ({stats['verified']} re-verified, "
+            f"{stats['mismatches']} mismatched), {stats['misses']} misses",
+            err=to_stdout,
+        )
+    if not to_stdout:
+        typer.echo(f"Unchanged {output}" if unchanged else f"Wrote {output}")
 
 
 @app.command()
@@ -63,26 +231,185 @@ def keygen(outdir: str = ".ai-bom/keys") -> None:
 
 
 @app.command()
-def sign(bom_path: str, key: str) -> None:
+def sign(
+    bom_path: str,
+    key: str,
+    merkle: bool = typer.Option(
+        False, "--merkle", help="Sign a Merkle root over the components, so single components can be proven"
+    ),
+    detached: bool = typer.Option(
+        False, "--detached", help="Leave the BOM untouched and write the signature to BOM_PATH.sig"
+    ),
+) -> None:
     """Sign a BOM JSON with ed25519 private key."""
-    data = json.loads(pathlib.Path(bom_path).read_text(encoding="utf-8"))
     private_key = load_private_key(key)
-    signed = sign_bom(data, private_key)
-    pathlib.Path(bom_path).write_text(json.dumps(signed, indent=2), encoding="utf-8")
+    if detached:
+        if merkle:
+            raise typer.BadParameter("detached signatures sign the aggregate BOM hash", param_hint="--merkle")
+        sig_path = sign_detached(bom_path, private_key)
+        typer.echo(f"Wrote detached signature {sig_path}")
+        return
+    data = json.loads(pathlib.Path(bom_path).read_text(encoding="utf-8"))
+    signed = sign_bom(data, private_key, merkle=merkle)
+    path = pathlib.Path(bom_path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(signed, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
     typer.echo("Signed BOM and updated file")
 
 
 @app.command()
-def verify(bom_path: str, public_key_path: Optional[str] = None) -> None:
-    """Verify signature and fingerprints of a BOM."""
+def prove(
+    bom_path: str,
+    component: str = typer.Argument(..., help="component_id or name of the component"),
+    output: str = typer.Option("-", help="Output path, or - for stdout"),
+) -> None:
+    """Write an inclusion proof of one component of a Merkle-signed BOM."""
     data = json.loads(pathlib.Path(bom_path).read_text(encoding="utf-8"))
-    ok = verify_bom_signature(data, public_key_path)
+    components = data.get("components") or []
+    index = next((i for i, c in enumerate(components) if component in (c.get("component_id"), c.get("name"))), None)
+    if index is None:
+        typer.echo(f"No component {component!r} in {bom_path}", err=True)
+        raise typer.Exit(code=2)
+    try:
+        proof = component_proof(data, index)
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=2) from exc
+    text = json.dumps(proof, indent=2)
+    if output == "-":
+        typer.echo(text)
+    else:
+        pathlib.Path(output).write_text(text, encoding="utf-8")
+        typer.echo(f"Wrote {output}")
+
+
+@app.command("verify-proof")
+def verify_proof(proof_path: str, public_key_path: str | None = None) -> None:
+    """Check a component inclusion proof against its Merkle signatures."""
+    proof = json.loads(pathlib.Path(proof_path).read_text(encoding="utf-8"))
+    public_key = load_public_key(public_key_path) if public_key_path else None
+    results = verify_component_proof(proof, public_key=public_key)
+    component = proof.get("component") or {}
+    if signatures_valid(results, public_key):
+        typer.echo(f"Verification OK: {component.get('name')} is component {proof['index']} of BOM {proof.get('bom_id')}")
+        raise typer.Exit(code=0)
+    typer.echo(f"Verification FAILED: {_failure_reason({'signatures': results})}")
+    raise typer.Exit(code=1)
+
+
+def _verify_bulk(targets: list[str], public_key_path: str | None, jobs: int, report: str | None) -> None:
+    paths = expand_targets(targets)
+    if not paths:
+        typer.echo("No BOM files matched", err=True)
+        raise typer.Exit(code=2)
+    pem = pathlib.Path(public_key_path).read_bytes() if public_key_path else None
+    to_stdout = report == "-"
+    passed = failed = 0
+    started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        out = sys.stdout if to_stdout else stack.enter_context(open(report, "w", encoding="utf-8")) if report else None
+        for record in verify_many(paths, public_key_pem=pem, jobs=jobs or None):
+            if record["ok"]:
+                passed += 1
+            else:
+                failed += 1
+                if out is None:
+                    typer.echo(f"FAILED {record['path']}: {_failure_reason(record)}", err=True)
+            if out is not None:
+                out.write(json.dumps(record, separators=(",", ":")) + "\n")
+    elapsed = time.perf_counter() - started
+    typer.echo(
+        f"Verified {passed + failed} BOMs: {passed} OK, {failed} FAILED in {elapsed:.2f}s "
+        f"({(passed + failed) / max(elapsed, 1e-9):.0f} BOMs/s)",
+        err=to_stdout,
+    )
+    raise typer.Exit(code=1 if failed else 0)
+
+
+def _failure_reason(record: dict) -> str:
+    if "error" in record:
+        return record["error"]
+    bad = [s for s in record.get("signatures", []) if not s["ok"]]
+    if not bad:
+        return "no signature by the trusted key" if record.get("signatures") else "no signatures"
+    return ", ".join(f"{s['key_id'] or '<no key_id>'}: {s.get('error', 'invalid')}" for s in bad)
+
+
+@app.command()
+def verify(
+    targets: list[str] = typer.Argument(..., help="BOM files, directories of *.json BOMs, or globs"),
+    public_key_path: str | None = typer.Option(None, help="Require a signature by this PEM public key"),
+    jobs: int = typer.Option(0, "--jobs", "-j", help="Verification processes for several BOMs (0 = one per CPU)"),
+    report: str | None = typer.Option(None, "--report", help="Write an NDJSON record per BOM here, or - for stdout"),
+    check_fingerprints: bool = typer.Option(
+        False, "--check-fingerprints", help="Re-hash the files behind origin.path and compare the fingerprints"
+    ),
+    root: str = typer.Option(".", help="Directory that relative origin paths and the fingerprint cache belong to"),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help="With --check-fingerprints, trust .ai-bom/fingerprints.db for unchanged files"),
+    fail_fast: bool = typer.Option(False, "--fail-fast", help="Stop re-hashing at the first mismatch or missing file"),
+) -> None:
+    """Verify signature and fingerprints of a BOM.
+
+    Given several BOMs, a directory or a glob (or ``--report``), every
+    signature of every BOM is checked, in parallel processes. With
+    ``--check-fingerprints`` (a single BOM) the files are re-hashed as well,
+    on ``--jobs`` threads.
+    """
+    bulk = len(targets) > 1 or report is not None or not pathlib.Path(targets[0]).is_file()
+    if bulk and check_fingerprints:
+        raise typer.BadParameter("--check-fingerprints verifies a single BOM file")
+    if bulk:
+        _verify_bulk(targets, public_key_path, jobs, report)
+    bom_path = targets[0]
+    data = None
+    if detached_signature_path(bom_path).exists():
+        # A detached signature is checked by streaming the BOM, without loading it.
+        public_key = load_public_key(public_key_path) if public_key_path else None
+        ok = signatures_valid(verify_detached(bom_path, public_key=public_key), public_key)
+    else:
+        ok = False
+    if not ok:
+        data = json.loads(pathlib.Path(bom_path).read_text(encoding="utf-8"))
+        ok = verify_bom_signature(data, public_key_path)
     if ok:
         typer.echo("Verification OK")
-        raise typer.Exit(code=0)
     else:
         typer.echo("Verification FAILED")
-        raise typer.Exit(code=1)
+    if check_fingerprints:
+        if data is None:
+            data = json.loads(pathlib.Path(bom_path).read_text(encoding="utf-8"))
+        ok = _check_fingerprints(data, root, cache, jobs, fail_fast) and ok
+    raise typer.Exit(code=0 if ok else 1)
+
+
+def _check_fingerprints(bom: dict, root: str, use_cache: bool, jobs: int, fail_fast: bool) -> bool:
+    cache_path = pathlib.Path(root) / ".ai-bom" / CACHE_FILENAME
+    fp_cache = FingerprintCache.for_directory(root) if use_cache and cache_path.exists() else None
+    try:
+        result = verify_fingerprints(
+            bom.get("components") or [], root=root, cache=fp_cache, jobs=jobs or None, fail_fast=fail_fast
+        )
+    finally:
+        if fp_cache is not None:
+            fp_cache.close()
+    mib = result["bytes"] / 1024**2
+    typer.echo(
+        f"Fingerprints: {result['checked']} checked ({result['cached']} from cache), {len(result['mismatched'])} "
+        f"mismatched, {len(result['missing'])} missing, {result['skipped']} skipped; "
+        f"{mib:.1f} MiB re-hashed in {result['seconds']:.2f}s ({mib / max(result['seconds'], 1e-9):.1f} MiB/s)"
+    )
+    for mismatch in result["mismatched"]:
+        algorithms = ", ".join(
+            f"{a} expected {mismatch['expected'][a][:16]} got {(mismatch['actual'][a] or '-')[:16]}"
+            for a in mismatch["algorithms"]
+        )
+        typer.echo(f"MISMATCH {mismatch['name']}: {algorithms}")
+    for missing in result["missing"]:
+        typer.echo(f"MISSING {missing['name']}: {missing['path']} ({missing['error']})")
+    if result["stopped_early"]:
+        typer.echo("Stopped at the first failure (--fail-fast)")
+    return not result["mismatched"] and not result["missing"]
 
 
 @app.command()
@@ -107,11 +434,17 @@ def deploy_check(dir: str = ".") -> None:
         typer.echo("No BOM file found", err=True)
         raise typer.Exit(code=2)
     data = json.loads(bom_path.read_text(encoding="utf-8"))
-    # If there are model artifacts, require signature
+    # If there are model artifacts, require signature (embedded or in a .sig sidecar)
     has_model = any(c.get("type") == "model" for c in data.get("components", []))
-    if has_model and not data.get("signatures"):
+    sidecar = read_detached_signature(detached_signature_path(bom_path))
+    if has_model and not data.get("signatures") and not (sidecar or {}).get("signatures"):
         typer.echo("Unsigned BOM with model artifacts", err=True)
         raise typer.Exit(code=3)
+    if has_model and not data.get("signatures"):
+        digest_hex = compute_bom_hash({k: v for k, v in data.items() if k != "signatures"})
+        if sidecar.get("digest", {}).get("hash") != digest_hex:
+            typer.echo(f"Detached signature {detached_signature_path(bom_path).name} does not match the BOM", err=True)
+            raise typer.Exit(code=3)
     typer.echo("Deploy check passed")
 
 
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Literal
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -45,6 +45,35 @@ class Settings(BaseSettings):
     max_upload_mb: int = Field(default=512)
     allowed_upload_mime_types: list[str] = Field(default_factory=lambda: ["application/octet-stream", "application/x-hdf5", "application/zip", "text/csv"])
 
+    # "thread" runs API scans in-process; "celery" hands them to workers through redis_url.
+    scan_executor: Literal["thread", "celery"] = Field(default="thread", alias="SCAN_EXECUTOR")
+    scan_job_workers: int = Field(default=2, ge=1)
+    # Upper bound on the hashing threads a single API scan may ask for.
+    scan_max_jobs: int = Field(default=4, ge=1, alias="SCAN_MAX_JOBS")
+    # Caps on the archive limits an API scan may ask for.
+    scan_max_archive_depth: int = Field(default=2, ge=1, alias="SCAN_MAX_ARCHIVE_DEPTH")
+    scan_max_archive_bytes: int = Field(default=4 * 1024**3, ge=1, alias="SCAN_MAX_ARCHIVE_BYTES")
+    # Finished thread-executor jobs, and their BOMs, are dropped after this long.
+    scan_job_ttl_seconds: int = Field(default=3600, ge=0, alias="SCAN_JOB_TTL_SECONDS")
+    # With the celery executor, split scans into partitions hashed across the pool.
+    scan_distributed: bool = Field(default=False, alias="SCAN_DISTRIBUTED")
+    scan_partition_files: int = Field(default=10_000, ge=1)
+    scan_partition_bytes: int = Field(default=8 * 1024**3, ge=1)
+
+    # Where Celery scan tasks put their payloads; results in Redis are references only.
+    result_store: Literal["s3", "local"] = Field(default="s3", alias="RESULT_STORE")
+    result_store_dir: str = Field(default=".ai-bom/results", alias="RESULT_STORE_DIR")
+
+    # Fingerprints shared between scanners (CI runners) by content key; S3 unless "local".
+    remote_cache_enabled: bool = Field(default=False, alias="REMOTE_CACHE")
+    remote_cache_backend: Literal["s3", "local"] = Field(default="s3", alias="REMOTE_CACHE_BACKEND")
+    remote_cache_dir: str = Field(default=".ai-bom/remote-cache", alias="REMOTE_CACHE_DIR")
+    remote_cache_prefix: str = Field(default="fingerprint-cache")
+    remote_cache_ttl_seconds: int = Field(default=30 * 24 * 3600, ge=0)
+    # Fraction of remote hits re-hashed anyway; a mismatching entry is replaced.
+    remote_cache_verify_fraction: float = Field(default=0.05, ge=0.0, le=1.0, alias="REMOTE_CACHE_VERIFY_FRACTION")
+    remote_cache_min_bytes: int = Field(default=64 * 1024 * 1024, ge=0)
+
     prometheus_namespace: str = Field(default="ai_bom")
     otlp_endpoint: str | None = Field(default=None)
 
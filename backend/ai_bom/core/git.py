@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+from typing import Any, NamedTuple
+
+
+_HEADER = struct.Struct(">4sII")
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size
+_STAT = struct.Struct(">10I")
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE = 0x3000
+_EXT_SKIP_WORKTREE = 0x4000
+_EXT_INTENT_TO_ADD = 0x2000
+_MODE_GITLINK = 0o160000
+_MODE_SYMLINK = 0o120000
+
+
+class IndexEntry(NamedTuple):
+    path: str
+    mtime_ns: int
+    dev: int
+    ino: int
+    mode: int
+    size: int
+    oid: str
+
+    @property
+    def is_symlink(self) -> bool:
+        return self.mode & 0o170000 == _MODE_SYMLINK
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Whether ``st`` still matches the stat data git recorded for this entry."""
+        # The index stores 32-bit fields, so compare truncated values.
+        mask = 0xFFFFFFFF
+        return self.size == st.st_size & mask and self.mtime_ns == st.st_mtime_ns and self.ino == st.st_ino & mask
+
+
+class GitIndex(NamedTuple):
+    root: Path
+    entries: list[IndexEntry]
+    mtime_ns: int
+
+    def is_racy(self, entry: IndexEntry) -> bool:
+        # Files modified in the same instant the index was written may have changed
+        # without their stat data changing; git re-checks their content, so do we.
+        return entry.mtime_ns >= self.mtime_ns
+
+
+def find_git_dir(start: str | os.PathLike[str]) -> tuple[Path, Path] | None:
+    """Return ``(worktree_root, git_dir)`` for the repository containing ``start``."""
+    current = Path(start).resolve()
+    for candidate in (current, *current.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            return candidate, dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:") :].strip())
+                return candidate, (candidate / git_dir).resolve()
+            return None
+    return None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        return (git_dir / commondir.read_text(encoding="utf-8").strip()).resolve()
+    return git_dir
+
+
+def _read_config(common_dir: Path) -> dict[str, dict[str, str]]:
+    sections: dict[str, dict[str, str]] = {}
+    current: dict[str, str] | None = None
+    try:
+        lines = (common_dir / "config").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return sections
+    for raw in lines:
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            header = line[1:-1].strip()
+            name, _, sub = header.partition(" ")
+            key = name.lower() + (f" {sub.strip().strip(chr(34))}" if sub else "")
+            current = sections.setdefault(key, {})
+        elif current is not None:
+            key, _, value = line.partition("=")
+            current[key.strip().lower()] = value.strip().strip('"')
+    return sections
+
+
+def resolve_ref(git_dir: Path, ref: str) -> str:
+    common = _common_dir(git_dir)
+    for base in (git_dir, common):
+        loose = base / ref
+        if loose.is_file():
+            value = loose.read_text(encoding="utf-8").strip()
+            if value.startswith("ref:"):
+                return resolve_ref(git_dir, value[4:].strip())
+            return value
+    try:
+        for line in (common / "packed-refs").read_text(encoding="utf-8").splitlines():
+            if line and line[0] not in "#^":
+                oid, _, name = line.partition(" ")
+                if name.strip() == ref:
+                    return oid
+    except OSError:
+        pass
+    return ""
+
+
+def read_git_info(dir: str | os.PathLike[str]) -> dict[str, Any] | None:
+    """``{"repo", "commit"}`` read straight from ``.git`` files, or None outside a repository."""
+    found = find_git_dir(dir)
+    if found is None:
+        return None
+    _, git_dir = found
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    commit = resolve_ref(git_dir, head[4:].strip()) if head.startswith("ref:") else head
+    config = _read_config(_common_dir(git_dir))
+    repo = config.get("remote origin", {}).get("url", "")
+    return {"repo": repo, "commit": commit}
+
+
+def _object_hash_size(git_dir: Path) -> int:
+    config = _read_config(_common_dir(git_dir))
+    return 32 if config.get("extensions", {}).get("objectformat") == "sha256" else 20
+
+
+def _varint(data: bytes, pos: int) -> tuple[int, int]:
+    c = data[pos]
+    pos += 1
+    value = c & 0x7F
+    while c & 0x80:
+        value += 1
+        c = data[pos]
+        pos += 1
+        value = (value << 7) + (c & 0x7F)
+    return value, pos
+
+
+def read_git_index(dir: str | os.PathLike[str]) -> GitIndex | None:
+    """Parse ``.git/index`` (versions 2-4) without running git.
+
+    Returns stage-0 entries that are present in the worktree; submodules,
+    conflicted, skip-worktree and intent-to-add entries are left out.
+    """
+    found = find_git_dir(dir)
+    if found is None:
+        return None
+    root, git_dir = found
+    index_path = git_dir / "index"
+    try:
+        with open(index_path, "rb") as f:
+            data = f.read()
+        index_mtime_ns = os.stat(index_path).st_mtime_ns
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    signature, version, count = _HEADER.unpack_from(data, 0)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        return None
+    hash_size = _object_hash_size(git_dir)
+    pos = _HEADER.size
+    entries: list[IndexEntry] = []
+    previous = b""
+    for _ in range(count):
+        start = pos
+        _, _, mtime_s, mtime_ns, dev, ino, mode, _, _, size = _STAT.unpack_from(data, pos)
+        pos += _STAT.size
+        oid = data[pos : pos + hash_size].hex()
+        pos += hash_size
+        (flags,) = struct.unpack_from(">H", data, pos)
+        pos += 2
+        ext_flags = 0
+        if version >= 3 and flags & _FLAG_EXTENDED:
+            (ext_flags,) = struct.unpack_from(">H", data, pos)
+            pos += 2
+        if version == 4:
+            strip, pos = _varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = previous[: len(previous) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            end = data.index(b"\0", pos)
+            name = data[pos:end]
+            # Entries are NUL-padded to a multiple of eight bytes.
+            pos = start + ((end - start) // 8 + 1) * 8
+        previous = name
+        if flags & _FLAG_STAGE or ext_flags & (_EXT_SKIP_WORKTREE | _EXT_INTENT_TO_ADD):
+            continue
+        if mode & 0o170000 == _MODE_GITLINK:
+            continue
+        entries.append(
+            IndexEntry(
+                name.decode("utf-8", errors="surrogateescape"),
+                mtime_s * 1_000_000_000 + mtime_ns,
+                dev,
+                ino,
+                mode,
+                size,
+                oid,
+            )
+        )
+    return GitIndex(root, entries, index_mtime_ns)
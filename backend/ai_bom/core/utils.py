@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import codecs
 import hashlib
 import json
+import mmap
 import os
-import subprocess
+import random
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, BinaryIO
 
@@ -11,34 +16,416 @@ import boto3
 import orjson
 
 from ai_bom.core.config import get_settings
+from ai_bom.core.git import read_git_info
 
 
-def sha256_file(path: str | Path, chunk_size: int = 1024 * 1024) -> str:
+HASH_BACKENDS = ("readinto", "mmap")
+DEFAULT_HASH_CHUNK_SIZE = 1024 * 1024
+# How often the readinto backend drops already-hashed pages when drop_cache is set.
+_DROP_CACHE_EVERY = 64 * 1024 * 1024
+
+
+def _fadvise(fd: int, offset: int, length: int, advice: str) -> None:
+    value = getattr(os, advice, None)
+    if value is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, value)
+    except OSError:
+        pass
+
+
+def hash_file(
+    path: str | Path,
+    hasher: Any,
+    max_bytes: int | None = None,
+    chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
+    backend: str = "readinto",
+    drop_cache: bool = False,
+    head: bytes | None = None,
+) -> Any:
+    """Feed ``path`` (or its first ``max_bytes``) into ``hasher`` without per-chunk allocations.
+
+    ``readinto`` reuses one buffer and hands memoryview slices to the hasher;
+    ``mmap`` hashes slices of a read-only mapping. Reads are advised as
+    sequential, and with ``drop_cache`` the hashed pages are released from the
+    page cache so large scans do not evict the working set. ``head`` is the
+    already-read start of the file (such as the scanner's sniff buffer); it is
+    hashed as-is and reading resumes right after it.
+    """
+    if backend not in HASH_BACKENDS:
+        raise ValueError(f"Unsupported hash backend: {backend}")
+    start = 0
+    if head:
+        head = head if max_bytes is None else head[:max_bytes]
+        hasher.update(head)
+        start = len(head)
+    with open(path, "rb", buffering=0) as f:
+        fd = f.fileno()
+        _fadvise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+        if backend == "mmap":
+            size = os.fstat(fd).st_size
+            limit = size if max_bytes is None else min(size, max_bytes)
+            if limit > 0:
+                with mmap.mmap(fd, limit, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    with memoryview(mm) as view:
+                        for offset in range(start, limit, chunk_size):
+                            hasher.update(view[offset : offset + chunk_size])
+        else:
+            buf = bytearray(chunk_size)
+            if start:
+                f.seek(start)
+            with memoryview(buf) as view:
+                read, dropped = start, 0
+                while True:
+                    want = chunk_size if max_bytes is None else min(chunk_size, max_bytes - read)
+                    if want <= 0:
+                        break
+                    n = f.readinto(view[:want])
+                    if not n:
+                        break
+                    hasher.update(view[:n])
+                    read += n
+                    if drop_cache and read - dropped >= _DROP_CACHE_EVERY:
+                        _fadvise(fd, dropped, read - dropped, "POSIX_FADV_DONTNEED")
+                        dropped = read
+        if drop_cache:
+            _fadvise(fd, 0, 0, "POSIX_FADV_DONTNEED")
+    return hasher
+
+
+def sha256_file(
+    path: str | Path,
+    chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
+    backend: str = "readinto",
+    drop_cache: bool = False,
+    head: bytes | None = None,
+) -> str:
     hasher = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+    return hash_file(path, hasher, chunk_size=chunk_size, backend=backend, drop_cache=drop_cache, head=head).hexdigest()
+
+
+class MultiHasher:
+    """Feeds each buffer to one hashlib object per algorithm, so one read yields every digest."""
+
+    def __init__(self, algorithms: Iterable[str]) -> None:
+        self.hashers = {algorithm: hashlib.new(algorithm) for algorithm in dict.fromkeys(algorithms)}
+
+    def update(self, data: Any) -> None:
+        for hasher in self.hashers.values():
+            hasher.update(data)
+
+    def hexdigests(self) -> dict[str, str]:
+        return {algorithm: hasher.hexdigest() for algorithm, hasher in self.hashers.items()}
+
+
+def digest_file(
+    path: str | Path,
+    algorithms: Iterable[str],
+    max_bytes: int | None = None,
+    chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
+    backend: str = "readinto",
+    drop_cache: bool = False,
+    head: bytes | None = None,
+) -> dict[str, str]:
+    """Hex digests of ``path`` (or its first ``max_bytes``) for each algorithm, from a single read."""
+    hasher = MultiHasher(algorithms)
+    hash_file(
+        path, hasher, max_bytes=max_bytes, chunk_size=chunk_size, backend=backend, drop_cache=drop_cache, head=head
+    )
+    return hasher.hexdigests()
+
+
+MERKLE_ALGORITHM = "sha256-merkle"
+DEFAULT_MERKLE_CHUNK_SIZE = 8 * 1024 * 1024
+_MERKLE_LEAF = b"\x00"
+_MERKLE_NODE = b"\x01"
+
+
+def _merkle_leaf(fd: int, index: int, chunk_size: int) -> bytes:
+    return merkle_leaf(os.pread(fd, chunk_size, index * chunk_size))
+
+
+def merkle_leaf(data: bytes) -> bytes:
+    return hashlib.sha256(_MERKLE_LEAF + data).digest()
+
+
+def _merkle_parent(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_MERKLE_NODE + left + right).digest()
+
+
+def _merkle_next_level(level: list[bytes]) -> list[bytes]:
+    nxt = [_merkle_parent(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        nxt.append(level[-1])
+    return nxt
+
+
+def merkle_root(leaves: list[bytes]) -> bytes:
+    """Root of a binary SHA-256 Merkle tree; an odd node is promoted unchanged."""
+    if not leaves:
+        return hashlib.sha256(_MERKLE_LEAF).digest()
+    level = list(leaves)
+    while len(level) > 1:
+        level = _merkle_next_level(level)
+    return level[0]
+
+
+def merkle_proof(leaves: list[bytes], index: int) -> list[bytes]:
+    """Sibling hashes from ``leaves[index]`` up to the :func:`merkle_root`, bottom first.
+
+    A level where the node is promoted without a sibling contributes nothing, so
+    the proof has at most ``ceil(log2(len(leaves)))`` entries.
+    """
+    if not 0 <= index < len(leaves):
+        raise IndexError("leaf index out of range")
+    proof, level = [], list(leaves)
+    while len(level) > 1:
+        if index ^ 1 < len(level):
+            proof.append(level[index ^ 1])
+        level = _merkle_next_level(level)
+        index //= 2
+    return proof
+
+
+def merkle_root_from_proof(leaf: bytes, index: int, count: int, proof: list[bytes]) -> bytes:
+    """The root implied by ``leaf`` at ``index`` of ``count`` leaves and its :func:`merkle_proof`.
+
+    The tree shape follows from ``index`` and ``count``; a proof of the wrong
+    length raises ``ValueError``.
+    """
+    if not 0 <= index < count:
+        raise ValueError("leaf index out of range")
+    node, siblings = leaf, iter(proof)
+    while count > 1:
+        if index ^ 1 < count:
+            sibling = next(siblings, None)
+            if sibling is None:
+                raise ValueError("proof is too short")
+            node = _merkle_parent(sibling, node) if index & 1 else _merkle_parent(node, sibling)
+        index //= 2
+        count = (count + 1) // 2
+    if next(siblings, None) is not None:
+        raise ValueError("proof is too long")
+    return node
+
+
+def merkle_chunk_hashes(
+    path: str | Path,
+    chunk_size: int = DEFAULT_MERKLE_CHUNK_SIZE,
+    jobs: int | None = None,
+    indices: Iterable[int] | None = None,
+) -> list[bytes]:
+    """Leaf hashes of ``path`` split into ``chunk_size`` chunks, hashed on ``jobs`` threads.
+
+    With ``indices`` only those chunks are read, which lets a verifier spot-check
+    a sample of a large file against a persisted chunk list.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        count = max(1, -(-size // chunk_size))
+        wanted = list(range(count)) if indices is None else list(indices)
+        workers = jobs or min(32, os.cpu_count() or 1)
+        if workers <= 1 or len(wanted) <= 1:
+            return [_merkle_leaf(fd, i, chunk_size) for i in wanted]
+        with ThreadPoolExecutor(max_workers=min(workers, len(wanted))) as pool:
+            return list(pool.map(lambda i: _merkle_leaf(fd, i, chunk_size), wanted))
+    finally:
+        os.close(fd)
+
+
+def merkle_sha256_file(
+    path: str | Path,
+    chunk_size: int = DEFAULT_MERKLE_CHUNK_SIZE,
+    jobs: int | None = None,
+    keep_chunks: bool = False,
+) -> dict[str, Any]:
+    """Fingerprint ``path`` as a ``sha256-merkle`` tree over fixed-size chunks."""
+    leaves = merkle_chunk_hashes(path, chunk_size, jobs=jobs)
+    fingerprint: dict[str, Any] = {
+        "algorithm": MERKLE_ALGORITHM,
+        "hash": merkle_root(leaves).hex(),
+        "chunk_size": chunk_size,
+    }
+    if keep_chunks:
+        fingerprint["chunks"] = [leaf.hex() for leaf in leaves]
+    return fingerprint
+
+
+def merkle_verify_file(
+    path: str | Path,
+    fingerprint: dict[str, Any],
+    sample: int | None = None,
+    jobs: int | None = None,
+) -> list[int]:
+    """Return the indices of chunks of ``path`` that no longer match ``fingerprint``.
+
+    When the fingerprint carries its chunk list, only ``sample`` randomly chosen
+    chunks (all chunks when ``sample`` is None) are re-hashed; the chunk list
+    itself is checked against the recorded root first. Without a chunk list the
+    whole file is re-hashed and ``[-1]`` signals a root mismatch.
+    """
+    chunk_size = int(fingerprint.get("chunk_size") or DEFAULT_MERKLE_CHUNK_SIZE)
+    chunks = fingerprint.get("chunks")
+    if not chunks:
+        leaves = merkle_chunk_hashes(path, chunk_size, jobs=jobs)
+        return [] if merkle_root(leaves).hex() == fingerprint.get("hash") else [-1]
+    recorded = [bytes.fromhex(c) for c in chunks]
+    if merkle_root(recorded).hex() != fingerprint.get("hash"):
+        return [-1]
+    size = os.stat(path).st_size
+    if max(1, -(-size // chunk_size)) != len(recorded):
+        return [-1]
+    indices = list(range(len(recorded)))
+    if sample is not None and sample < len(indices):
+        indices = sorted(random.sample(indices, sample))
+    leaves = merkle_chunk_hashes(path, chunk_size, jobs=jobs, indices=indices)
+    return [i for i, leaf in zip(indices, leaves) if leaf != recorded[i]]
 
 
 def canonical_json(data: dict[str, Any]) -> bytes:
     return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
 
 
+def _streamed(value: Any) -> bool:
+    # Sequences orjson does not encode itself, such as a ComponentTable.
+    return isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray, list, tuple))
+
+
+def iter_canonical_json(data: dict[str, Any]) -> Iterator[bytes]:
+    """:func:`canonical_json` in pieces. Top-level values that are sequences but not
+    lists (such as a ``ComponentTable``) are encoded one item at a time; everything
+    else, datetimes and UUIDs included, goes to orjson as a whole."""
+    yield b"{"
+    for i, key in enumerate(sorted(data)):
+        yield (b"," if i else b"") + orjson.dumps(key) + b":"
+        value = data[key]
+        if not _streamed(value):
+            yield orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+            continue
+        yield b"["
+        for j, item in enumerate(value):
+            yield (b"," if j else b"") + orjson.dumps(item, option=orjson.OPT_SORT_KEYS)
+        yield b"]"
+    yield b"}"
+
+
 def aggregate_bom_hash(bom: dict[str, Any]) -> str:
-    return hashlib.sha256(canonical_json(bom)).hexdigest()
+    hasher = hashlib.sha256()
+    for piece in iter_canonical_json(bom):
+        hasher.update(piece)
+    return hasher.hexdigest()
+
+
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+_json_decoder = json.JSONDecoder()
+
+
+class _JsonReader:
+    """Decodes JSON values one at a time from a file, holding only a window of its text."""
+
+    def __init__(self, f: BinaryIO, chunk_size: int) -> None:
+        self._f = f
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # Read at least as much as is buffered, so a value larger than a chunk costs O(n) re-decoding.
+        data = self._f.read(max(self._chunk_size, len(self.buf) - self.pos))
+        self.buf = self.buf[self.pos :] + self._utf8.decode(data, final=not data)
+        self.pos = 0
+        self.eof = not data
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, without consuming it; "" at end of file."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        char = self.peek()
+        if char not in expected or not char:
+            raise ValueError(f"Expected one of {expected!r} at offset {self.pos}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number cut at the window's edge ("12" of "12.5") decodes early; within
+            # an object or array a value is always followed by one of ",:]}".
+            following = _JSON_NON_WHITESPACE.search(self.buf, end)
+            if (following is None or following.group() not in ",:]}") and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[Any]:
+        self.take("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.take(",]") == "]":
+                return
+
+
+def iter_json_members(
+    path: str | Path, stream_key: str, chunk_size: int = DEFAULT_HASH_CHUNK_SIZE
+) -> Iterator[tuple[str, Any]]:
+    """The top-level ``(key, value)`` members of the JSON object in ``path``, read incrementally.
+
+    When the ``stream_key`` member is an array, its value is an iterator over the
+    items, decoded one at a time; it must be consumed before the next member is
+    requested (whatever is left is skipped).
+    """
+    with open(path, "rb") as f:
+        reader = _JsonReader(f, chunk_size)
+        reader.take("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            if reader.peek() != '"':
+                raise ValueError(f"Expected an object key, got {reader.peek()!r}")
+            key = reader.value()
+            reader.take(":")
+            if key == stream_key and reader.peek() == "[":
+                items = reader.items()
+                yield key, items
+                for _ in items:
+                    pass
+            else:
+                yield key, reader.value()
+            if reader.take(",}") == "}":
+                break
+        if reader.peek():
+            raise ValueError("Trailing data after the JSON object")
 
 
 def get_git_info(dir: str | Path) -> dict[str, Any]:
-    try:
-        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=str(dir)).decode().strip()
-    except Exception:
-        commit = ""
-    try:
-        repo = subprocess.check_output(["git", "config", "--get", "remote.origin.url"], cwd=str(dir)).decode().strip()
-    except Exception:
-        repo = ""
-    return {"repo": repo, "commit": commit}
+    # Read HEAD, refs and remote.origin.url from .git directly instead of spawning git.
+    return read_git_info(dir) or {"repo": "", "commit": ""}
 
 
 def get_s3_client():  # pragma: no cover - external service
@@ -70,6 +70,11 @@ class BOMVersion(Base):
     risk_assessment: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     signatures: Mapped[list[dict[str, Any]] | None] = mapped_column(JSONB, nullable=True)
     parent_bom: Mapped[str | None] = mapped_column(String, nullable=True)
+    # sha256 of the canonical content (see services.bom_digest); NULL until backfilled on older rows
+    digest: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    # Hex digests, by algorithm, that the uploaded signatures sign. Taken from the document as
+    # received: the stored content is normalized and does not hash to what the client signed.
+    signed_digests: Mapped[dict[str, str] | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     bom: Mapped[BOM] = relationship("BOM", back_populates="versions")
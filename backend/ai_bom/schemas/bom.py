@@ -4,11 +4,12 @@ import re
 from datetime import datetime
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+from pydantic import BaseModel, HttpUrl, field_validator, model_validator
 
 
 UUID_PATTERN = re.compile(r"^[0-9a-fA-F-]{36}$")
 HEX_PATTERN = re.compile(r"^[0-9a-fA-F]{64}|[0-9a-fA-F]{128}$")
+MD5_PATTERN = re.compile(r"^[0-9a-fA-F]{32}$")
 
 
 class GitOrigin(BaseModel):
@@ -49,16 +50,46 @@ class Origin(BaseModel):
 
 
 class Fingerprint(BaseModel):
-    algorithm: Literal["sha256", "sha512"]
+    algorithm: Literal["sha256", "sha512", "blake2b", "sha256-merkle", "sha256-cdc", "md5"]
     hash: str
+    # sha256-merkle only: chunk size in bytes and, optionally, the leaf hashes
+    chunk_size: int | None = None
+    chunks: list[str] | None = None
+    # dataset fingerprints: how much of the file was hashed (head, sampled, full) or how it was
+    # chunked (cdc), and with which parameters
+    strategy: Literal["head", "sampled", "full", "cdc"] | None = None
+    params: dict[str, int] | None = None
+    # digests taken from a content-addressed store (git-lfs, hf-cache, dvc) rather than computed
+    source: str | None = None
+    verified: bool | None = None
 
     @field_validator("hash")
     @classmethod
-    def validate_hash(cls, v: str) -> str:
+    def validate_hash(cls, v: str, info):  # type: ignore[no-untyped-def]
+        if info.data.get("algorithm") == "md5":
+            # md5 is only accepted as recorded by DVC
+            if not MD5_PATTERN.match(v):
+                raise ValueError("fingerprint.hash must be a 32-char hex string for md5")
+            return v
         if not HEX_PATTERN.match(v):
-            raise ValueError("fingerprint.hash must be hex string (sha256 or sha512)")
+            raise ValueError("fingerprint.hash must be hex string (sha256, sha512 or blake2b)")
         return v
 
+    @field_validator("chunks")
+    @classmethod
+    def validate_chunks(cls, v: list[str] | None) -> list[str] | None:
+        if v is not None and not all(HEX_PATTERN.match(c) for c in v):
+            raise ValueError("fingerprint.chunks must be hex strings")
+        return v
+
+    @model_validator(mode="after")
+    def validate_merkle(self) -> Fingerprint:
+        if self.algorithm == "sha256-merkle" and not (self.chunk_size and self.chunk_size > 0):
+            raise ValueError("sha256-merkle fingerprints must record a positive chunk_size")
+        if (self.algorithm == "sha256-cdc") != (self.strategy == "cdc"):
+            raise ValueError("sha256-cdc is the algorithm of cdc dataset fingerprints only")
+        return self
+
 
 class Component(BaseModel):
     component_id: str
@@ -67,6 +98,8 @@ class Component(BaseModel):
     description: str | None = None
     origin: Origin | None = None
     fingerprint: Fingerprint
+    # digests of the same bytes in further algorithms (sha512, blake2b), computed in the same read
+    fingerprints: list[Fingerprint] | None = None
     license: str | None = None
     tags: list[str] | None = None
     metadata: dict[str, Any] | None = None
@@ -80,11 +113,19 @@ class Evaluation(BaseModel):
     notes: str | None = None
 
 
+class MerkleSignatureFields(BaseModel):
+    header_hash: str
+    component_count: int
+    components_root: str
+
+
 class Signature(BaseModel):
     key_id: str
     algorithm: str
     signature: str
     signed_at: datetime
+    # set on ed25519-merkle-sha256 signatures, which sign a Merkle root over the components
+    merkle: MerkleSignatureFields | None = None
 
 
 class BOMModel(BaseModel):
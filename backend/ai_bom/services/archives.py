@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from typing import IO, Any
+
+from ai_bom.services.detectors import SNIFF_BYTES, DetectorRegistry
+
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+# What the walker has to let through for archive_format() to see them.
+WALK_SUFFIXES = frozenset({".zip", ".tar", ".gz", ".tgz", ".bz2", ".tbz2", ".xz", ".txz"})
+DEFAULT_ARCHIVE_MAX_DEPTH = 2
+DEFAULT_ARCHIVE_MAX_BYTES = 64 * 1024**3
+_READ_SIZE = 1024 * 1024
+# Nested zips larger than this are spooled to a temporary file rather than memory.
+_SPOOL_MAX_MEMORY = 64 * 1024 * 1024
+
+
+def archive_format(name: str) -> str | None:
+    lower = name.lower()
+    if lower.endswith(ZIP_SUFFIXES):
+        return "zip"
+    if lower.endswith(TAR_SUFFIXES):
+        return "tar"
+    return None
+
+
+class ArchiveLimitExceeded(Exception):
+    pass
+
+
+class _HashingReader:
+    """Read-through wrapper that hashes, counts and keeps the head of everything read."""
+
+    def __init__(self, raw: IO[bytes], budget: list[int]) -> None:
+        self.raw = raw
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        self._budget = budget
+
+    def read(self, n: int = -1) -> bytes:
+        data = self.raw.read(n)
+        if data:
+            self._budget[0] -= len(data)
+            if self._budget[0] < 0:
+                raise ArchiveLimitExceeded("max_bytes")
+            self.hasher.update(data)
+            if len(self.head) < SNIFF_BYTES:
+                self.head += data[: SNIFF_BYTES - len(self.head)]
+            self.size += len(data)
+        return data
+
+    def drain(self) -> None:
+        while self.read(_READ_SIZE):
+            pass
+
+
+class _ArchiveWalker:
+    def __init__(self, registry: DetectorRegistry, max_depth: int, max_bytes: int) -> None:
+        self.registry = registry
+        self.max_depth = max_depth
+        self.budget = [max_bytes]
+        self.members: list[dict[str, Any]] = []
+
+    def walk(self, fileobj: IO[bytes], fmt: str, chain: list[str], depth: int) -> None:
+        if fmt == "zip":
+            with zipfile.ZipFile(fileobj) as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    with zf.open(info) as member:
+                        self.member(member, info.filename, chain, depth)
+        else:
+            with tarfile.open(fileobj=fileobj, mode="r|*") as tf:
+                for info in tf:
+                    if not info.isfile():
+                        continue
+                    member = tf.extractfile(info)
+                    if member is not None:
+                        self.member(member, info.name, chain, depth)
+
+    def member(self, stream: IO[bytes], name: str, chain: list[str], depth: int) -> None:
+        record: dict[str, Any] = {"name": name, "chain": chain}
+        self.members.append(record)
+        reader = _HashingReader(stream, self.budget)
+        nested = archive_format(name)
+        if nested is not None and depth + 1 < self.max_depth:
+            if nested == "tar":
+                # Hash the nested tar in the same pass that lists it.
+                self.walk(reader, nested, [*chain, name], depth + 1)  # type: ignore[arg-type]
+            else:
+                # Zip needs random access: copy the member out once, hashed and
+                # charged to the budget on the way, and list the seekable copy.
+                with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY) as spool:
+                    shutil.copyfileobj(reader, spool, _READ_SIZE)  # type: ignore[misc]
+                    spool.seek(0)
+                    self.walk(spool, nested, [*chain, name], depth + 1)  # type: ignore[arg-type]
+        reader.drain()
+        record["size"] = reader.size
+        record["sha256"] = reader.hasher.hexdigest()
+        detection = self.registry.classify(name, head=reader.head)
+        if nested is not None:
+            record["type"], record["format"] = "artifact", nested
+        elif detection is not None:
+            record["type"], record["format"] = detection.detector.component_type, detection.detector.name
+        else:
+            record["type"], record["format"] = "artifact", None
+
+
+def list_archive_members(
+    path: str | os.PathLike[str],
+    registry: DetectorRegistry,
+    max_depth: int = DEFAULT_ARCHIVE_MAX_DEPTH,
+    max_bytes: int = DEFAULT_ARCHIVE_MAX_BYTES,
+) -> dict[str, Any]:
+    """Hash and classify the regular-file members of a zip or tar archive without extracting it.
+
+    Members are streamed through sha256 one at a time. Nested archives are opened
+    up to ``max_depth`` levels in total (the outer archive is the first), and
+    reading stops once ``max_bytes`` of decompressed data have been consumed;
+    ``truncated`` then says why the member list is incomplete.
+    """
+    fmt = archive_format(os.fspath(path))
+    if fmt is None:
+        raise ValueError(f"Not a zip or tar archive: {path}")
+    walker = _ArchiveWalker(registry, max_depth, max_bytes)
+    result: dict[str, Any] = {}
+    try:
+        with open(path, "rb") as f:
+            walker.walk(f, fmt, [], 0)
+    except ArchiveLimitExceeded as exc:
+        result["truncated"] = str(exc)
+        # The member being read when the limit hit has no digest.
+        walker.members = [m for m in walker.members if "sha256" in m]
+    except (tarfile.TarError, zipfile.BadZipFile, EOFError) as exc:
+        result["truncated"] = f"{type(exc).__name__}: {exc}"
+        walker.members = [m for m in walker.members if "sha256" in m]
+    result["member_count"] = len(walker.members)
+    result["members"] = walker.members
+    return result
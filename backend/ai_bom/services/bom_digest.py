@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from sqlalchemy import select
+
+from ai_bom.core.utils import aggregate_bom_hash
+from ai_bom.db.models import BOM, BOMVersion
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def version_content(name: str, description: str | None, version: BOMVersion) -> dict[str, Any]:
+    """The stored content of a BOM version that its digest covers; signatures are not part of it.
+
+    The digest identifies content for dedup and caching. It is not what clients
+    sign, which also covers fields the API does not store; see ``BOMVersion.signed_digests``.
+    """
+    return {
+        "name": name,
+        "description": description,
+        "version": version.version,
+        "components": version.components,
+        "evaluations": version.evaluations,
+        "risk_assessment": version.risk_assessment,
+        "parent_bom": version.parent_bom,
+    }
+
+
+def version_digest(name: str, description: str | None, version: BOMVersion) -> str:
+    return aggregate_bom_hash(version_content(name, description, version))
+
+
+async def backfill_digests(
+    session_factory: Callable[[], AsyncSession] | None = None,
+    batch_size: int = 200,
+    pause_seconds: float = 0.5,
+) -> int:
+    """Set ``digest`` on versions created before the column existed; returns the rows updated.
+
+    Rows are read in primary-key order, ``batch_size`` at a time, and each batch
+    is committed on its own, so locks are short-lived. ``pause_seconds`` between
+    batches keeps the hashing and writes from crowding out API traffic. Safe to
+    re-run or run alongside inserts, which set the digest themselves.
+    """
+    if session_factory is None:
+        from ai_bom.db.session import AsyncSessionLocal
+
+        session_factory = AsyncSessionLocal
+    log = structlog.get_logger()
+    updated, last_id = 0, ""
+    while True:
+        async with session_factory() as session:
+            result = await session.execute(
+                select(BOMVersion, BOM.name, BOM.description)
+                .join(BOM, BOMVersion.bom_id == BOM.id)
+                .where(BOMVersion.digest.is_(None), BOMVersion.id > last_id)
+                .order_by(BOMVersion.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                log.info("bom_digest_backfill_done", updated=updated)
+                return updated
+            for version, name, description in rows:
+                version.digest = version_digest(name, description, version)
+            await session.commit()
+        updated += len(rows)
+        last_id = rows[-1][0].id
+        log.info("bom_digest_backfill_batch", updated=updated, last_id=last_id)
+        await asyncio.sleep(pause_seconds)
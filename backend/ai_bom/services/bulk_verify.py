@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import glob
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import orjson
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from ai_bom.services.hashing import default_jobs
+from ai_bom.services.signer import (
+    compute_bom_hash,
+    get_keyring,
+    signatures_valid,
+    verify_detached,
+    verify_signatures,
+)
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+# Set in each worker process by _init_worker.
+_worker_public_key: Ed25519PublicKey | None = None
+
+
+def expand_targets(targets: Iterable[str]) -> list[Path]:
+    """BOM files named by ``targets``: files as given, ``*.json`` under directories, and globs.
+
+    Globs are recursive (``**``). Paths are de-duplicated, keeping first-seen order;
+    directory and glob matches are sorted. ``.ai-bom`` directories are skipped.
+    """
+    paths: dict[Path, None] = {}
+    for target in targets:
+        if _GLOB_CHARS.intersection(target):
+            matches = sorted(Path(p) for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+        elif os.path.isdir(target):
+            matches = sorted(p for p in Path(target).rglob("*.json") if ".ai-bom" not in p.parts and p.is_file())
+        else:
+            matches = [Path(target)]
+        paths.update(dict.fromkeys(matches))
+    return list(paths)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def verify_bom_file(path: str | os.PathLike[str], public_key: Ed25519PublicKey | None = None) -> dict[str, Any]:
+    """Verify every signature of the BOM at ``path``, embedded or in its ``.sig`` sidecar.
+
+    Returns one NDJSON report record.
+    """
+    started = time.perf_counter()
+    record: dict[str, Any] = {"path": os.fspath(path), "ok": False}
+    try:
+        data = Path(path).read_bytes()
+        bom = orjson.loads(data)
+        if not isinstance(bom, dict):
+            raise TypeError("not a JSON object")
+    except (OSError, TypeError, ValueError) as exc:
+        record["error"] = str(exc)
+        record["elapsed_ms"] = _ms(time.perf_counter() - started)
+        return record
+    parsed = time.perf_counter()
+    digest_hex = compute_bom_hash({k: v for k, v in bom.items() if k != "signatures"})
+    hashed = time.perf_counter()
+    results = verify_signatures(bom, public_key=public_key, keyring=get_keyring(), digest_hex=digest_hex)
+    results += verify_detached(path, public_key=public_key, keyring=get_keyring(), digest_hex=digest_hex)
+    done = time.perf_counter()
+    record["ok"] = signatures_valid(results, public_key)
+    if not results:
+        record["error"] = "no signatures"
+    elif record["ok"] is False and all(r["ok"] for r in results):
+        record["error"] = "no signature by the trusted key"
+    record.update(
+        bom_id=bom.get("bom_id"),
+        bom_hash=digest_hex,
+        bytes=len(data),
+        components=len(bom.get("components") or []),
+        signatures=results,
+        parse_ms=_ms(parsed - started),
+        hash_ms=_ms(hashed - parsed),
+        verify_ms=_ms(done - hashed),
+        elapsed_ms=_ms(done - started),
+    )
+    return record
+
+
+def _init_worker(public_key_pem: bytes | None) -> None:
+    global _worker_public_key
+    _worker_public_key = get_keyring().from_pem(public_key_pem) if public_key_pem else None
+
+
+def _verify_in_worker(path: Path) -> dict[str, Any]:
+    return verify_bom_file(path, _worker_public_key)
+
+
+def verify_many(
+    paths: list[Path],
+    public_key_pem: bytes | None = None,
+    jobs: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Verify ``paths`` across ``jobs`` processes, yielding report records in input order.
+
+    Workers read, parse and hash each BOM themselves, so only paths and the small
+    report records cross process boundaries. The trusted key is parsed once per
+    worker; keys named by ``key_id`` are cached in each worker's keyring.
+    """
+    jobs = min(jobs or default_jobs(), max(1, len(paths)))
+    if jobs == 1:
+        _init_worker(public_key_pem)
+        yield from map(_verify_in_worker, paths)
+        return
+    # Small batches amortise the IPC round trip without starving the last workers.
+    chunksize = max(1, min(64, len(paths) // (jobs * 8)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(public_key_pem,)) as pool:
+        yield from pool.map(_verify_in_worker, paths, chunksize=chunksize)
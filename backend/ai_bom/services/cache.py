@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import sqlite3
+import time
+from collections.abc import Callable
+from typing import Any, Self
+
+from ai_bom.services.cdc import chunk_delta
+
+
+CACHE_FILENAME = "fingerprints.db"
+# Bump when the table layout or the stored fingerprint format changes; older
+# caches are dropped rather than migrated.
+SCHEMA_VERSION = 5
+# Content-keyed entries (git blob ids) are kept this long after they were last used.
+BLOB_TTL_SECONDS = 30 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    path TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns, algorithm)
+);
+CREATE INDEX IF NOT EXISTS fingerprints_path ON fingerprints (path);
+CREATE TABLE IF NOT EXISTS blob_fingerprints (
+    oid TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    seen_at INTEGER NOT NULL,
+    PRIMARY KEY (oid, algorithm)
+);
+CREATE TABLE IF NOT EXISTS chunk_index (
+    path TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    chunks BLOB NOT NULL,
+    PRIMARY KEY (path, algorithm)
+);
+"""
+
+
+def stat_key(st: os.stat_result) -> tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class FingerprintCache:
+    """Persistent fingerprint cache stored under ``.ai-bom/``.
+
+    Entries are keyed by ``(device, inode, size, mtime_ns, algorithm)`` so an
+    unchanged file is answered from a single ``stat``. Writes are buffered and
+    flushed in one transaction; SQLite WAL mode keeps concurrent scans safe.
+
+    Files that git reports as clean can also be looked up by blob id, which
+    survives fresh clones (new inodes and mtimes) when ``.ai-bom/`` is restored.
+
+    Datasets fingerprinted with content-defined chunks also keep their latest
+    chunk list per path, so a rescan can skip the chunks that are unchanged and
+    report how much of a file changed.
+    """
+
+    def __init__(self, path: str | pathlib.Path, root: str | pathlib.Path = ".") -> None:
+        self.path = pathlib.Path(path)
+        self.root = pathlib.Path(root)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS fingerprints")
+                self._conn.execute("DROP TABLE IF EXISTS blob_fingerprints")
+                self._conn.execute("DROP TABLE IF EXISTS chunk_index")
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+        self._pending: list[tuple[int, int, int, int, str, str, str]] = []
+        self._pending_blobs: dict[tuple[str, str], str] = {}
+        self._pending_chunks: dict[tuple[str, str], bytes] = {}
+        self._seen: dict[str, tuple[int, int, int, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_directory(cls, dir: str | pathlib.Path) -> Self:
+        base = pathlib.Path(dir)
+        return cls(base / ".ai-bom" / CACHE_FILENAME, root=base)
+
+    def get(self, path: str, st: os.stat_result, algorithm: str, oid: str | None = None) -> dict[str, Any] | None:
+        """Look up by file identity, then by git blob id when the caller vouches ``oid`` is current."""
+        key = stat_key(st)
+        self._seen[path] = key
+        row = self._conn.execute(
+            "SELECT fingerprint, path FROM fingerprints WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND algorithm=?",
+            (*key, algorithm),
+        ).fetchone()
+        if row is not None:
+            self.hits += 1
+            fingerprint = json.loads(row[0])
+            if row[1] != path:
+                # Renamed or hard-linked file: re-point the entry so eviction keeps it.
+                self.put(path, st, algorithm, fingerprint)
+            return fingerprint
+        if oid is not None:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM blob_fingerprints WHERE oid=? AND algorithm=?", (oid, algorithm)
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                fingerprint = json.loads(row[0])
+                self.put(path, st, algorithm, fingerprint, oid=oid)
+                return fingerprint
+        self.misses += 1
+        return None
+
+    def put(
+        self, path: str, st: os.stat_result, algorithm: str, fingerprint: dict[str, Any], oid: str | None = None
+    ) -> None:
+        encoded = json.dumps(fingerprint, separators=(",", ":"))
+        self._pending.append((*stat_key(st), algorithm, path, encoded))
+        if oid is not None:
+            self._pending_blobs[(oid, algorithm)] = encoded
+        if len(self._pending) >= 1000:
+            self.flush()
+
+    def chunks(self, path: str, algorithm: str) -> bytes | None:
+        """The latest chunk index recorded for ``path``, if any."""
+        pending = self._pending_chunks.get((path, algorithm))
+        if pending is not None:
+            return pending
+        row = self._conn.execute(
+            "SELECT chunks FROM chunk_index WHERE path=? AND algorithm=?", (path, algorithm)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def record_chunks(self, path: str, algorithm: str, chunks: bytes) -> dict[str, int]:
+        """Replace the chunk index of ``path`` and report what changed since the previous one."""
+        previous = self.chunks(path, algorithm)
+        self._pending_chunks[(path, algorithm)] = chunks
+        return chunk_delta(previous, chunks)
+
+    def get_or_compute(
+        self, path: str, st: os.stat_result, algorithm: str, compute: Callable[[], dict[str, Any]]
+    ) -> dict[str, Any]:
+        fingerprint = self.get(path, st, algorithm)
+        if fingerprint is None:
+            fingerprint = compute()
+            self.put(path, st, algorithm, fingerprint)
+        return fingerprint
+
+    def flush(self) -> None:
+        if not self._pending and not self._pending_blobs and not self._pending_chunks:
+            return
+        now = int(time.time())
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fingerprints (dev, ino, size, mtime_ns, algorithm, path, fingerprint) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO blob_fingerprints (oid, algorithm, fingerprint, seen_at) VALUES (?, ?, ?, ?)",
+                [(oid, algorithm, fp, now) for (oid, algorithm), fp in self._pending_blobs.items()],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunk_index (path, algorithm, chunks) VALUES (?, ?, ?)",
+                [(path, algorithm, chunks) for (path, algorithm), chunks in self._pending_chunks.items()],
+            )
+        self._pending.clear()
+        self._pending_blobs.clear()
+        self._pending_chunks.clear()
+
+    def evict(self, seen: dict[str, tuple[int, int, int, int]] | None = None) -> int:
+        """Drop entries for deleted files and for stale versions of files seen this scan."""
+        seen = self._seen if seen is None else seen
+        self.flush()
+        stale: list[tuple[int, int, int, int, str]] = []
+        for dev, ino, size, mtime_ns, algorithm, path in self._conn.execute(
+            "SELECT dev, ino, size, mtime_ns, algorithm, path FROM fingerprints"
+        ):
+            key = (dev, ino, size, mtime_ns)
+            current = seen.get(path)
+            if current is not None:
+                if current != key:
+                    stale.append((*key, algorithm))
+            elif not (self.root / path).exists():
+                stale.append((*key, algorithm))
+        with self._conn:
+            if stale:
+                self._conn.executemany(
+                    "DELETE FROM fingerprints WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND algorithm=?",
+                    stale,
+                )
+            expired = self._conn.execute(
+                "DELETE FROM blob_fingerprints WHERE seen_at < ?", (int(time.time()) - BLOB_TTL_SECONDS,)
+            ).rowcount
+            gone = [
+                (path,)
+                for (path,) in self._conn.execute("SELECT DISTINCT path FROM chunk_index").fetchall()
+                if path not in seen and not (self.root / path).exists()
+            ]
+            self._conn.executemany("DELETE FROM chunk_index WHERE path=?", gone)
+        return len(stale) + expired + len(gone)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from typing import Any
+
+from ai_bom.core.utils import hash_file
+
+
+LFS_POINTER_MAX_BYTES = 1024
+LFS_SPEC_PREFIX = b"version https://git-lfs.github.com/spec/"
+DVC_SUFFIX = ".dvc"
+
+_SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+_MD5_HEX = re.compile(r"^[0-9a-f]{32}$")
+
+
+def parse_lfs_pointer(data: bytes) -> tuple[str, int] | None:
+    """Return ``(sha256, size)`` from a git-lfs pointer file, or None if ``data`` is not one."""
+    if not data.startswith(LFS_SPEC_PREFIX):
+        return None
+    oid = size = None
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        key, _, value = line.partition(" ")
+        if key == "oid" and value.startswith("sha256:"):
+            oid = value[len("sha256:") :].strip()
+        elif key == "size" and value.strip().isdigit():
+            size = int(value)
+    if oid is None or size is None or not _SHA256_HEX.match(oid):
+        return None
+    return oid, size
+
+
+def read_lfs_pointer(path: str, size: int, head: bytes | None = None) -> tuple[str, int] | None:
+    """Parse ``path`` as a git-lfs pointer; ``head`` (bytes already read from its start) avoids a second read."""
+    if size > LFS_POINTER_MAX_BYTES:
+        return None
+    if head is not None and len(head) >= size:
+        return parse_lfs_pointer(head[:size])
+    try:
+        with open(path, "rb") as f:
+            return parse_lfs_pointer(f.read(LFS_POINTER_MAX_BYTES))
+    except OSError:
+        return None
+
+
+def lfs_object_path(repo_root: str | os.PathLike[str], oid: str) -> str:
+    return os.path.join(repo_root, ".git", "lfs", "objects", oid[:2], oid[2:4], oid)
+
+
+def hf_blob_digest(path: str) -> str | None:
+    """sha256 from a Hugging Face hub cache snapshot symlink pointing at ``blobs/<sha256>``.
+
+    Small files are stored under their git blob id (sha1), which is not a content
+    sha256, so only 64-hex blob names are trusted.
+    """
+    try:
+        target = os.readlink(path)
+    except OSError:
+        return None
+    parent, name = os.path.split(os.path.normpath(os.path.join(os.path.dirname(path), target)))
+    if os.path.basename(parent) != "blobs" or not _SHA256_HEX.match(name):
+        return None
+    return name
+
+
+def parse_dvc_file(path: str) -> list[dict[str, Any]]:
+    """Return the file ``outs`` of a ``.dvc`` file as ``{"path", "md5", "size", "hash"}`` dicts.
+
+    Only the flat ``outs:`` list layout written by ``dvc add`` is understood;
+    directory outputs (``.dir`` digests) are skipped.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    outs: list[dict[str, Any]] = []
+    current: dict[str, Any] | None = None
+    in_outs = False
+    for raw in lines:
+        if not raw.strip() or raw.lstrip().startswith("#"):
+            continue
+        if not raw.startswith((" ", "-")):
+            in_outs = raw.rstrip() == "outs:"
+            continue
+        if not in_outs:
+            continue
+        line = raw.strip()
+        if line.startswith("- "):
+            current = {}
+            outs.append(current)
+            line = line[2:]
+        if current is None:
+            continue
+        key, _, value = line.partition(":")
+        current[key.strip()] = value.strip().strip("'\"")
+    result = []
+    for out in outs:
+        md5 = out.get("md5", "")
+        if not out.get("path") or not _MD5_HEX.match(md5):
+            continue
+        size = out.get("size", "")
+        result.append(
+            {"path": out["path"], "md5": md5, "size": int(size) if size.isdigit() else None, "hash": out.get("hash")}
+        )
+    return result
+
+
+def verify_digest(path: str, algorithm: str, expected: str) -> bool:
+    hasher = hashlib.new(algorithm, usedforsecurity=False)
+    return hash_file(path, hasher).hexdigest() == expected
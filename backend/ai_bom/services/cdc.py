@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import os
+import zlib
+from collections.abc import Iterator
+from typing import Any
+
+
+DEFAULT_CDC_AVG_SIZE = 1024 * 1024
+# Fingerprint label of a cdc root: it is not the sha256 of the file and must not
+# be compared with one.
+CDC_ALGORITHM = "sha256-cdc"
+_CDC_DOMAIN = b"ai-bom-cdc-v2"
+# Packed chunk index entry: 32-byte sha256, 4-byte crc32, then an 8-byte length, big-endian.
+_ENTRY_SIZE = 44
+
+
+# Boundaries are only considered at line ends (just after this byte). For CSV and
+# JSONL that is every row, so an edited row only moves the boundaries next to it;
+# compressed or binary data has one about every 256 bytes. Files without it
+# degrade to ``max_size`` chunks.
+_ANCHOR = b"\n"
+_ANCHOR_SPACING = 256
+# Lines are split and crc32-hashed in blocks of this size, all in C.
+_SEARCH_BLOCK = 64 * 1024
+
+
+def cdc_params(avg_size: int = DEFAULT_CDC_AVG_SIZE) -> dict[str, int]:
+    """FastCDC-style bounds: boundaries are ignored below ``min_size`` and forced at ``max_size``."""
+    return {"min_size": max(avg_size // 4, 64), "avg_size": avg_size, "max_size": avg_size * 8}
+
+
+def _masks(min_size: int, avg_size: int) -> tuple[int, int]:
+    bits = max(1, round(math.log2(max(avg_size - min_size, _ANCHOR_SPACING) / _ANCHOR_SPACING)))
+    # Normalized chunking: stricter than average before ``avg_size``, looser after,
+    # which narrows the chunk size distribution around the average.
+    return (1 << (bits + 1)) - 1, (1 << max(bits - 1, 0)) - 1
+
+
+def _find_line_cut(data: Any, pos: int, stop: int, mask: int) -> tuple[int, int]:
+    # Lines start at ``pos``; returns (cut, -1) after the first line ending before
+    # ``stop`` whose crc32 matches ``mask``, else (-1, start of the unfinished line).
+    while pos < stop:
+        block = data[pos : min(pos + _SEARCH_BLOCK, stop)]
+        lines = block.split(_ANCHOR)
+        tail = lines.pop()
+        if lines:
+            hits = list(map(mask.__and__, map(zlib.crc32, lines)))
+            if 0 in hits:
+                k = hits.index(0) + 1
+                return pos + sum(map(len, lines[:k])) + k, -1
+            pos += len(block) - len(tail)
+        elif pos + len(block) >= stop:
+            break
+        else:
+            # A line longer than the block: look for its end and hash it whole.
+            nl = data.find(_ANCHOR, pos + len(block), stop)
+            if nl < 0:
+                break
+            if not zlib.crc32(data[pos:nl]) & mask:
+                return nl + 1, -1
+            pos = nl + 1
+    return -1, pos
+
+
+def next_cut(data: Any, start: int, min_size: int, avg_size: int, max_size: int) -> int:
+    """End offset of the content-defined chunk of ``data`` (bytes or an mmap) that begins at ``start``.
+
+    A line end is a boundary when the crc32 of the line (clipped to the chunk)
+    matches the mask. The cut depends only on the bytes in ``[start, cut)``, so a
+    chunk whose start and bytes are unchanged ends in the same place again.
+    """
+    size = len(data)
+    if size - start <= min_size:
+        return size
+    end = min(start + max_size, size)
+    strict, loose = _masks(min_size, avg_size)
+    # The line holding the first eligible cut starts after the last anchor before it.
+    pos = data.rfind(_ANCHOR, start, start + min_size - 1) + 1 or start
+    for mask, stop in ((strict, min(start + avg_size, end)), (loose, end)):
+        cut, pos = _find_line_cut(data, pos, stop, mask)
+        if cut >= 0:
+            return cut
+    return end
+
+
+def cdc_boundaries(data: Any, min_size: int, avg_size: int, max_size: int) -> Iterator[int]:
+    """End offsets of the content-defined chunks of ``data``; see :func:`next_cut`."""
+    start = 0
+    while start < len(data):
+        start = next_cut(data, start, min_size, avg_size, max_size)
+        yield start
+
+
+def _entry(chunk: Any) -> bytes:
+    return hashlib.sha256(chunk).digest() + zlib.crc32(chunk).to_bytes(4, "big") + len(chunk).to_bytes(8, "big")
+
+
+def cdc_chunks(
+    path: str | os.PathLike[str],
+    min_size: int,
+    avg_size: int,
+    max_size: int,
+    previous: bytes | None = None,
+) -> tuple[int, bytes]:
+    """File size and the packed ``(sha256, crc32, length)`` list of its content-defined chunks.
+
+    ``previous`` is the chunk list of an earlier version of the file. Where one of
+    its chunks is expected to start again (at the same offset, or shifted by the
+    change in file size after an edit), its bytes are checked with crc32 and, if
+    they match, its boundary and sha256 are reused without searching or hashing.
+    Appends and small edits therefore only search and sha256 the changed regions.
+    The crc32 check guards against accidental change, not tampering; the cdc
+    root is recomputed in full when fingerprints are verified.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0, b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            old = list(_iter_entries(previous or b""))
+            # Offset in the previous version -> index of the chunk that started there.
+            old_starts: dict[int, int] = {}
+            offset = 0
+            for index, (_, _, length) in enumerate(old):
+                old_starts[offset] = index
+                offset += length
+            old_size = offset
+            entries = bytearray()
+            start = shift = 0
+            while start < size:
+                index = old_starts.get(start - shift)
+                if index is not None:
+                    digest, crc, length = old[index]
+                    end = start + length
+                    # The last chunk may have been cut by the end of the file, which has moved.
+                    last_ok = index < len(old) - 1 or end == size
+                    if last_ok and end <= size and zlib.crc32(view[start:end]) == crc:
+                        entries += digest + crc.to_bytes(4, "big") + length.to_bytes(8, "big")
+                        start = end
+                        continue
+                end = next_cut(mm, start, min_size, avg_size, max_size)
+                entries += _entry(view[start:end])
+                start = end
+                if start - shift not in old_starts:
+                    # Past an edit, expect the old chunks moved by the change in size.
+                    shift = size - old_size
+            return size, bytes(entries)
+
+
+def _iter_entries(packed: bytes) -> Iterator[tuple[bytes, int, int]]:
+    for offset in range(0, len(packed), _ENTRY_SIZE):
+        entry = packed[offset : offset + _ENTRY_SIZE]
+        yield entry[:32], int.from_bytes(entry[32:36], "big"), int.from_bytes(entry[36:], "big")
+
+
+def iter_chunks(packed: bytes) -> Iterator[tuple[bytes, int]]:
+    for digest, _, length in _iter_entries(packed):
+        yield digest, length
+
+
+def cdc_root(size: int, packed: bytes) -> str:
+    """File digest over the size and the ordered chunk digests."""
+    hasher = hashlib.sha256(_CDC_DOMAIN)
+    hasher.update(size.to_bytes(8, "big"))
+    for digest, _ in iter_chunks(packed):
+        hasher.update(digest)
+    return hasher.hexdigest()
+
+
+def chunk_delta(previous: bytes | None, current: bytes) -> dict[str, int]:
+    """How ``current`` differs from the chunk list ``previous`` of an earlier version."""
+    chunks = list(iter_chunks(current))
+    if previous is None:
+        return {"chunk_count": len(chunks), "bytes_changed": sum(length for _, length in chunks)}
+    before = dict(iter_chunks(previous))
+    reused = [length for digest, length in chunks if digest in before]
+    after = {digest for digest, _ in chunks}
+    return {
+        "chunk_count": len(chunks),
+        "chunks_reused": len(reused),
+        "bytes_reused": sum(reused),
+        "bytes_changed": sum(length for _, length in chunks) - sum(reused),
+        "bytes_removed": sum(length for digest, length in before.items() if digest not in after),
+    }
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import json
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, TextIO, overload
+
+import orjson
+
+
+# Index sentinel for "this column has no value for the row; see the row's rest".
+_NONE = 0xFFFFFFFF
+# Set on a path index when the origin path is that prefix followed by the component name.
+_PREFIXED = 0x80000000
+_HEX = frozenset("0123456789abcdef")
+
+
+def _uuid_bytes(value: Any) -> bytes | None:
+    # Only canonical (lower-case, hyphenated) uuids, so they print back unchanged.
+    if not isinstance(value, str) or len(value) != 36 or not _HEX.issuperset(value.replace("-", "")):
+        return None
+    if value[8] != "-" or value[13] != "-" or value[18] != "-" or value[23] != "-":
+        return None
+    return bytes.fromhex(value.replace("-", ""))
+
+
+class ComponentTable(Sequence[dict[str, Any]]):
+    """Scanned components stored column-wise, for scans too large to hold as dicts.
+
+    Each row keeps its uuid as 16 bytes, its digest as raw bytes, its name as a
+    shared directory prefix plus UTF-8 basename, and interned indexes for the type,
+    algorithm, origin path prefix and git info (one shared copy per table).
+    Everything else (metadata, strategy, params) is stored as compact JSON,
+    interned so identical values are kept once. That is on the order of 100
+    bytes per component instead of 1-2 KB of nested dicts; see
+    ``scripts/bench_components.py``.
+
+    Iterating or indexing yields regular component dicts built on demand, so a
+    table can stand in for the ``components`` list of a BOM. Mutating those
+    dicts does not change the table.
+    """
+
+    def __init__(self, components: Iterable[dict[str, Any]] = ()) -> None:
+        self._ids = bytearray()
+        self._dirs = array("I")
+        self._basenames = bytearray()
+        self._basename_ends = array("Q")
+        self._types = array("I")
+        self._paths = array("I")
+        self._gits = array("I")
+        self._algorithms = array("I")
+        self._digests = bytearray()
+        self._digest_ends = array("Q")
+        self._rests = array("I")
+        self._pool: list[str] = []
+        self._pool_index: dict[str, int] = {}
+        self._rest_pool: list[bytes] = []
+        self._rest_index: dict[bytes, int] = {}
+        self._git_pool: list[dict[str, Any]] = []
+        self._git_index: dict[str, int] = {}
+        # The scanner hands every component the same git dict; skip re-keying it.
+        self._last_git: tuple[dict[str, Any] | None, int] = (None, _NONE)
+        self.extend(components)
+
+    def _intern(self, value: str) -> int:
+        index = self._pool_index.get(value)
+        if index is None:
+            index = self._pool_index[value] = len(self._pool)
+            self._pool.append(value)
+        return index
+
+    def _intern_rest(self, rest: dict[str, Any]) -> int:
+        value = orjson.dumps(rest)
+        index = self._rest_index.get(value)
+        if index is None:
+            index = self._rest_index[value] = len(self._rest_pool)
+            self._rest_pool.append(value)
+        return index
+
+    def _intern_git(self, git: dict[str, Any]) -> int:
+        if self._last_git[0] is git:
+            return self._last_git[1]
+        key = json.dumps(git, sort_keys=True)
+        index = self._git_index.get(key)
+        if index is None:
+            index = self._git_index[key] = len(self._git_pool)
+            self._git_pool.append(dict(git))
+        self._last_git = (git, index)
+        return index
+
+    def append(self, component: dict[str, Any]) -> None:
+        rest = dict(component)
+        name = rest.pop("name")
+
+        id_bytes = _uuid_bytes(rest.get("component_id"))
+        if id_bytes is not None:
+            del rest["component_id"]
+        else:
+            id_bytes = bytes(16)
+
+        git_index = path_index = _NONE
+        origin = rest.get("origin")
+        if isinstance(origin, dict):
+            origin = dict(origin)
+            if isinstance(origin.get("git"), dict):
+                git_index = self._intern_git(origin.pop("git"))
+            path = origin.get("path")
+            if isinstance(path, str):
+                del origin["path"]
+                if path.endswith(name):
+                    path_index = self._intern(path[: len(path) - len(name)]) | _PREFIXED
+                else:
+                    path_index = self._intern(path)
+            if origin:
+                rest["origin"] = origin
+            else:
+                del rest["origin"]
+
+        algorithm_index = _NONE
+        digest = b""
+        fingerprint = rest.get("fingerprint")
+        if isinstance(fingerprint, dict):
+            algorithm, hex_digest = fingerprint.get("algorithm"), fingerprint.get("hash")
+            if (
+                isinstance(algorithm, str)
+                and isinstance(hex_digest, str)
+                and len(hex_digest) % 2 == 0
+                and _HEX.issuperset(hex_digest)
+            ):
+                fingerprint = {k: v for k, v in fingerprint.items() if k not in ("algorithm", "hash")}
+                algorithm_index = self._intern(algorithm)
+                digest = bytes.fromhex(hex_digest)
+                if fingerprint:
+                    rest["fingerprint"] = fingerprint
+                else:
+                    del rest["fingerprint"]
+
+        cut = name.rfind("/") + 1
+        directory, basename = name[:cut], name[cut:]
+        self._ids += id_bytes
+        self._dirs.append(self._intern(directory))
+        self._basenames += basename.encode("utf-8")
+        self._basename_ends.append(len(self._basenames))
+        self._types.append(self._intern(rest.pop("type")))
+        self._paths.append(path_index)
+        self._gits.append(git_index)
+        self._algorithms.append(algorithm_index)
+        self._digests += digest
+        self._digest_ends.append(len(self._digests))
+        self._rests.append(self._intern_rest(rest) if rest else _NONE)
+
+    def extend(self, components: Iterable[dict[str, Any]]) -> None:
+        for component in components:
+            self.append(component)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def name(self, i: int) -> str:
+        start = self._basename_ends[i - 1] if i else 0
+        basename = self._basenames[start : self._basename_ends[i]].decode("utf-8")
+        return self._pool[self._dirs[i]] + basename
+
+    def _row(self, i: int) -> dict[str, Any]:
+        rest: dict[str, Any] = orjson.loads(self._rest_pool[self._rests[i]]) if self._rests[i] != _NONE else {}
+        name = self.name(i)
+        row: dict[str, Any] = {}
+        if "component_id" in rest:
+            row["component_id"] = rest.pop("component_id")
+        else:
+            h = self._ids[i * 16 : i * 16 + 16].hex()
+            row["component_id"] = f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+        row["type"] = self._pool[self._types[i]]
+        row["name"] = name
+
+        origin = rest.pop("origin", None)
+        if self._gits[i] != _NONE or self._paths[i] != _NONE:
+            rebuilt: dict[str, Any] = {}
+            if self._gits[i] != _NONE:
+                rebuilt["git"] = dict(self._git_pool[self._gits[i]])
+            path_index = self._paths[i]
+            if path_index != _NONE:
+                prefix = self._pool[path_index & ~_PREFIXED]
+                rebuilt["path"] = prefix + name if path_index & _PREFIXED else prefix
+            origin = {**rebuilt, **(origin or {})}
+        if origin is not None:
+            row["origin"] = origin
+
+        fingerprint = rest.pop("fingerprint", None)
+        if self._algorithms[i] != _NONE:
+            start = self._digest_ends[i - 1] if i else 0
+            digest = self._digests[start : self._digest_ends[i]].hex()
+            fingerprint = {"algorithm": self._pool[self._algorithms[i]], "hash": digest, **(fingerprint or {})}
+        if fingerprint is not None:
+            row["fingerprint"] = fingerprint
+        row.update(rest)
+        return row
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("component index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def sort_by_name(self) -> None:
+        """Reorder rows by ``(name, component_id)`` without materialising them."""
+        ids = self._ids
+
+        def key(i: int) -> tuple[str, bytes]:
+            return self.name(i), bytes(ids[i * 16 : i * 16 + 16])
+
+        order = sorted(range(len(self)), key=key)
+        self._ids = bytearray(b"".join(bytes(ids[i * 16 : i * 16 + 16]) for i in order))
+        self._basenames, self._basename_ends = self._take_bytes(self._basenames, self._basename_ends, order)
+        self._digests, self._digest_ends = self._take_bytes(self._digests, self._digest_ends, order)
+        for column in ("_dirs", "_types", "_paths", "_gits", "_algorithms", "_rests"):
+            values = getattr(self, column)
+            setattr(self, column, array(values.typecode, (values[i] for i in order)))
+
+    @staticmethod
+    def _take_bytes(data: bytearray, ends: array, order: list[int]) -> tuple[bytearray, array]:
+        taken, new_ends = bytearray(), array("Q")
+        for i in order:
+            taken += data[ends[i - 1] if i else 0 : ends[i]]
+            new_ends.append(len(taken))
+        return taken, new_ends
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and the interned values."""
+        columns = (
+            self._ids, self._dirs, self._basenames, self._basename_ends, self._types, self._paths,
+            self._gits, self._algorithms, self._digests, self._digest_ends, self._rests,
+        )  # fmt: skip
+        size = sum(len(c) * (c.itemsize if isinstance(c, array) else 1) for c in columns)
+        return size + sum(len(value) + 49 for value in self._pool) + sum(len(v) + 33 for v in self._rest_pool)
+
+
+def _holds_table(value: Any) -> bool:
+    if isinstance(value, ComponentTable):
+        return True
+    if isinstance(value, dict):
+        return any(_holds_table(v) for v in value.values())
+    if isinstance(value, list):
+        return any(_holds_table(v) for v in value)
+    return False
+
+
+def iter_json(
+    value: Any, indent: int | None = None, separators: tuple[str, str] | None = None, _level: int = 0
+) -> Iterator[str]:
+    """``json.dumps(value, indent=..., separators=...)`` in pieces, one component at a time
+    for any :class:`ComponentTable` inside ``value``."""
+    if not _holds_table(value):
+        text = json.dumps(value, indent=indent, separators=separators)
+        if indent is not None and _level:
+            text = text.replace("\n", "\n" + " " * (indent * _level))
+        yield text
+        return
+    item_sep, key_sep = separators or ((",", ": ") if indent is not None else (", ", ": "))
+    inner = "" if indent is None else "\n" + " " * (indent * (_level + 1))
+    closing = "" if indent is None else "\n" + " " * (indent * _level)
+    if isinstance(value, dict):
+        yield "{"
+        for i, (key, item) in enumerate(value.items()):
+            yield (item_sep if i else "") + inner + json.dumps(key) + key_sep
+            yield from iter_json(item, indent, separators, _level + 1)
+        yield closing + "}"
+        return
+    if not len(value):
+        yield "[]"
+        return
+    yield "["
+    for i, item in enumerate(value):
+        yield (item_sep if i else "") + inner
+        yield from iter_json(item, indent, separators, _level + 1)
+    yield closing + "]"
+
+
+def dump_json(value: Any, out: TextIO, indent: int | None = None) -> None:
+    """Write ``value`` like ``json.dump``, streaming the rows of component tables."""
+    out.writelines(iter_json(value, indent=indent))
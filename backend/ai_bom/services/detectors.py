@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable
+from functools import lru_cache, partial
+from importlib.metadata import entry_points
+from typing import Any, NamedTuple
+
+import structlog
+
+from ai_bom.services.fingerprint import FingerprintMethod
+from ai_bom.services.metadata import gguf_metadata, onnx_metadata, parquet_metadata, safetensors_metadata
+
+
+SNIFF_BYTES = 4096
+# Bump when extractor output changes so cached metadata is recomputed.
+METADATA_VERSION = 1
+ENTRY_POINT_GROUP = "ai_bom.detectors"
+# Files without a suffix (``weights``, ``pytorch_model``) are classified from content alone.
+NO_SUFFIX = ""
+
+
+class Detector(NamedTuple):
+    """Classifies files as a component ``component_type`` of format ``name``.
+
+    ``suffixes`` route files to the detector without reading them. ``magic``
+    prefixes and ``sniff`` recognise the format from the first ``SNIFF_BYTES``
+    of a file; they are consulted for files without a suffix, and for suffix
+    matches when ``content_required`` is set. Higher ``priority`` detectors are
+    tried first for a shared suffix.
+    """
+
+    name: str
+    component_type: str
+    suffixes: tuple[str, ...] = ()
+    magic: tuple[bytes, ...] = ()
+    sniff: Callable[[bytes], bool] | None = None
+    content_required: bool = False
+    priority: int = 0
+    # Header-only extractor called as ``metadata(path, head)``; fills ``Component.metadata``.
+    metadata: Callable[..., dict[str, Any]] | None = None
+
+    def matches_content(self, head: bytes) -> bool:
+        if self.magic and head.startswith(self.magic):
+            return True
+        return self.sniff is not None and self.sniff(head)
+
+    def metadata_method(self) -> FingerprintMethod | None:
+        """The extractor wrapped for the fingerprint cache and hash executor, if there is one."""
+        if self.metadata is None:
+            return None
+        compute = partial(_extract_metadata, self.metadata)
+        return FingerprintMethod(f"metadata-{self.name}-v{METADATA_VERSION}", compute, SNIFF_BYTES, uses_head=True)
+
+
+class Detection(NamedTuple):
+    detector: Detector
+    # The sniff buffer, when classification had to read it; reused as the first block hashed.
+    head: bytes | None = None
+
+
+def _extract_metadata(
+    extractor: Callable[..., dict[str, Any]], path: str | os.PathLike[str], head: bytes | None = None
+) -> dict[str, Any]:
+    # A malformed header should not fail the scan; record why it was not read instead.
+    try:
+        return extractor(path, head)
+    except Exception as exc:
+        return {"metadata_error": f"{type(exc).__name__}: {exc}"}
+
+
+def read_head(path: str | os.PathLike[str], size: int = SNIFF_BYTES) -> bytes:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.pread(fd, size, 0)
+    finally:
+        os.close(fd)
+
+
+def _is_safetensors(head: bytes) -> bool:
+    # 8-byte little-endian JSON header length, then the JSON header itself.
+    return len(head) > 9 and head[8:9] == b"{" and 2 <= int.from_bytes(head[:8], "little") < 100 * 1024 * 1024
+
+
+def _is_pickle(head: bytes) -> bool:
+    return len(head) > 2 and head[0] == 0x80 and 2 <= head[1] <= 5
+
+
+def _is_torch_zip(head: bytes) -> bool:
+    # torch.save writes a zip whose first member is ``<archive>/data.pkl`` or ``<archive>/.format``.
+    return head.startswith(b"PK\x03\x04") and (b"data.pkl" in head or b"/.format" in head)
+
+
+def _is_tflite(head: bytes) -> bool:
+    return head[4:8] == b"TFL3"
+
+
+BUILTIN_DETECTORS: tuple[Detector, ...] = (
+    Detector("safetensors", "model", (".safetensors",), sniff=_is_safetensors, metadata=safetensors_metadata),
+    Detector("gguf", "model", (".gguf",), magic=(b"GGUF",), metadata=gguf_metadata),
+    Detector("onnx", "model", (".onnx",), metadata=onnx_metadata),
+    Detector("tflite", "model", (".tflite",), sniff=_is_tflite),
+    Detector("hdf5", "model", (".h5", ".hdf5"), magic=(b"\x89HDF\r\n\x1a\n",)),
+    Detector("pytorch", "model", (".pt", ".pth", ".ckpt", ".bin"), sniff=_is_torch_zip),
+    Detector("pickle", "model", (".pkl", ".pickle", ".joblib"), sniff=_is_pickle),
+    Detector("parquet", "dataset", (".parquet",), magic=(b"PAR1",), metadata=parquet_metadata),
+    Detector("arrow", "dataset", (".arrow", ".feather"), magic=(b"ARROW1",)),
+    Detector("csv", "dataset", (".csv", ".tsv")),
+    Detector("jsonl", "dataset", (".jsonl", ".ndjson")),
+)
+
+
+class DetectorRegistry:
+    """Suffix dispatch table plus content sniffers, compiled once per set of detectors.
+
+    :meth:`classify` reads at most ``SNIFF_BYTES`` once per file, however many
+    detectors are registered, and only when no suffix-only detector decides it.
+    """
+
+    def __init__(self, detectors: Iterable[Detector] = (), sniff_no_suffix: bool = True) -> None:
+        self.sniff_no_suffix = sniff_no_suffix
+        self._detectors: list[Detector] = []
+        self._by_suffix: dict[str, tuple[Detector, ...]] = {}
+        self._sniffers: tuple[Detector, ...] = ()
+        self.register(*detectors)
+
+    @property
+    def detectors(self) -> tuple[Detector, ...]:
+        return tuple(self._detectors)
+
+    def register(self, *detectors: Detector) -> None:
+        self._detectors.extend(detectors)
+        by_suffix: dict[str, list[Detector]] = {}
+        for detector in self._detectors:
+            for suffix in detector.suffixes:
+                by_suffix.setdefault(suffix.lower(), []).append(detector)
+        # sorted() is stable, so equal priorities keep registration order.
+        self._by_suffix = {s: tuple(sorted(ds, key=lambda d: -d.priority)) for s, ds in by_suffix.items()}
+        self._sniffers = tuple(
+            sorted((d for d in self._detectors if d.magic or d.sniff), key=lambda d: -d.priority)
+        )
+
+    def suffixes(self) -> frozenset[str]:
+        """Lower-cased suffixes worth walking to, including ``""`` when suffix-less files are sniffed."""
+        suffixes = set(self._by_suffix)
+        if self.sniff_no_suffix and self._sniffers:
+            suffixes.add(NO_SUFFIX)
+        return frozenset(suffixes)
+
+    def classify_name(self, name: str) -> Detector | None:
+        """Best guess from the suffix alone, for files that are not available to read."""
+        candidates = self._by_suffix.get(os.path.splitext(name)[1].lower())
+        return candidates[0] if candidates else None
+
+    def classify(self, path: str, head: bytes | None = None) -> Detection | None:
+        suffix = os.path.splitext(path)[1].lower()
+        candidates = self._by_suffix.get(suffix)
+        if candidates is None:
+            if suffix != NO_SUFFIX or not self.sniff_no_suffix:
+                return None
+            candidates = self._sniffers
+            content_only = True
+        else:
+            content_only = False
+        for detector in candidates:
+            if not content_only and not detector.content_required:
+                return Detection(detector, head)
+            if head is None:
+                try:
+                    head = read_head(path)
+                except OSError:
+                    return None
+            if detector.matches_content(head):
+                return Detection(detector, head)
+        return None
+
+
+def _plugin_detectors(value: Any) -> list[Detector]:
+    if callable(value) and not isinstance(value, Detector):
+        value = value()
+    if isinstance(value, Detector):
+        return [value]
+    return [d for d in value if isinstance(d, Detector)]
+
+
+def load_plugin_detectors() -> list[Detector]:
+    """Detectors published by installed packages under the ``ai_bom.detectors`` entry point group.
+
+    An entry point may name a :class:`Detector`, an iterable of them, or a
+    callable returning either. Plugins that fail to load are logged and skipped.
+    """
+    detectors: list[Detector] = []
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            detectors.extend(_plugin_detectors(ep.load()))
+        except Exception as exc:
+            structlog.get_logger().warning("detector_plugin_failed", entry_point=ep.name, error=str(exc))
+    return detectors
+
+
+@lru_cache(maxsize=2)
+def default_registry(sniff_no_suffix: bool = True) -> DetectorRegistry:
+    return DetectorRegistry((*BUILTIN_DETECTORS, *load_plugin_detectors()), sniff_no_suffix=sniff_no_suffix)
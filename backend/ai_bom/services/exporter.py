@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -10,19 +10,35 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 
 from ai_bom.compliance.mapping import COMPLIANCE_MAPPING, build_compliance_report
+from ai_bom.services.component_table import dump_json
 
 
-def export_bom(bom: dict[str, Any], format: str = "json") -> str:  # noqa: A002 - param name by spec
+_EXTENSIONS = {"json": "json", "jsonld": "jsonld", "pdf": "pdf", "c2pa": "c2pa.json"}
+
+
+def export_bom(bom: dict[str, Any], format: str = "json", cache_key: str | None = None) -> str:  # noqa: A002 - param name by spec
+    """Write ``bom`` to ``exports/`` in ``format`` and return the path.
+
+    With ``cache_key`` (such as a stored BOM digest) the key is part of the file
+    name and an existing export under that name is returned without rebuilding it.
+    """
     out_dir = Path("exports")
     out_dir.mkdir(parents=True, exist_ok=True)
+    if format not in _EXTENSIONS:
+        raise ValueError("Unsupported export format")
+    stem = f"{bom['name']}-{bom['version']}" + (f"-{cache_key}" if cache_key else "")
+    if cache_key:
+        cached = out_dir / f"{stem}.{_EXTENSIONS[format]}"
+        if cached.is_file():
+            return str(cached)
     if format == "json":
-        path = out_dir / f"{bom['name']}-{bom['version']}.json"
+        path = out_dir / f"{stem}.json"
         payload = dict(bom)
         payload["compliance_report"] = build_compliance_report(bom)
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        _write_json(path, payload)
         return str(path)
     elif format == "jsonld":
-        path = out_dir / f"{bom['name']}-{bom['version']}.jsonld"
+        path = out_dir / f"{stem}.jsonld"
         jsonld = {
             "@context": "https://schema.org/",
             "@type": "Dataset",
@@ -31,15 +47,17 @@ def export_bom(bom: dict[str, Any], format: str = "json") -> str:  # noqa: A002
             "hasPart": bom.get("components", []),
             "dateCreated": bom.get("created_at"),
         }
-        path.write_text(json.dumps(jsonld, indent=2), encoding="utf-8")
+        _write_json(path, jsonld)
         return str(path)
     elif format == "pdf":
-        path = out_dir / f"{bom['name']}-{bom['version']}.pdf"
-        _export_pdf(bom, str(path))
+        path = out_dir / f"{stem}.pdf"
+        tmp = path.with_name(path.name + ".tmp")
+        _export_pdf(bom, str(tmp))
+        os.replace(tmp, path)
         return str(path)
     elif format == "c2pa":
         # Placeholder: return JSON with C2PA-like structure
-        path = out_dir / f"{bom['name']}-{bom['version']}.c2pa.json"
+        path = out_dir / f"{stem}.c2pa.json"
         payload = {
             "manifest": {
                 "title": bom["name"],
@@ -47,12 +65,21 @@ def export_bom(bom: dict[str, Any], format: str = "json") -> str:  # noqa: A002
                 "assertions": [{"label": "ai-bom", "data": bom}],
             }
         }
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        _write_json(path, payload)
         return str(path)
     else:
         raise ValueError("Unsupported export format")
 
 
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    # Streams the rows of a ComponentTable instead of materialising every component.
+    # Written aside and renamed, so a cached export is never a partial file.
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as out:
+        dump_json(payload, out, indent=2)
+    os.replace(tmp, path)
+
+
 def _export_pdf(bom: dict[str, Any], path: str) -> None:
     c = canvas.Canvas(path, pagesize=letter)
     width, height = letter
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+from collections.abc import Callable
+from functools import partial
+from typing import Any, NamedTuple
+
+from ai_bom.core.utils import MERKLE_ALGORITHM, MultiHasher, digest_file, hash_file, merkle_sha256_file
+from ai_bom.services.cdc import CDC_ALGORITHM, DEFAULT_CDC_AVG_SIZE, cdc_chunks, cdc_params, cdc_root
+
+
+DATASET_STRATEGIES = ("head", "sampled", "full", "cdc")
+# Key under which the "cdc" strategy hands its packed chunk list to the scanner;
+# it is moved into the cache's chunk index and never stored in the fingerprint.
+CHUNK_INDEX_KEY = "_chunks"
+# sha256 is always the primary fingerprint; the others can be computed in the same read.
+FINGERPRINT_ALGORITHMS = ("sha256", "sha512", "blake2b")
+# Where a fingerprint carries its digests in the extra algorithms, over the same bytes.
+EXTRA_FINGERPRINTS_KEY = "fingerprints"
+DEFAULT_HEAD_BYTES = 2 * 1024 * 1024
+DEFAULT_SAMPLE_BLOCK_SIZE = 64 * 1024
+DEFAULT_SAMPLES = 16
+# Parquet footers hold the schema and row-group index; anything larger is truncated.
+MAX_PARQUET_FOOTER_BYTES = 16 * 1024 * 1024
+_SAMPLED_DOMAIN = b"ai-bom-sampled-v1"
+
+
+class FingerprintMethod(NamedTuple):
+    """How to fingerprint one file: cache key, compute function and read cost.
+
+    Methods with ``uses_head`` accept ``head=`` (bytes already read from the start
+    of the file) and continue reading after it. Methods with ``uses_chunks``
+    accept ``previous=``, the chunk index of the file's last scan, and reuse the
+    chunks that are still there.
+    """
+
+    key: str
+    compute: Callable[..., dict[str, Any]]
+    max_bytes: int | None = None
+    uses_head: bool = False
+    uses_chunks: bool = False
+
+    def cost(self, size: int) -> int:
+        return size if self.max_bytes is None else min(size, self.max_bytes)
+
+    def run(self, path: pathlib.Path, head: bytes | None = None, previous: bytes | None = None) -> dict[str, Any]:
+        if head and self.uses_head:
+            return self.compute(path, head=head)
+        if previous and self.uses_chunks:
+            return self.compute(path, previous=previous)
+        return self.compute(path)
+
+
+def head_sha256(
+    path: str | pathlib.Path,
+    max_bytes: int = DEFAULT_HEAD_BYTES,
+    backend: str = "readinto",
+    drop_cache: bool = False,
+    head: bytes | None = None,
+) -> str:
+    hasher = hashlib.sha256()
+    return hash_file(path, hasher, max_bytes=max_bytes, backend=backend, drop_cache=drop_cache, head=head).hexdigest()
+
+
+def _parquet_footer_range(fd: int, size: int) -> tuple[int, int] | None:
+    if size < 12:
+        return None
+    tail = os.pread(fd, 8, size - 8)
+    if tail[4:] != b"PAR1":
+        return None
+    length = min(int.from_bytes(tail[:4], "little") + 8, size, MAX_PARQUET_FOOTER_BYTES)
+    return size - length, length
+
+
+def sampled_sha256(
+    path: str | pathlib.Path,
+    block_size: int = DEFAULT_SAMPLE_BLOCK_SIZE,
+    samples: int = DEFAULT_SAMPLES,
+) -> str:
+    """Constant-cost digest over the size, head, tail, ``samples`` evenly spaced blocks
+    and, for Parquet files, the footer. Files smaller than the sampled span are hashed whole.
+    """
+    return sampled_digests(path, ("sha256",), block_size, samples)["sha256"]
+
+
+def sampled_digests(
+    path: str | pathlib.Path,
+    algorithms: tuple[str, ...],
+    block_size: int = DEFAULT_SAMPLE_BLOCK_SIZE,
+    samples: int = DEFAULT_SAMPLES,
+) -> dict[str, str]:
+    """:func:`sampled_sha256` for each of ``algorithms``, reading the samples once."""
+    hasher = MultiHasher(algorithms)
+    hasher.update(_SAMPLED_DOMAIN)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        hasher.update(size.to_bytes(8, "big"))
+        if size <= (samples + 2) * block_size:
+            remaining, offset = size, 0
+            while remaining > 0:
+                data = os.pread(fd, min(remaining, 1024 * 1024), offset)
+                if not data:
+                    break
+                hasher.update(data)
+                offset += len(data)
+                remaining -= len(data)
+            return hasher.hexdigests()
+        offsets = [0]
+        usable = size - 3 * block_size
+        for i in range(samples):
+            offsets.append(block_size + (usable * (i + 1)) // (samples + 1))
+        offsets.append(size - block_size)
+        for offset in offsets:
+            hasher.update(os.pread(fd, block_size, offset))
+        footer = _parquet_footer_range(fd, size)
+        if footer is not None:
+            start, length = footer
+            hasher.update(os.pread(fd, length, start))
+        return hasher.hexdigests()
+    finally:
+        os.close(fd)
+
+
+def _with_extras(digests: dict[str, str], **fields: Any) -> dict[str, Any]:
+    # The sha256 fingerprint, carrying the other digests as fingerprints of their own.
+    fingerprint: dict[str, Any] = {"algorithm": "sha256", "hash": digests.pop("sha256"), **fields}
+    if digests:
+        fingerprint[EXTRA_FINGERPRINTS_KEY] = [
+            {"algorithm": algorithm, "hash": digest, **fields} for algorithm, digest in digests.items()
+        ]
+    return fingerprint
+
+
+def _sha256_fingerprint(
+    path: pathlib.Path,
+    backend: str = "readinto",
+    drop_cache: bool = False,
+    head: bytes | None = None,
+    extra_algorithms: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    digests = digest_file(path, ("sha256", *extra_algorithms), backend=backend, drop_cache=drop_cache, head=head)
+    return _with_extras(digests)
+
+
+def _dataset_fingerprint(
+    path: pathlib.Path,
+    strategy: str,
+    params: dict[str, int],
+    backend: str = "readinto",
+    drop_cache: bool = False,
+    head: bytes | None = None,
+    extra_algorithms: tuple[str, ...] = (),
+    previous: bytes | None = None,
+) -> dict[str, Any]:
+    algorithms = ("sha256", *extra_algorithms)
+    if strategy == "head":
+        digests = digest_file(
+            path, algorithms, max_bytes=params["bytes"], backend=backend, drop_cache=drop_cache, head=head
+        )
+    elif strategy == "sampled":
+        digests = sampled_digests(path, algorithms, params["block_size"], params["samples"])
+    elif strategy == "cdc":
+        size, chunks = cdc_chunks(path, params["min_size"], params["avg_size"], params["max_size"], previous)
+        return {
+            "algorithm": CDC_ALGORITHM,
+            "hash": cdc_root(size, chunks),
+            "strategy": strategy,
+            "params": dict(params),
+            CHUNK_INDEX_KEY: chunks,
+        }
+    else:
+        digests = digest_file(path, algorithms, backend=backend, drop_cache=drop_cache, head=head)
+    return _with_extras(digests, strategy=strategy, params=dict(params))
+
+
+def _algorithms_key(extra_algorithms: tuple[str, ...]) -> str:
+    return "".join(f"+{algorithm}" for algorithm in extra_algorithms)
+
+
+def sha256_method(
+    backend: str = "readinto", drop_cache: bool = False, extra_algorithms: tuple[str, ...] = ()
+) -> FingerprintMethod:
+    """sha256 over the whole file, plus ``extra_algorithms`` digests computed from the same reads."""
+    compute = partial(_sha256_fingerprint, backend=backend, drop_cache=drop_cache, extra_algorithms=extra_algorithms)
+    return FingerprintMethod("sha256" + _algorithms_key(extra_algorithms), compute, uses_head=True)
+
+
+def merkle_method(chunk_size: int, keep_chunks: bool = False, jobs: int = 1) -> FingerprintMethod:
+    """sha256-merkle over ``chunk_size`` chunks, hashed on ``jobs`` threads.
+
+    Methods run on ``HashExecutor`` workers, which already spread files
+    over the scan's threads, so chunks are hashed serially by default.
+    """
+    key = f"{MERKLE_ALGORITHM}-{chunk_size}" + ("-chunks" if keep_chunks else "")
+    return FingerprintMethod(
+        key, partial(merkle_sha256_file, chunk_size=chunk_size, jobs=jobs, keep_chunks=keep_chunks)
+    )
+
+
+def dataset_params(
+    strategy: str,
+    head_bytes: int = DEFAULT_HEAD_BYTES,
+    block_size: int = DEFAULT_SAMPLE_BLOCK_SIZE,
+    samples: int = DEFAULT_SAMPLES,
+    cdc_avg_size: int = DEFAULT_CDC_AVG_SIZE,
+) -> dict[str, int]:
+    if strategy == "head":
+        return {"bytes": head_bytes}
+    if strategy == "sampled":
+        return {"block_size": block_size, "samples": samples}
+    if strategy == "full":
+        return {}
+    if strategy == "cdc":
+        return cdc_params(cdc_avg_size)
+    raise ValueError(f"Unsupported dataset fingerprint strategy: {strategy}")
+
+
+def dataset_method(
+    strategy: str,
+    params: dict[str, int],
+    backend: str = "readinto",
+    drop_cache: bool = False,
+    extra_algorithms: tuple[str, ...] = (),
+) -> FingerprintMethod:
+    if strategy == "cdc":
+        # Chunk digests are sha256 only; a whole-file digest would need a second pass.
+        extra_algorithms = ()
+    if strategy == "head":
+        max_bytes: int | None = params["bytes"]
+    elif strategy == "sampled":
+        max_bytes = (params["samples"] + 2) * params["block_size"] + MAX_PARQUET_FOOTER_BYTES
+    else:
+        max_bytes = None
+    algorithm = CDC_ALGORITHM if strategy == "cdc" else "sha256"
+    key = f"{algorithm}-" + "-".join([strategy, *(f"{k}={v}" for k, v in sorted(params.items()))])
+    key += _algorithms_key(extra_algorithms)
+    compute = partial(
+        _dataset_fingerprint,
+        strategy=strategy,
+        params=params,
+        backend=backend,
+        drop_cache=drop_cache,
+        extra_algorithms=extra_algorithms,
+    )
+    return FingerprintMethod(
+        key, compute, max_bytes, uses_head=strategy not in ("sampled", "cdc"), uses_chunks=strategy == "cdc"
+    )
+
+
+def method_for(
+    fingerprint: dict[str, Any],
+    component_type: str | None = None,
+    backend: str = "readinto",
+    drop_cache: bool = False,
+    extra_algorithms: tuple[str, ...] = (),
+) -> FingerprintMethod:
+    """The method that reproduces ``fingerprint``, from the algorithm and strategy it records.
+
+    Dataset fingerprints written before strategies were recorded covered the
+    first 2 MiB only, so a dataset without a strategy is treated as ``head``.
+    ``extra_algorithms`` are those of the component's ``fingerprints``; they are
+    recomputed in the same read, and the method key matches the scan's cache key.
+    """
+    algorithm = fingerprint.get("algorithm")
+    if algorithm == MERKLE_ALGORITHM:
+        return merkle_method(int(fingerprint["chunk_size"]), keep_chunks=bool(fingerprint.get("chunks")))
+    if algorithm == CDC_ALGORITHM:
+        return dataset_method("cdc", dict(fingerprint.get("params") or {}), backend=backend, drop_cache=drop_cache)
+    if algorithm != "sha256":
+        raise ValueError(f"Unsupported fingerprint algorithm: {algorithm}")
+    strategy = fingerprint.get("strategy")
+    unsupported = set(extra_algorithms).difference(FINGERPRINT_ALGORITHMS)
+    if unsupported:
+        raise ValueError(f"Unsupported fingerprint algorithm: {min(unsupported)}")
+    if not strategy and component_type == "dataset":
+        strategy, fingerprint = "head", {"params": dataset_params("head")}
+    if strategy:
+        params = dict(fingerprint.get("params") or {})
+        return dataset_method(strategy, params, backend=backend, drop_cache=drop_cache, extra_algorithms=extra_algorithms)
+    return sha256_method(backend=backend, drop_cache=drop_cache, extra_algorithms=extra_algorithms)
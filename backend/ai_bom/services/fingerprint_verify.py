@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import time
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future
+from typing import Any, NamedTuple
+
+from ai_bom.services.cache import FingerprintCache
+from ai_bom.services.cas import lfs_object_path, read_lfs_pointer
+from ai_bom.services.fingerprint import CHUNK_INDEX_KEY, EXTRA_FINGERPRINTS_KEY, FingerprintMethod, method_for
+from ai_bom.services.hashing import HashExecutor
+
+
+def _digests(fingerprint: dict[str, Any], extras: Iterable[dict[str, Any]] | None) -> dict[str, str]:
+    digests = {fingerprint.get("algorithm", ""): fingerprint.get("hash", "")}
+    for extra in extras or ():
+        digests[extra.get("algorithm", "")] = extra.get("hash", "")
+    return digests
+
+
+class _Check(NamedTuple):
+    component: dict[str, Any]
+    path: pathlib.Path
+    # Path relative to the cache root, or None for files outside it.
+    rel: str | None
+    st: os.stat_result
+    method: FingerprintMethod
+    # The outcome was read from a git-lfs pointer rather than hashed or cached.
+    pointer: bool = False
+
+
+def verify_fingerprints(
+    components: Iterable[dict[str, Any]],
+    root: str | os.PathLike[str] = ".",
+    cache: FingerprintCache | None = None,
+    jobs: int | None = None,
+    fail_fast: bool = False,
+    backend: str = "readinto",
+    drop_cache: bool = False,
+) -> dict[str, Any]:
+    """Re-hash the file behind each component and compare it with the recorded fingerprint.
+
+    Files are found through ``origin.path``; relative paths resolve against
+    ``root``. Each component is re-hashed with the method its fingerprint
+    records (:func:`method_for`), including the digests in its
+    ``fingerprints``. Reads run on a :class:`HashExecutor`, so at most its byte
+    budget is in flight. A ``cache`` for ``root`` answers files whose stat is
+    unchanged since they were last hashed, and learns the new digests.
+
+    Digests taken from a content-addressed store are checked against what the
+    store holds now: a git-lfs pointer's ``oid``, or the local LFS object when it
+    has been fetched, and the blob an HF cache snapshot links to. Components
+    without an on-disk file (dependencies without a path, archive members) and
+    ``.dvc`` md5s, whose line-ending normalisation is not recorded, are counted
+    as skipped.
+    With ``fail_fast`` hashing stops at the first mismatch or missing file.
+    """
+    base = pathlib.Path(root).resolve()
+    report: dict[str, Any] = {
+        "checked": 0, "matched": 0, "cached": 0, "skipped": 0, "bytes": 0,
+        "mismatched": [], "missing": [], "stopped_early": False,
+    }  # fmt: skip
+    started = time.perf_counter()
+    pending: deque[tuple[_Check, Future[dict[str, Any]] | dict[str, Any]]] = deque()
+
+    def settle(check: _Check, outcome: Future[dict[str, Any]] | dict[str, Any]) -> bool:
+        # Compare one result with the BOM; False when a fail-fast run should stop.
+        component = check.component
+        if isinstance(outcome, Future):
+            try:
+                actual = dict(outcome.result())
+            except OSError as exc:
+                report["missing"].append({"name": component.get("name"), "path": str(check.path), "error": exc.strerror})
+                return not fail_fast
+            actual.pop(CHUNK_INDEX_KEY, None)
+            report["bytes"] += check.method.cost(check.st.st_size)
+            if cache is not None and check.rel is not None:
+                cache.put(check.rel, check.st, check.method.key, actual)
+        else:
+            actual = outcome
+            if not check.pointer:
+                report["cached"] += 1
+        report["checked"] += 1
+        expected = _digests(component["fingerprint"], component.get(EXTRA_FINGERPRINTS_KEY))
+        computed = _digests(actual, actual.get(EXTRA_FINGERPRINTS_KEY))
+        wrong = {a: h for a, h in expected.items() if computed.get(a) != h}
+        if not wrong:
+            report["matched"] += 1
+            return True
+        report["mismatched"].append(
+            {
+                "name": component.get("name"),
+                "path": str(check.path),
+                "algorithms": sorted(wrong),
+                "expected": wrong,
+                "actual": {a: computed.get(a) for a in wrong},
+            }
+        )
+        return not fail_fast
+
+    def drain(block: bool) -> bool:
+        while pending and (block or not isinstance(pending[0][1], Future) or pending[0][1].done()):
+            if not settle(*pending.popleft()):
+                return False
+        return True
+
+    executor = HashExecutor(jobs)
+    try:
+        for component in components:
+            fingerprint = component.get("fingerprint") or {}
+            origin = component.get("origin") or {}
+            metadata = component.get("metadata") or {}
+            if not fingerprint.get("hash") or not origin.get("path") or "archive_member" in metadata:
+                report["skipped"] += 1
+                continue
+            extras = tuple(f.get("algorithm", "") for f in component.get(EXTRA_FINGERPRINTS_KEY) or ())
+            try:
+                method = method_for(
+                    fingerprint, component.get("type"), backend=backend, drop_cache=drop_cache, extra_algorithms=extras
+                )
+            except (ValueError, KeyError):
+                report["skipped"] += 1
+                continue
+            path = base / origin["path"]
+            try:
+                st = path.stat()
+            except OSError as exc:
+                report["missing"].append({"name": component.get("name"), "path": str(path), "error": exc.strerror})
+                if fail_fast:
+                    report["stopped_early"] = True
+                    break
+                continue
+            pointer = read_lfs_pointer(str(path), st.st_size) if fingerprint.get("source") == "git-lfs" else None
+            if pointer is not None:
+                # A pointer checkout: hash the fetched LFS object, else compare the pointer's oid.
+                lfs_object = pathlib.Path(lfs_object_path(base, pointer[0]))
+                if pointer[0] == fingerprint["hash"] and lfs_object.is_file():
+                    path, st = lfs_object, lfs_object.stat()
+                else:
+                    pending.append((_Check(component, path, None, st, method, pointer=True), {"algorithm": "sha256", "hash": pointer[0]}))
+                    if not drain(block=False):
+                        report["stopped_early"] = True
+                        break
+                    continue
+            rel = path.relative_to(base).as_posix() if path.is_relative_to(base) else None
+            cached = cache.get(rel, st, method.key) if cache is not None and rel is not None else None
+            check = _Check(component, path, rel, st, method)
+            if cached is not None:
+                pending.append((check, cached))
+            else:
+                pending.append((check, executor.submit(method.run, path, cost=method.cost(st.st_size))))
+            if not drain(block=False):
+                report["stopped_early"] = True
+                break
+        else:
+            if not drain(block=True):
+                report["stopped_early"] = True
+    finally:
+        executor.shutdown(cancel=True)
+        if cache is not None:
+            cache.flush()
+    report["seconds"] = time.perf_counter() - started
+    return report
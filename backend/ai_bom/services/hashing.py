@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Self, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_MAX_INFLIGHT_BYTES = 512 * 1024 * 1024
+
+
+def default_jobs() -> int:
+    return min(32, os.cpu_count() or 1)
+
+
+class _ByteBudget:
+    """Blocking counter that caps the number of bytes being hashed at once."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.inflight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int) -> int:
+        # A single file larger than the whole budget is admitted alone.
+        n = min(n, self.limit)
+        with self._cond:
+            while self.inflight and self.inflight + n > self.limit:
+                self._cond.wait()
+            self.inflight += n
+        return n
+
+    def release(self, n: int) -> None:
+        with self._cond:
+            self.inflight -= n
+            self._cond.notify_all()
+
+
+class HashExecutor:
+    """Thread pool for fingerprinting with bounded I/O concurrency.
+
+    hashlib releases the GIL on large updates, so threads give real parallelism.
+    ``submit`` blocks while more than ``max_inflight_bytes`` are being read, which
+    keeps memory and outstanding I/O bounded. With ``jobs=1`` work runs inline.
+    """
+
+    def __init__(self, jobs: int | None = None, max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES) -> None:
+        self.jobs = jobs or default_jobs()
+        self._budget = _ByteBudget(max_inflight_bytes)
+        self._pool = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="ai-bom-hash") if self.jobs > 1 else None
+
+    def submit(self, fn: Callable[..., T], *args: object, cost: int = 0) -> Future[T]:
+        if self._pool is None:
+            future: Future[T] = Future()
+            try:
+                future.set_result(fn(*args))
+            except BaseException as exc:  # noqa: BLE001 - surfaced via future.result()
+                future.set_exception(exc)
+            return future
+        reserved = self._budget.acquire(cost)
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(lambda _: self._budget.release(reserved))
+        return future
+
+    def shutdown(self, cancel: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=cancel)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        self.shutdown(cancel=exc_type is not None)
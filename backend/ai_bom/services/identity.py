@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from ai_bom.core.utils import aggregate_bom_hash, get_git_info
+from ai_bom.services.component_table import ComponentTable
+
+
+# uuid5 namespace for every deterministic identifier ai-bom derives.
+AI_BOM_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "ai-bom")
+PROJECT_FILENAME = "project.json"
+# ``created_by`` of deterministic BOMs, which must not depend on who ran the scan.
+DETERMINISTIC_CREATED_BY = "ai-bom"
+
+
+def _project_file(dir: str | os.PathLike[str]) -> pathlib.Path:
+    return pathlib.Path(dir) / ".ai-bom" / PROJECT_FILENAME
+
+
+def ensure_project_config(dir: str | os.PathLike[str]) -> str:
+    """Create ``.ai-bom/project.json`` with a fresh project id unless it exists; return the id."""
+    path = _project_file(dir)
+    existing = read_project_id(dir)
+    if existing is not None:
+        return existing
+    project_id = str(uuid.uuid4())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"project_id": project_id}, indent=2) + "\n", encoding="utf-8")
+    return project_id
+
+
+def read_project_id(dir: str | os.PathLike[str]) -> str | None:
+    try:
+        data = json.loads(_project_file(dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    project_id = data.get("project_id") if isinstance(data, dict) else None
+    return str(project_id) if project_id else None
+
+
+def stable_project_id(dir: str | os.PathLike[str]) -> str:
+    """The id in ``.ai-bom/project.json``, else one derived from the git remote or directory name."""
+    project_id = read_project_id(dir)
+    if project_id is not None:
+        return project_id
+    repo = get_git_info(dir).get("repo") or pathlib.Path(dir).resolve().name
+    return str(uuid.uuid5(AI_BOM_NAMESPACE, f"project:{repo}"))
+
+
+def stable_created_at() -> str:
+    """``SOURCE_DATE_EPOCH`` (the reproducible-builds convention) as ISO 8601, or the Unix epoch."""
+    epoch = int(os.environ.get("SOURCE_DATE_EPOCH", "0"))
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def component_id(component: dict[str, Any]) -> str:
+    """uuid5 over the component's name (its repo-relative path) and primary fingerprint."""
+    fingerprint = component.get("fingerprint") or {}
+    key = f"component:{component['name']}\0{fingerprint.get('algorithm', '')}:{fingerprint.get('hash', '')}"
+    return str(uuid.uuid5(AI_BOM_NAMESPACE, key))
+
+
+def finalize_deterministic(bom: dict[str, Any]) -> dict[str, Any]:
+    """Sort components and derive ``bom_id`` from the content, so equal scans serialize identically."""
+    components = bom.get("components", [])
+    if isinstance(components, ComponentTable):
+        components.sort_by_name()
+    else:
+        bom["components"] = sorted(components, key=lambda c: (c["name"], c["component_id"]))
+    bom["bom_id"] = ""
+    bom["bom_id"] = str(uuid.uuid5(AI_BOM_NAMESPACE, f"bom:{aggregate_bom_hash(bom)}"))
+    return bom
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+# Values longer than this are truncated; metadata is for reviewers, not round-tripping.
+MAX_VALUE_CHARS = 256
+MAX_SAFETENSORS_HEADER = 100 * 1024 * 1024
+# GGUF string arrays (tokenizer vocabularies) must be walked element by element;
+# parsing stops at one longer than this instead of paying for the walk.
+MAX_GGUF_ARRAY_WALK = 1024
+# Parquet row group lists have no length prefix; only skip past small ones.
+MAX_PARQUET_COLUMN_CHUNKS = 4096
+
+
+@contextmanager
+def _mapped(path: str | os.PathLike[str]) -> Iterator[mmap.mmap | bytes]:
+    """Read-only mapping of ``path``; only the pages an extractor touches are read."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _short(value: Any) -> Any:
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="replace")
+    if isinstance(value, str) and len(value) > MAX_VALUE_CHARS:
+        return value[:MAX_VALUE_CHARS] + "..."
+    return value
+
+
+# safetensors: u64 little-endian header length, then a JSON object of tensors.
+
+
+def safetensors_metadata(path: str | os.PathLike[str], head: bytes | None = None) -> dict[str, Any]:
+    with _mapped(path) as data:
+        buf = head if head is not None and len(head) >= 8 else data
+        (length,) = struct.unpack_from("<Q", buf, 0)
+        if length > MAX_SAFETENSORS_HEADER or 8 + length > len(data):
+            raise ValueError("safetensors header length out of range")
+        raw = head[8 : 8 + length] if head is not None and len(head) >= 8 + length else data[8 : 8 + length]
+    header = json.loads(raw)
+    user = header.pop("__metadata__", None) or {}
+    dtypes: dict[str, int] = {}
+    parameters = 0
+    for tensor in header.values():
+        dtypes[tensor["dtype"]] = dtypes.get(tensor["dtype"], 0) + 1
+        count = 1
+        for dim in tensor["shape"]:
+            count *= dim
+        parameters += count
+    return {
+        "tensor_count": len(header),
+        "parameter_count": parameters,
+        "dtypes": dtypes,
+        "header_bytes": length,
+        "user_metadata": {k: _short(v) for k, v in user.items()},
+    }
+
+
+# GGUF: magic, version, tensor count, KV count, then typed key/value pairs.
+
+_GGUF_SCALARS = {
+    0: "<B",
+    1: "<b",
+    2: "<H",
+    3: "<h",
+    4: "<I",
+    5: "<i",
+    6: "<f",
+    7: "<?",
+    10: "<Q",
+    11: "<q",
+    12: "<d",
+}
+_GGUF_STRING = 8
+_GGUF_ARRAY = 9
+_GGUF_TYPE_NAMES = {
+    0: "uint8",
+    1: "int8",
+    2: "uint16",
+    3: "int16",
+    4: "uint32",
+    5: "int32",
+    6: "float32",
+    7: "bool",
+    8: "string",
+    9: "array",
+    10: "uint64",
+    11: "int64",
+    12: "float64",
+}
+
+
+class _GGUFStop(Exception):
+    pass
+
+
+def _gguf_string(data: Any, pos: int) -> tuple[bytes, int]:
+    (length,) = struct.unpack_from("<Q", data, pos)
+    pos += 8
+    return data[pos : pos + length], pos + length
+
+
+def _gguf_value(data: Any, pos: int, kind: int) -> tuple[Any, int]:
+    if kind in _GGUF_SCALARS:
+        fmt = _GGUF_SCALARS[kind]
+        return struct.unpack_from(fmt, data, pos)[0], pos + struct.calcsize(fmt)
+    if kind == _GGUF_STRING:
+        value, pos = _gguf_string(data, pos)
+        return _short(value), pos
+    if kind == _GGUF_ARRAY:
+        item_kind, count = struct.unpack_from("<IQ", data, pos)
+        pos += 12
+        summary = {"type": _GGUF_TYPE_NAMES.get(item_kind, str(item_kind)), "length": count}
+        if item_kind in _GGUF_SCALARS:
+            return summary, pos + count * struct.calcsize(_GGUF_SCALARS[item_kind])
+        if count > MAX_GGUF_ARRAY_WALK:
+            raise _GGUFStop(summary)
+        for _ in range(count):
+            _, pos = _gguf_value(data, pos, item_kind)
+        return summary, pos
+    raise ValueError(f"unknown GGUF value type {kind}")
+
+
+def gguf_metadata(path: str | os.PathLike[str], head: bytes | None = None) -> dict[str, Any]:
+    with _mapped(path) as data:
+        magic, version = struct.unpack_from("<4sI", data, 0)
+        if magic != b"GGUF":
+            raise ValueError("not a GGUF file")
+        if version < 2:
+            raise ValueError("GGUF v1 uses 32-bit counts and is not supported")
+        tensor_count, kv_count = struct.unpack_from("<QQ", data, 8)
+        pos = 24
+        kv: dict[str, Any] = {}
+        truncated = False
+        for _ in range(kv_count):
+            key, pos = _gguf_string(data, pos)
+            (kind,) = struct.unpack_from("<I", data, pos)
+            try:
+                value, pos = _gguf_value(data, pos + 4, kind)
+            except _GGUFStop as stop:
+                kv[key.decode("utf-8", errors="replace")] = stop.args[0]
+                truncated = True
+                break
+            kv[key.decode("utf-8", errors="replace")] = value
+    result: dict[str, Any] = {"version": version, "tensor_count": tensor_count, "kv_count": kv_count, "kv": kv}
+    if truncated:
+        result["kv_truncated"] = True
+    return result
+
+
+# ONNX: a protobuf ModelProto; only the graph's inputs and outputs are decoded,
+# everything else (nodes, initializers) is skipped by its length prefix.
+
+_ONNX_ELEM_TYPES = {
+    1: "float",
+    2: "uint8",
+    3: "int8",
+    4: "uint16",
+    5: "int16",
+    6: "int32",
+    7: "int64",
+    8: "string",
+    9: "bool",
+    10: "float16",
+    11: "double",
+    12: "uint32",
+    13: "uint64",
+    14: "complex64",
+    15: "complex128",
+    16: "bfloat16",
+}
+
+
+def _pb_varint(data: Any, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _pb_fields(data: Any, start: int, end: int) -> Iterator[tuple[int, int, Any]]:
+    """Yield ``(field, wire_type, value)``; length-delimited values are ``(offset, end)`` ranges."""
+    pos = start
+    while pos < end:
+        tag, pos = _pb_varint(data, pos)
+        field, wire = tag >> 3, tag & 7
+        if wire == 0:
+            value, pos = _pb_varint(data, pos)
+        elif wire == 1:
+            value, pos = pos, pos + 8
+        elif wire == 2:
+            length, pos = _pb_varint(data, pos)
+            value, pos = (pos, pos + length), pos + length
+        elif wire == 5:
+            value, pos = pos, pos + 4
+        else:
+            raise ValueError(f"unsupported protobuf wire type {wire}")
+        yield field, wire, value
+
+
+def _pb_str(data: Any, span: tuple[int, int]) -> str:
+    return bytes(data[span[0] : span[1]]).decode("utf-8", errors="replace")
+
+
+def _onnx_value_info(data: Any, span: tuple[int, int]) -> dict[str, Any]:
+    info: dict[str, Any] = {"name": "", "elem_type": None, "shape": None}
+    for field, wire, value in _pb_fields(data, *span):
+        if field == 1 and wire == 2:
+            info["name"] = _pb_str(data, value)
+        elif field == 2 and wire == 2:
+            for t_field, t_wire, tensor in _pb_fields(data, *value):
+                if t_field != 1 or t_wire != 2:
+                    continue
+                for f, w, v in _pb_fields(data, *tensor):
+                    if f == 1 and w == 0:
+                        info["elem_type"] = _ONNX_ELEM_TYPES.get(v, str(v))
+                    elif f == 2 and w == 2:
+                        dims: list[int | str | None] = []
+                        for _, _, dim in _pb_fields(data, *v):
+                            entry: int | str | None = None
+                            for d_field, d_wire, d_value in _pb_fields(data, *dim):
+                                if d_field == 1 and d_wire == 0:
+                                    entry = d_value
+                                elif d_field == 2 and d_wire == 2:
+                                    entry = _pb_str(data, d_value)
+                            dims.append(entry)
+                        info["shape"] = dims
+    return info
+
+
+def onnx_metadata(path: str | os.PathLike[str], head: bytes | None = None) -> dict[str, Any]:
+    result: dict[str, Any] = {"inputs": [], "outputs": [], "opset": {}}
+    with _mapped(path) as data:
+        for field, wire, value in _pb_fields(data, 0, len(data)):
+            if field == 1 and wire == 0:
+                result["ir_version"] = value
+            elif field == 2 and wire == 2:
+                result["producer_name"] = _short(_pb_str(data, value))
+            elif field == 3 and wire == 2:
+                result["producer_version"] = _short(_pb_str(data, value))
+            elif field == 8 and wire == 2:
+                domain, version = "", None
+                for f, w, v in _pb_fields(data, *value):
+                    if f == 1 and w == 2:
+                        domain = _pb_str(data, v)
+                    elif f == 2 and w == 0:
+                        version = v
+                result["opset"][domain or "ai.onnx"] = version
+            elif field == 7 and wire == 2:
+                nodes = initializers = 0
+                for g_field, g_wire, g_value in _pb_fields(data, *value):
+                    if g_field == 1:
+                        nodes += 1
+                    elif g_field == 2 and g_wire == 2:
+                        result["graph_name"] = _short(_pb_str(data, g_value))
+                    elif g_field == 5:
+                        initializers += 1
+                    elif g_field == 11 and g_wire == 2:
+                        result["inputs"].append(_onnx_value_info(data, g_value))
+                    elif g_field == 12 and g_wire == 2:
+                        result["outputs"].append(_onnx_value_info(data, g_value))
+                result["node_count"] = nodes
+                result["initializer_count"] = initializers
+    return result
+
+
+# Parquet: FileMetaData in the Thrift compact protocol, at the end of the file
+# before a 4-byte length and the ``PAR1`` magic.
+
+_PARQUET_TYPES = {
+    0: "BOOLEAN",
+    1: "INT32",
+    2: "INT64",
+    3: "INT96",
+    4: "FLOAT",
+    5: "DOUBLE",
+    6: "BYTE_ARRAY",
+    7: "FIXED_LEN_BYTE_ARRAY",
+}
+_PARQUET_REPETITION = {0: "REQUIRED", 1: "OPTIONAL", 2: "REPEATED"}
+
+
+class _Thrift:
+    """Just enough of the Thrift compact protocol to read Parquet footers."""
+
+    def __init__(self, data: Any, pos: int) -> None:
+        self.data = data
+        self.pos = pos
+
+    def byte(self) -> int:
+        b = self.data[self.pos]
+        self.pos += 1
+        return b
+
+    def varint(self) -> int:
+        value, self.pos = _pb_varint(self.data, self.pos)
+        return value
+
+    def zigzag(self) -> int:
+        n = self.varint()
+        return (n >> 1) ^ -(n & 1)
+
+    def binary(self) -> bytes:
+        length = self.varint()
+        value = bytes(self.data[self.pos : self.pos + length])
+        self.pos += length
+        return value
+
+    def fields(self) -> Iterator[tuple[int, int]]:
+        """Yield ``(field_id, type)`` for each field of a struct; the caller reads or skips the value."""
+        last = 0
+        while True:
+            header = self.byte()
+            kind = header & 0x0F
+            if kind == 0:
+                return
+            delta = header >> 4
+            last = last + delta if delta else self.zigzag()
+            yield last, kind
+
+    def list_header(self) -> tuple[int, int]:
+        header = self.byte()
+        size = header >> 4
+        if size == 15:
+            size = self.varint()
+        return size, header & 0x0F
+
+    def read(self, kind: int) -> Any:
+        if kind in (1, 2):
+            return kind == 1
+        if kind == 3:
+            return self.byte()
+        if kind in (4, 5, 6):
+            return self.zigzag()
+        if kind == 7:
+            value = struct.unpack_from("<d", self.data, self.pos)[0]
+            self.pos += 8
+            return value
+        if kind == 8:
+            return self.binary()
+        if kind in (9, 10):
+            size, item = self.list_header()
+            return [self.read_item(item) for _ in range(size)]
+        if kind == 11:
+            size = self.varint()
+            types = self.byte() if size else 0
+            return {self.read_item(types >> 4): self.read_item(types & 0x0F) for _ in range(size)}
+        if kind == 12:
+            return {fid: self.read(k) for fid, k in self.fields()}
+        raise ValueError(f"unknown thrift type {kind}")
+
+    def read_item(self, kind: int) -> Any:
+        # Booleans inside containers are a whole byte.
+        return self.byte() == 1 if kind in (1, 2) else self.read(kind)
+
+
+def parquet_metadata(path: str | os.PathLike[str], head: bytes | None = None) -> dict[str, Any]:
+    with _mapped(path) as data:
+        size = len(data)
+        if size < 12 or data[size - 4 :] != b"PAR1":
+            raise ValueError("missing Parquet footer")
+        (length,) = struct.unpack_from("<I", data, size - 8)
+        start = size - 8 - length
+        if start < 4:
+            raise ValueError("Parquet footer length out of range")
+        reader = _Thrift(data, start)
+        result: dict[str, Any] = {"footer_bytes": length}
+        leaves = 0
+        for fid, kind in reader.fields():
+            if fid == 1 and kind == 5:
+                result["version"] = reader.read(kind)
+            elif fid == 2 and kind == 9:
+                columns = []
+                for element in reader.read(kind)[1:]:
+                    if element.get(5):  # num_children: a group, not a column
+                        continue
+                    columns.append(
+                        {
+                            "name": _short(element.get(4, b"")),
+                            "type": _PARQUET_TYPES.get(element.get(1), None),
+                            "repetition": _PARQUET_REPETITION.get(element.get(3), None),
+                        }
+                    )
+                leaves = len(columns)
+                result["columns"] = columns
+            elif fid == 3 and kind == 6:
+                result["num_rows"] = reader.read(kind)
+            elif fid == 4 and kind == 9:
+                count, item = reader.list_header()
+                result["num_row_groups"] = count
+                if count * max(leaves, 1) > MAX_PARQUET_COLUMN_CHUNKS:
+                    # Later fields (key/value metadata, created_by) are not worth the walk.
+                    break
+                for _ in range(count):
+                    reader.read_item(item)
+            elif fid == 5 and kind == 9:
+                pairs = reader.read(kind)
+                result["key_value_metadata"] = {
+                    _short(p.get(1, b"")): (_short(p[2]) if p.get(1) != b"ARROW:schema" and 2 in p else None)
+                    for p in pairs
+                }
+            elif fid == 6 and kind == 8:
+                result["created_by"] = _short(reader.read(kind))
+            else:
+                reader.read(kind)
+    return result
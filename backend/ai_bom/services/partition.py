@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import socket
+import time
+from typing import Any, NamedTuple
+
+from ai_bom.services.component_table import ComponentTable
+from ai_bom.services.identity import finalize_deterministic
+from ai_bom.services.remote_cache import get_remote_cache
+from ai_bom.services.scanner import ScanOptions, dependency_files, iter_components, walk_candidates
+
+
+DEFAULT_PARTITION_FILES = 10_000
+DEFAULT_PARTITION_BYTES = 8 * 1024**3
+
+
+class Partition(NamedTuple):
+    index: int
+    paths: list[str]
+    bytes: int
+
+
+def partition_scan(
+    dir: str | os.PathLike[str],
+    options: ScanOptions | None = None,
+    max_files: int = DEFAULT_PARTITION_FILES,
+    max_bytes: int = DEFAULT_PARTITION_BYTES,
+) -> list[Partition]:
+    """Split a scan of ``dir`` into contiguous runs of the walk order.
+
+    A partition closes once it holds ``max_files`` files or ``max_bytes`` of
+    content, so a single large file ends up alone and large trees spread evenly
+    over the workers. Dependency manifests go into the first partition.
+    Concatenating the partitions in index order gives the single-worker walk order.
+    """
+    options = options or ScanOptions()
+    partitions: list[Partition] = []
+    paths: list[str] = dependency_files(dir)
+    size = 0
+    for entry in walk_candidates(dir, options):
+        if paths and (len(paths) >= max_files or size + entry.stat.st_size > max_bytes):
+            partitions.append(Partition(len(partitions), paths, size))
+            paths, size = [], 0
+        paths.append(entry.rel)
+        size += entry.stat.st_size
+    if paths or not partitions:
+        partitions.append(Partition(len(partitions), paths, size))
+    return partitions
+
+
+def scan_partition(
+    dir: str,
+    paths: list[str],
+    index: int,
+    options: ScanOptions | None = None,
+    git: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Fingerprint one partition; returns its components with timing for the merge step."""
+    start = time.perf_counter()
+    components = ComponentTable(
+        iter_components(dir, options=options, git=git, paths=paths, remote_cache=get_remote_cache())
+    )
+    return {
+        "index": index,
+        "components": components,
+        "timing": {
+            "partition": index,
+            "files": len(paths),
+            "components": len(components),
+            "seconds": round(time.perf_counter() - start, 3),
+            "worker": socket.gethostname(),
+        },
+    }
+
+
+def merge_partitions(
+    header: dict[str, Any], partials: list[dict[str, Any]], deterministic: bool = False
+) -> dict[str, Any]:
+    """One BOM from partition results, ordered by partition index whatever order they finished in.
+
+    Deterministic BOMs leave out the per-partition timings, which vary run to run.
+    """
+    ordered = sorted(partials, key=lambda partial: partial["index"])
+    bom = dict(header)
+    bom["components"] = [component for partial in ordered for component in partial["components"]]
+    if deterministic:
+        return finalize_deterministic(bom)
+    bom["scan_stats"] = {"partitions": [partial["timing"] for partial in ordered]}
+    return bom
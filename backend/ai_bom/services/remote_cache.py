@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Protocol
+
+import structlog
+
+from ai_bom.core.config import get_settings
+from ai_bom.core.utils import MERKLE_ALGORITHM
+from ai_bom.services.fingerprint import FingerprintMethod, sampled_sha256
+
+
+# Bump when the entry layout or the content key changes; older entries are ignored.
+REMOTE_CACHE_VERSION = 1
+# Method keys (before any "+algorithm" suffix) whose fingerprint is a function of
+# the file's bytes alone; sha256-merkle keys are matched by prefix. Chunked and
+# archive methods also depend on local chunk indexes and limits, so are not shared.
+SHARED_METHOD_KEYS = frozenset({"sha256", "sha256-full"})
+# Fingerprint "source" of a remote hit; like CAS digests, "verified" marks the re-hashed ones.
+REMOTE_CACHE_SOURCE = "remote-cache"
+
+
+class RemoteStore(Protocol):
+    name: str
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def put(self, key: str, data: bytes) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class LocalRemoteStore:
+    """Entries as files under ``root``, for tests and runners sharing a volume."""
+
+    name = "local"
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Cache key escapes the store: {key}")
+        return path
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class S3RemoteStore:
+    """Entries in the configured S3/MinIO bucket (see :mod:`ai_bom.services.storage`)."""
+
+    name = "s3"
+
+    def get(self, key: str) -> bytes | None:  # pragma: no cover - external
+        from ai_bom.services.storage import get_object
+
+        return get_object(key)
+
+    def put(self, key: str, data: bytes) -> None:  # pragma: no cover - external
+        from ai_bom.services.storage import put_object
+
+        put_object(key, data, content_type="application/json")
+
+    def delete(self, key: str) -> None:  # pragma: no cover - external
+        from ai_bom.services.storage import delete_object
+
+        delete_object(key)
+
+
+class RemoteFingerprintCache:
+    """Fingerprints shared between machines, keyed by what a file looks like rather than its inode.
+
+    The content key is the sha256 of the repo-relative path, the size and a
+    sampled-block digest (a few MiB read at most), so a cold runner can find the
+    digest of a checkpoint another runner already hashed in full. Only whole-file
+    digest methods (``SHARED_METHOD_KEYS`` and sha256-merkle) are shared, and only
+    for files of at least ``min_bytes``. Entries older than ``ttl_seconds`` count as misses and are
+    deleted; ``verify_fraction`` of hits are re-hashed anyway, and an entry that
+    does not match is replaced.
+
+    The content key does not cover every byte: a same-size edit outside the
+    sampled blocks finds the old entry and its stale digest. Hits are therefore
+    tagged ``"source": "remote-cache"`` (plus ``"verified": true`` when re-hashed),
+    so a BOM shows which digests were not computed from the file itself.
+    """
+
+    def __init__(
+        self,
+        store: RemoteStore,
+        prefix: str = "fingerprint-cache",
+        ttl_seconds: int = 30 * 24 * 3600,
+        verify_fraction: float = 0.05,
+        min_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.store = store
+        self.prefix = prefix.strip("/")
+        self.ttl_seconds = ttl_seconds
+        self.verify_fraction = verify_fraction
+        self.min_bytes = min_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.verified = 0
+        self.mismatches = 0
+
+    def accepts(self, method: FingerprintMethod, size: int) -> bool:
+        base = method.key.split("+", 1)[0]
+        shared = base in SHARED_METHOD_KEYS or base.startswith(f"{MERKLE_ALGORITHM}-")
+        return shared and size >= self.min_bytes
+
+    def content_key(self, path: str | os.PathLike[str], rel: str, size: int) -> str:
+        hasher = hashlib.sha256(f"v{REMOTE_CACHE_VERSION}\0{rel}\0{size}\0".encode())
+        hasher.update(sampled_sha256(path).encode())
+        return hasher.hexdigest()
+
+    def _key(self, method: FingerprintMethod, content_key: str) -> str:
+        return f"{self.prefix}/{method.key}/{content_key[:2]}/{content_key}.json"
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        try:
+            data = self.store.get(key)
+        except Exception as exc:
+            # An unreachable cache only costs the hash it would have saved.
+            structlog.get_logger().warning("remote_cache_get_failed", key=key, error=str(exc))
+            return None
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data)
+            stored_at = float(entry["stored_at"])
+            fingerprint = entry["fingerprint"]
+        except (ValueError, KeyError, TypeError):
+            return None
+        if time.time() - stored_at > self.ttl_seconds:
+            self.delete(key)
+            return None
+        return fingerprint
+
+    def put(self, key: str, fingerprint: dict[str, Any], rel: str, size: int) -> None:
+        entry = {"fingerprint": fingerprint, "path": rel, "size": size, "stored_at": time.time()}
+        try:
+            self.store.put(key, json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+        except Exception as exc:
+            structlog.get_logger().warning("remote_cache_put_failed", key=key, error=str(exc))
+
+    def delete(self, key: str) -> None:
+        try:
+            self.store.delete(key)
+        except Exception as exc:
+            structlog.get_logger().warning("remote_cache_delete_failed", key=key, error=str(exc))
+
+    def fingerprint(
+        self, method: FingerprintMethod, path: Path, rel: str, size: int, head: bytes | None = None
+    ) -> dict[str, Any]:
+        """``method.run(path, head)``, answered from the remote cache when a trusted entry exists.
+
+        Runs on a hash executor thread: the content key read, the lookup and
+        the upload all happen off the scanning thread.
+        """
+        key = self._key(method, self.content_key(path, rel, size))
+        cached = self.get(key)
+        if cached is not None and random.random() >= self.verify_fraction:
+            self._count(hits=1)
+            return {**cached, "source": REMOTE_CACHE_SOURCE}
+        fingerprint = method.run(path, head)
+        if cached is None:
+            self._count(misses=1)
+        else:
+            self._count(hits=1, verified=1)
+            if cached.get("hash") == fingerprint.get("hash"):
+                return {**fingerprint, "source": REMOTE_CACHE_SOURCE, "verified": True}
+            self._count(mismatches=1)
+            structlog.get_logger().warning("remote_cache_mismatch", key=key, path=rel)
+        self.put(key, {k: v for k, v in fingerprint.items() if not k.startswith("_")}, rel, size)
+        return fingerprint
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "verified": self.verified, "mismatches": self.mismatches}
+
+
+def get_remote_cache(enabled: bool | None = None) -> RemoteFingerprintCache | None:
+    """The remote cache configured in settings, or None when it is disabled.
+
+    ``enabled`` overrides ``remote_cache_enabled`` (the CLI's ``--remote-cache``).
+    """
+    settings = get_settings()
+    if not (settings.remote_cache_enabled if enabled is None else enabled):
+        return None
+    store: RemoteStore
+    if settings.remote_cache_backend == "local":
+        store = LocalRemoteStore(settings.remote_cache_dir)
+    else:
+        store = S3RemoteStore()
+    return RemoteFingerprintCache(
+        store,
+        prefix=settings.remote_cache_prefix,
+        ttl_seconds=settings.remote_cache_ttl_seconds,
+        verify_fraction=settings.remote_cache_verify_fraction,
+        min_bytes=settings.remote_cache_min_bytes,
+    )
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import zlib
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Protocol
+
+from ai_bom.core.config import get_settings
+from ai_bom.services.component_table import iter_json
+
+
+RESULT_REF_KIND = "ai-bom-result-ref"
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ResultStore(Protocol):
+    name: str
+
+    def put(self, key: str, data: bytes) -> None: ...
+
+    def iter_chunks(self, key: str) -> Iterator[bytes]: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class LocalResultStore:
+    """Payloads as files under ``root``; must be shared by the API and the workers."""
+
+    name = "local"
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Result key escapes the store: {key}")
+        return path
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def iter_chunks(self, key: str) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class S3ResultStore:
+    """Payloads in the configured S3/MinIO bucket (see :mod:`ai_bom.services.storage`)."""
+
+    name = "s3"
+
+    def put(self, key: str, data: bytes) -> None:  # pragma: no cover - external
+        from ai_bom.services.storage import put_object
+
+        put_object(key, data, content_type="application/json", content_encoding="gzip")
+
+    def iter_chunks(self, key: str) -> Iterator[bytes]:  # pragma: no cover - external
+        from ai_bom.services.storage import iter_object
+
+        return iter_object(key, _CHUNK_SIZE)
+
+    def delete(self, key: str) -> None:  # pragma: no cover - external
+        from ai_bom.services.storage import delete_object
+
+        delete_object(key)
+
+
+@lru_cache(maxsize=1)
+def get_result_store() -> ResultStore:
+    settings = get_settings()
+    if settings.result_store == "local":
+        return LocalResultStore(settings.result_store_dir)
+    return S3ResultStore()
+
+
+def is_result_ref(value: Any) -> bool:
+    return isinstance(value, dict) and value.get("kind") == RESULT_REF_KIND
+
+
+def store_result(payload: Any, prefix: str, store: ResultStore | None = None) -> dict[str, Any]:
+    """Write ``payload`` as gzipped JSON and return a small reference to it.
+
+    The key is derived from the sha256 of the uncompressed JSON, which the
+    reference records along with both sizes. A :class:`ComponentTable` in the
+    payload is encoded and compressed a component at a time.
+    """
+    store = store or get_result_store()
+    hasher = hashlib.sha256()
+    size = 0
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6, mtime=0) as gz:
+        for piece in iter_json(payload, separators=(",", ":")):
+            data = piece.encode("utf-8")
+            hasher.update(data)
+            size += len(data)
+            gz.write(data)
+    compressed = buffer.getvalue()
+    digest = hasher.hexdigest()
+    key = f"{prefix}/{digest}.json.gz"
+    store.put(key, compressed)
+    return {
+        "kind": RESULT_REF_KIND,
+        "store": store.name,
+        "key": key,
+        "digest": f"sha256:{digest}",
+        "size": size,
+        "stored_size": len(compressed),
+        "encoding": "gzip",
+        "content_type": "application/json",
+    }
+
+
+def iter_result(ref: dict[str, Any], decompress: bool = True, store: ResultStore | None = None) -> Iterator[bytes]:
+    """Stream a stored payload, gzip-compressed as stored or decompressed on the fly."""
+    store = store or get_result_store()
+    chunks = store.iter_chunks(ref["key"])
+    if not decompress:
+        yield from chunks
+        return
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+def load_result(ref: dict[str, Any], store: ResultStore | None = None) -> Any:
+    data = b"".join(iter_result(ref, store=store))
+    if f"sha256:{hashlib.sha256(data).hexdigest()}" != ref["digest"]:
+        raise ValueError(f"Stored result {ref['key']} does not match its digest")
+    return json.loads(data)
+
+
+def delete_result(ref: dict[str, Any], store: ResultStore | None = None) -> None:
+    (store or get_result_store()).delete(ref["key"])
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Protocol
+
+from ai_bom.core.config import get_settings
+from ai_bom.services.component_table import ComponentTable
+from ai_bom.services.identity import finalize_deterministic
+from ai_bom.services.remote_cache import get_remote_cache
+from ai_bom.services.results import is_result_ref
+from ai_bom.services.scanner import ScanOptions, ScanProgress, bom_header, iter_components
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = frozenset({JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED})
+
+
+class ScanCancelled(Exception):
+    pass
+
+
+def run_scan(
+    dir: str,
+    options: ScanOptions,
+    progress: ScanProgress,
+    cancelled: Callable[[], bool] = lambda: False,
+    on_component: Callable[[], None] | None = None,
+    compact: bool = False,
+) -> dict[str, Any]:
+    """Build a BOM for ``dir`` like :func:`scan_repository`, checking ``cancelled`` between components.
+
+    Stopping early closes the component generator, which cancels queued hashes.
+    With ``compact``, components are collected into a :class:`ComponentTable`.
+    """
+    bom = bom_header(dir, options.deterministic)
+    components: list[dict[str, Any]] | ComponentTable = ComponentTable() if compact else []
+    components_iter = iter_components(dir, options=options, progress=progress, remote_cache=get_remote_cache())
+    try:
+        for component in components_iter:
+            components.append(component)
+            if cancelled():
+                raise ScanCancelled(dir)
+            if on_component is not None:
+                on_component()
+    finally:
+        components_iter.close()
+    bom["components"] = components
+    return finalize_deterministic(bom) if options.deterministic else bom
+
+
+class ScanJobs(Protocol):
+    def submit(self, dir: str, options: ScanOptions) -> str: ...
+
+    def get(self, job_id: str, include_result: bool = True) -> dict[str, Any] | None: ...
+
+    def cancel(self, job_id: str) -> bool: ...
+
+
+class _ThreadJob:
+    def __init__(self, dir: str, options: ScanOptions) -> None:
+        self.id = str(uuid.uuid4())
+        self.dir = dir
+        self.options = options
+        self.status = JOB_PENDING
+        self.progress = ScanProgress()
+        self.result: dict[str, Any] | None = None
+        self.error: str | None = None
+        self.finished_at: float | None = None
+        self.cancel_event = threading.Event()
+
+    def to_dict(self, include_result: bool) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "dir": self.dir,
+            "progress": self.progress.snapshot() if self.status != JOB_PENDING else ScanProgress().snapshot(),
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class ThreadScanJobs:
+    """Runs scans on a local thread pool; jobs live in memory in the API process.
+
+    Finished jobs, with their BOMs, are dropped ``ttl_seconds`` after they end,
+    and at most ``keep`` are remembered, oldest dropped first.
+    """
+
+    def __init__(self, max_workers: int = 2, keep: int = 100, ttl_seconds: float = 3600) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-bom-scan")
+        self._jobs: OrderedDict[str, _ThreadJob] = OrderedDict()
+        self._lock = threading.Lock()
+        self.keep = keep
+        self.ttl_seconds = ttl_seconds
+
+    def submit(self, dir: str, options: ScanOptions) -> str:
+        job = _ThreadJob(dir, options)
+        self._prune()
+        with self._lock:
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job.id
+
+    def _run(self, job: _ThreadJob) -> None:
+        if job.cancel_event.is_set():
+            return
+        job.progress = ScanProgress()
+        job.status = JOB_RUNNING
+        try:
+            job.result = run_scan(job.dir, job.options, job.progress, job.cancel_event.is_set)
+            job.status = JOB_SUCCEEDED
+        except ScanCancelled:
+            job.status = JOB_CANCELLED
+        except Exception as exc:
+            job.error = str(exc)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = time.time()
+            self._prune()
+
+    def _prune(self) -> None:
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+            expired_before = time.time() - self.ttl_seconds
+            for index, job_id in enumerate(finished):
+                if index < len(finished) - self.keep or (self._jobs[job_id].finished_at or 0) < expired_before:
+                    del self._jobs[job_id]
+
+    def get(self, job_id: str, include_result: bool = True) -> dict[str, Any] | None:
+        self._prune()
+        job = self._jobs.get(job_id)
+        return job.to_dict(include_result) if job is not None else None
+
+    def cancel(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel_event.set()
+        if job.status == JOB_PENDING:
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+        return True
+
+    def shutdown(self) -> None:
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_CELERY_STATES = {
+    "PENDING": JOB_PENDING,
+    "RECEIVED": JOB_PENDING,
+    "STARTED": JOB_RUNNING,
+    "PROGRESS": JOB_RUNNING,
+    "RETRY": JOB_RUNNING,
+    "SUCCESS": JOB_SUCCEEDED,
+    "FAILURE": JOB_FAILED,
+    "REVOKED": JOB_CANCELLED,
+}
+
+
+class CeleryScanJobs:
+    """Runs scans as Celery tasks; job ids are task ids.
+
+    With ``distributed`` the scan fans out over ``ai_bom.scan_partition`` tasks.
+    """
+
+    def __init__(self, distributed: bool = False) -> None:
+        self.distributed = distributed
+
+    def submit(self, dir: str, options: ScanOptions) -> str:
+        from ai_bom.tasks import task_distributed_scan, task_scan_repo
+
+        task = task_distributed_scan if self.distributed else task_scan_repo
+        return task.apply_async(args=[dir], kwargs={"options": options.model_dump()}).id
+
+    def get(self, job_id: str, include_result: bool = True) -> dict[str, Any] | None:
+        from ai_bom.tasks import celery_app
+
+        result = celery_app.AsyncResult(job_id)
+        status = _CELERY_STATES.get(result.state, JOB_PENDING)
+        info = result.info
+        data: dict[str, Any] = {"job_id": job_id, "status": status, "progress": ScanProgress().snapshot(), "error": None}
+        if status == JOB_RUNNING and isinstance(info, dict):
+            data["progress"] = info
+        elif status == JOB_FAILED:
+            data["error"] = str(info)
+        if status == JOB_SUCCEEDED and is_result_ref(info):
+            # The BOM itself stays in the result store; fetch it through the result endpoint.
+            data["result_ref"] = info
+        if include_result:
+            data["result"] = None
+        return data
+
+    def cancel(self, job_id: str) -> bool:
+        from ai_bom.tasks import celery_app
+
+        celery_app.control.revoke(job_id, terminate=True)
+        return True
+
+
+@lru_cache(maxsize=1)
+def get_scan_jobs() -> ScanJobs:
+    settings = get_settings()
+    if settings.scan_executor == "celery":
+        return CeleryScanJobs(distributed=settings.scan_distributed)
+    return ThreadScanJobs(max_workers=settings.scan_job_workers, ttl_seconds=settings.scan_job_ttl_seconds)
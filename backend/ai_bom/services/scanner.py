@@ -1,89 +1,561 @@
 from __future__ import annotations
 
-import hashlib
+import fnmatch
 import json
 import os
 import pathlib
+import posixpath
+import random
+import time
 import uuid
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from functools import partial
+from typing import Any, Literal
 
-from ai_bom.core.utils import get_git_info, sha256_file
+import structlog
+from pydantic import BaseModel, Field
 
+from ai_bom.core.git import read_git_index
+from ai_bom.core.utils import DEFAULT_MERKLE_CHUNK_SIZE, MERKLE_ALGORITHM, get_git_info
+from ai_bom.services.archives import (
+    DEFAULT_ARCHIVE_MAX_BYTES,
+    DEFAULT_ARCHIVE_MAX_DEPTH,
+    WALK_SUFFIXES as ARCHIVE_WALK_SUFFIXES,
+    archive_format,
+    list_archive_members,
+)
+from ai_bom.services.cache import FingerprintCache
+from ai_bom.services.cdc import DEFAULT_CDC_AVG_SIZE
+from ai_bom.services.cas import (
+    DVC_SUFFIX,
+    hf_blob_digest,
+    lfs_object_path,
+    parse_dvc_file,
+    read_lfs_pointer,
+    verify_digest,
+)
+from ai_bom.services.component_table import ComponentTable
+from ai_bom.services.detectors import Detector, DetectorRegistry, default_registry
+from ai_bom.services.fingerprint import (
+    CHUNK_INDEX_KEY,
+    EXTRA_FINGERPRINTS_KEY,
+    DEFAULT_HEAD_BYTES,
+    DEFAULT_SAMPLE_BLOCK_SIZE,
+    DEFAULT_SAMPLES,
+    FingerprintMethod,
+    dataset_method,
+    dataset_params,
+    merkle_method,
+    sha256_method,
+)
+from ai_bom.services.hashing import HashExecutor
+from ai_bom.services.identity import (
+    DETERMINISTIC_CREATED_BY,
+    component_id,
+    finalize_deterministic,
+    read_project_id,
+    stable_created_at,
+    stable_project_id,
+)
+from ai_bom.services.remote_cache import RemoteFingerprintCache
+from ai_bom.services.walker import WalkEntry, walk_files, walk_git_index, walk_paths
 
-MODEL_SUFFIXES = (".pt", ".ckpt", ".bin", ".h5")
-DATA_SUFFIXES = (".csv", ".parquet", ".jsonl")
 
+DEPENDENCY_FILES = ("pyproject.toml", "requirements.txt")
 
-def _fingerprint_small(path: pathlib.Path, max_bytes: int = 2 * 1024 * 1024) -> str:
-    hasher = hashlib.sha256()
-    read = 0
-    with open(path, "rb") as f:
-        while read < max_bytes:
-            chunk = f.read(min(1024 * 1024, max_bytes - read))
-            if not chunk:
-                break
-            hasher.update(chunk)
-            read += len(chunk)
-    return hasher.hexdigest()
 
+@dataclass
+class ScanProgress:
+    """Counters updated by :func:`iter_components` as it runs; safe to read from another thread."""
 
-def scan_repository(dir: str = ".") -> dict[str, Any]:
+    files: int = 0
+    bytes: int = 0
+    components: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "components": self.components,
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(self.files / elapsed, 1),
+            "bytes_per_second": int(self.bytes / elapsed),
+        }
+
+
+class ScanOptions(BaseModel):
+    """Tuning knobs shared by the scanner entry points, the CLI and the scan API."""
+
+    jobs: int | None = Field(default=None, ge=1)
+    # Digest algorithms computed in one read of each file; sha256 is always the primary.
+    algorithms: list[Literal["sha256", "sha512", "blake2b"]] = Field(default_factory=lambda: ["sha256"])
+    model_algorithm: Literal["sha256", "sha256-merkle"] = "sha256"
+    merkle_chunk_size: int = Field(default=DEFAULT_MERKLE_CHUNK_SIZE, gt=0)
+    merkle_keep_chunks: bool = False
+    hash_backend: Literal["readinto", "mmap"] = "readinto"
+    drop_page_cache: bool = False
+    # Dataset fingerprint strategy; ``dataset_strategy_rules`` maps path globs
+    # (matched against the repo-relative posix path, first match wins) to a strategy.
+    dataset_strategy: Literal["head", "sampled", "full", "cdc"] = "head"
+    dataset_strategy_rules: list[tuple[str, Literal["head", "sampled", "full", "cdc"]]] = Field(default_factory=list)
+    dataset_head_bytes: int = Field(default=DEFAULT_HEAD_BYTES, gt=0)
+    dataset_sample_block_size: int = Field(default=DEFAULT_SAMPLE_BLOCK_SIZE, gt=0)
+    dataset_samples: int = Field(default=DEFAULT_SAMPLES, ge=0)
+    # Average chunk size of the "cdc" strategy, whose chunk index reports changed bytes on rescans.
+    dataset_cdc_avg_size: int = Field(default=DEFAULT_CDC_AVG_SIZE, ge=1024)
+    # Take digests from git-lfs pointers, Hugging Face cache blob names and .dvc
+    # files instead of reading content; re-hash this fraction of them to spot-check.
+    trust_cas: bool = True
+    cas_verify_fraction: float = Field(default=0.0, ge=0.0, le=1.0)
+    # Enumerate tracked files from .git/index and key the cache by blob id for
+    # files git considers clean; with include_untracked directories are listed for untracked files too.
+    use_git_index: bool = False
+    include_untracked: bool = False
+    # Classify files without a suffix from their first bytes.
+    sniff_no_suffix: bool = True
+    # Read format headers (safetensors, GGUF, ONNX, Parquet) into component metadata.
+    extract_metadata: bool = True
+    # Stream zip/tar members through the hasher and emit them as child components.
+    scan_archives: bool = False
+    archive_max_depth: int = Field(default=DEFAULT_ARCHIVE_MAX_DEPTH, ge=1)
+    archive_max_bytes: int = Field(default=DEFAULT_ARCHIVE_MAX_BYTES, gt=0)
+    # uuid5 component ids, a stable project id and timestamp, sorted components and a
+    # content-derived bom_id, so identical inputs give byte-identical BOMs.
+    deterministic: bool = False
+
+    def registry(self) -> DetectorRegistry:
+        return default_registry(self.sniff_no_suffix)
+
+    def archive_method(self) -> FingerprintMethod:
+        key = f"archive-members-v1-depth={self.archive_max_depth}-bytes={self.archive_max_bytes}"
+        compute = partial(
+            list_archive_members,
+            registry=self.registry(),
+            max_depth=self.archive_max_depth,
+            max_bytes=self.archive_max_bytes,
+        )
+        return FingerprintMethod(key, compute)
+
+    def extra_algorithms(self) -> tuple[str, ...]:
+        return tuple(a for a in dict.fromkeys(self.algorithms) if a != "sha256")
+
+    def whole_file_method(self) -> FingerprintMethod:
+        return sha256_method(self.hash_backend, self.drop_page_cache, self.extra_algorithms())
+
+    def model_method(self) -> FingerprintMethod:
+        if self.model_algorithm == MERKLE_ALGORITHM:
+            return merkle_method(self.merkle_chunk_size, self.merkle_keep_chunks)
+        return self.whole_file_method()
+
+    def dataset_methods(self) -> Callable[[str], FingerprintMethod]:
+        """Resolver from a repo-relative path to the dataset fingerprint method for it."""
+        methods: dict[str, FingerprintMethod] = {}
+
+        def method(strategy: str) -> FingerprintMethod:
+            if strategy not in methods:
+                params = dataset_params(
+                    strategy,
+                    self.dataset_head_bytes,
+                    self.dataset_sample_block_size,
+                    self.dataset_samples,
+                    self.dataset_cdc_avg_size,
+                )
+                methods[strategy] = dataset_method(
+                    strategy, params, self.hash_backend, self.drop_page_cache, self.extra_algorithms()
+                )
+            return methods[strategy]
+
+        def resolve(rel: str) -> FingerprintMethod:
+            for pattern, strategy in self.dataset_strategy_rules:
+                if fnmatch.fnmatchcase(rel, pattern):
+                    return method(strategy)
+            return method(self.dataset_strategy)
+
+        return resolve
+
+
+def _resolved(fingerprint: dict[str, Any]) -> Future[dict[str, Any]]:
+    done: Future[dict[str, Any]] = Future()
+    done.set_result(fingerprint)
+    return done
+
+
+class _Fingerprinter:
+    """Routes fingerprint work through the cache first and the hash executor second."""
+
+    def __init__(
+        self,
+        base: pathlib.Path,
+        executor: HashExecutor,
+        cache: FingerprintCache | None,
+        remote: RemoteFingerprintCache | None = None,
+    ) -> None:
+        self.base = base
+        self.executor = executor
+        self.cache = cache
+        self.remote = remote
+        self._writes: dict[Future[dict[str, Any]], tuple[str, os.stat_result, str, str | None]] = {}
+        # Chunk-level change reports for "cdc" fingerprints, keyed by their future.
+        self.changes: dict[Future[dict[str, Any]], dict[str, int]] = {}
+
+    def submit(
+        self,
+        path: pathlib.Path,
+        method: FingerprintMethod,
+        st: os.stat_result | None = None,
+        oid: str | None = None,
+        head: bytes | None = None,
+    ) -> Future[dict[str, Any]]:
+        st = st if st is not None else path.stat()
+        rel = path.relative_to(self.base).as_posix()
+        if self.cache is not None:
+            fingerprint = self.cache.get(rel, st, method.key, oid=oid)
+            if fingerprint is not None:
+                return _resolved(fingerprint)
+        cost = method.cost(st.st_size)
+        if self.remote is not None and self.remote.accepts(method, st.st_size):
+            future = self.executor.submit(self.remote.fingerprint, method, path, rel, st.st_size, head, cost=cost)
+        else:
+            previous = self.cache.chunks(rel, method.key) if self.cache is not None and method.uses_chunks else None
+            future = self.executor.submit(method.run, path, head, previous, cost=cost)
+        if self.cache is not None:
+            self._writes[future] = (rel, st, method.key, oid)
+        return future
+
+    def result(self, future: Future[dict[str, Any]]) -> dict[str, Any]:
+        fingerprint = future.result()
+        chunks = fingerprint.pop(CHUNK_INDEX_KEY, None)
+        write = self._writes.pop(future, None)
+        if write is not None and self.cache is not None:
+            rel, st, algorithm, oid = write
+            self.cache.put(rel, st, algorithm, fingerprint, oid=oid)
+            if chunks is not None:
+                self.changes[future] = self.cache.record_chunks(rel, algorithm, chunks)
+        return fingerprint
+
+
+def _file_component(
+    detector: Detector | None,
+    path: pathlib.Path,
+    base: pathlib.Path,
+    git: dict[str, Any],
+    deterministic: bool = False,
+) -> dict[str, Any]:
+    rel = path.relative_to(base)
+    component: dict[str, Any] = {
+        "component_id": str(uuid.uuid4()),
+        "type": detector.component_type if detector is not None else "artifact",
+        "name": str(rel),
+        # Deterministic BOMs must not depend on where the tree was checked out.
+        "origin": {"git": git, "path": rel.as_posix() if deterministic else str(path)},
+        "fingerprint": {},
+    }
+    if detector is not None:
+        component["metadata"] = {"format": detector.name}
+    return component
+
+
+def _member_component(archive: dict[str, Any], member: dict[str, Any], git: dict[str, Any]) -> dict[str, Any]:
+    """Child component for an archive member; ``name`` joins the nesting chain with ``!/``."""
+    lineage = [*member["chain"], member["name"]]
+    fingerprint: dict[str, Any] = {"algorithm": "sha256", "hash": member["sha256"]}
+    if member["type"] == "dataset":
+        fingerprint.update(strategy="full", params={})
+    metadata: dict[str, Any] = {
+        "format": member["format"],
+        "archive": archive["name"],
+        "archive_member": lineage,
+        "size": member["size"],
+    }
+    return {
+        "component_id": str(uuid.uuid4()),
+        "type": member["type"],
+        "name": "!/".join([archive["name"], *lineage]),
+        "origin": {"git": git, "path": archive["origin"]["path"]},
+        "fingerprint": fingerprint,
+        "metadata": metadata,
+    }
+
+
+def _verified(fingerprint: dict[str, Any], path: str, algorithm: str) -> dict[str, Any]:
+    if not verify_digest(path, algorithm, fingerprint["hash"]):
+        raise ValueError(f"{path} does not match its {fingerprint['source']} digest {fingerprint['hash']}")
+    return {**fingerprint, "verified": True}
+
+
+def _maybe_verify(
+    fingerprint: dict[str, Any], path: str | None, algorithm: str, executor: HashExecutor, options: ScanOptions
+) -> Future[dict[str, Any]]:
+    if path is None or not options.cas_verify_fraction or random.random() >= options.cas_verify_fraction:
+        return _resolved(fingerprint)
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return _resolved(fingerprint)
+    return executor.submit(_verified, fingerprint, path, algorithm, cost=size)
+
+
+def _cas_fingerprint(
+    entry: WalkEntry,
+    component_type: str,
+    base: pathlib.Path,
+    executor: HashExecutor,
+    options: ScanOptions,
+    head: bytes | None = None,
+) -> Future[dict[str, Any]] | None:
+    """Fingerprint from a content-addressed store (HF cache blob or git-lfs pointer), if any."""
+    digest = hf_blob_digest(entry.path) if entry.is_link else None
+    if digest is not None:
+        source, verify_path = "hf-cache", entry.path
+    else:
+        pointer = read_lfs_pointer(entry.path, entry.stat.st_size, head=head)
+        if pointer is None:
+            return None
+        digest, source = pointer[0], "git-lfs"
+        lfs_object = lfs_object_path(base, digest)
+        verify_path = lfs_object if os.path.exists(lfs_object) else None
+    fingerprint: dict[str, Any] = {"algorithm": "sha256", "hash": digest}
+    if component_type == "dataset":
+        fingerprint.update(strategy="full", params={})
+    fingerprint["source"] = source
+    return _maybe_verify(fingerprint, verify_path, "sha256", executor, options)
+
+
+def _dvc_components(
+    entry: WalkEntry, base: pathlib.Path, git: dict[str, Any], executor: HashExecutor, options: ScanOptions
+) -> Iterator[tuple[dict[str, Any], Future[dict[str, Any]]]]:
+    parent = posixpath.dirname(entry.rel)
+    for out in parse_dvc_file(entry.path):
+        rel = posixpath.normpath(posixpath.join(parent, out["path"]))
+        if posixpath.isabs(rel) or rel == ".." or rel.startswith("../"):
+            structlog.get_logger().warning("dvc_out_outside_scan_root", dvc_file=entry.rel, path=out["path"])
+            continue
+        path = base / rel
+        component = _file_component(
+            options.registry().classify_name(path.name), path, base, git, options.deterministic
+        )
+        fingerprint = {"algorithm": "md5", "hash": out["md5"], "source": "dvc"}
+        # DVC 3 records raw-content md5 ("hash: md5"); older files normalised text line endings.
+        verify_path = str(path) if out.get("hash") == "md5" and path.is_file() else None
+        yield component, _maybe_verify(fingerprint, verify_path, "md5", executor, options)
+
+
+def dependency_files(dir: str | os.PathLike[str]) -> list[str]:
+    base = pathlib.Path(dir)
+    return [name for name in DEPENDENCY_FILES if (base / name).exists()]
+
+
+def walk_candidates(dir: str | os.PathLike[str], options: ScanOptions) -> Iterator[WalkEntry]:
+    """The files under ``dir`` that :func:`iter_components` considers, in walk order."""
+    suffixes = options.registry().suffixes() | ({DVC_SUFFIX} if options.trust_cas else set())
+    if options.scan_archives:
+        suffixes |= ARCHIVE_WALK_SUFFIXES
+    companions = (DVC_SUFFIX,) if options.trust_cas else ()
+    index = read_git_index(dir) if options.use_git_index else None
+    if index is not None:
+        return walk_git_index(
+            dir, index, suffixes, companion_suffixes=companions, include_untracked=options.include_untracked
+        )
+    return walk_files(dir, suffixes, companion_suffixes=companions)
+
+
+def iter_components(
+    dir: str = ".",
+    cache: FingerprintCache | None = None,
+    options: ScanOptions | None = None,
+    git: dict[str, Any] | None = None,
+    progress: ScanProgress | None = None,
+    paths: Iterable[str] | None = None,
+    remote_cache: RemoteFingerprintCache | None = None,
+    **overrides: Any,
+) -> Iterator[dict[str, Any]]:
+    """Yield components of ``dir`` in walk order as soon as they are fingerprinted.
+
+    At most a small window of components is pending at any time, so memory stays
+    flat regardless of how many files the tree holds. When a :class:`FingerprintCache`
+    is given, unchanged files are answered from the cache and entries for deleted
+    files are evicted once the walk completes.
+
+    Tuning comes from ``options`` (or :class:`ScanOptions` fields passed as keyword
+    arguments). ``model_algorithm="sha256-merkle"`` fingerprints model files as a
+    Merkle tree over ``merkle_chunk_size`` chunks hashed in parallel;
+    ``merkle_keep_chunks`` also records the leaf hashes so verifiers can re-check
+    individual chunks.
+
+    ``progress`` is updated with the files seen and the components yielded so far.
+    ``paths`` restricts the scan to those repo-relative files (one partition of a
+    distributed scan); dependency manifests are included only if listed, and the
+    cache is not evicted. Files the local cache misses are looked up in
+    ``remote_cache`` (see :class:`RemoteFingerprintCache`) before being hashed.
+    """
+    options = options or ScanOptions(**overrides)
+    progress = progress or ScanProgress()
     base = pathlib.Path(dir)
-    git = get_git_info(base)
-    components: list[dict[str, Any]] = []
-
-    # Detect dependencies
-    deps: list[str] = []
-    if (base / "pyproject.toml").exists():
-        deps.append("pyproject.toml")
-    if (base / "requirements.txt").exists():
-        deps.append("requirements.txt")
-    for d in deps:
-        components.append(
-            {
+    model_method = options.model_method()
+    dataset_method_for = options.dataset_methods()
+    dependency_method = options.whole_file_method()
+    registry = options.registry()
+    archive_method = options.archive_method()
+    if git is None:
+        git = get_git_info(base)
+    # (component, fingerprint future, metadata future or None)
+    pending: deque[tuple[dict[str, Any], Future[dict[str, Any]], Future[dict[str, Any]] | None]] = deque()
+
+    with HashExecutor(options.jobs) as executor:
+        fingerprinter = _Fingerprinter(base, executor, cache, remote_cache)
+        window = executor.jobs * 4
+
+        def drain(limit: int) -> Iterator[dict[str, Any]]:
+            while len(pending) > limit:
+                component, future, metadata = pending.popleft()
+                # Copy: the cache may still hold this dict for its next flush.
+                fingerprint = dict(fingerprinter.result(future))
+                extras = fingerprint.pop(EXTRA_FINGERPRINTS_KEY, None)
+                component["fingerprint"] = fingerprint
+                if extras:
+                    component["fingerprints"] = extras
+                change = fingerprinter.changes.pop(future, None)
+                # Changes are relative to the previous local scan, which a deterministic BOM must not depend on.
+                if change is not None and not options.deterministic:
+                    component.setdefault("metadata", {})["changes"] = change
+                members: list[dict[str, Any]] = []
+                if metadata is not None:
+                    # Copy: the cache may still hold this dict for its next flush.
+                    extra = dict(fingerprinter.result(metadata))
+                    members = extra.pop("members", [])
+                    component["metadata"].update(extra)
+                if options.deterministic:
+                    component["component_id"] = component_id(component)
+                progress.components += 1
+                yield component
+                for member in members:
+                    child = _member_component(component, member, git)
+                    if options.deterministic:
+                        child["component_id"] = component_id(child)
+                    progress.components += 1
+                    yield child
+
+        trust_cas = options.trust_cas
+        if paths is None:
+            deps = dependency_files(base)
+            entries = walk_candidates(base, options)
+        else:
+            paths = list(paths)
+            deps = [p for p in paths if p in DEPENDENCY_FILES]
+            entries = walk_paths(
+                base,
+                [p for p in paths if p not in DEPENDENCY_FILES],
+                companion_suffixes=(DVC_SUFFIX,) if trust_cas else (),
+            )
+
+        # Detect dependencies
+        for d in deps:
+            component = {
                 "component_id": str(uuid.uuid4()),
                 "type": "dependency",
                 "name": d,
                 "origin": {"git": git, "path": d},
-                "fingerprint": {"algorithm": "sha256", "hash": sha256_file(base / d)},
+                "fingerprint": {},
             }
-        )
+            pending.append((component, fingerprinter.submit(base / d, dependency_method), None))
+
+        # Detect model and dataset files
+        for entry in entries:
+            progress.files += 1
+            progress.bytes += entry.stat.st_size
+            if trust_cas and entry.rel.lower().endswith(DVC_SUFFIX):
+                for component, future in _dvc_components(entry, base, git, executor, options):
+                    pending.append((component, future, None))
+                    yield from drain(window)
+                continue
+            if DVC_SUFFIX in entry.companions:
+                # Described by its .dvc file
+                continue
+            path = base / entry.rel
+            archive = archive_format(entry.rel) if options.scan_archives else None
+            if archive is not None:
+                component = _file_component(None, path, base, git, options.deterministic)
+                component["metadata"] = {"format": archive}
+                future = fingerprinter.submit(path, dependency_method, st=entry.stat, oid=entry.oid)
+                members_future = fingerprinter.submit(path, archive_method, st=entry.stat, oid=entry.oid)
+                pending.append((component, future, members_future))
+                yield from drain(window)
+                continue
+            detection = registry.classify(entry.path)
+            if detection is None:
+                continue
+            component_type = detection.detector.component_type
+            component = _file_component(detection.detector, path, base, git, options.deterministic)
+            future = None
+            if trust_cas:
+                future = _cas_fingerprint(entry, component_type, base, executor, options, detection.head)
+            if future is None:
+                if component_type == "model":
+                    method = model_method
+                elif component_type == "dataset":
+                    method = dataset_method_for(entry.rel)
+                else:
+                    method = dependency_method
+                future = fingerprinter.submit(path, method, st=entry.stat, oid=entry.oid, head=detection.head)
+                metadata_method = detection.detector.metadata_method() if options.extract_metadata else None
+            elif entry.is_link and options.extract_metadata:
+                # Hugging Face cache blob: the content is real, only its digest came for free.
+                metadata_method = detection.detector.metadata_method()
+            else:
+                # git-lfs pointer: the weights are not in the worktree.
+                metadata_method = None
+            metadata = None
+            if metadata_method is not None:
+                metadata = fingerprinter.submit(path, metadata_method, st=entry.stat, oid=entry.oid, head=detection.head)
+            pending.append((component, future, metadata))
+            yield from drain(window)
+
+        yield from drain(0)
+
+    if cache is not None and paths is None:
+        cache.evict()
 
-    # Detect model files
-    for path in base.rglob("*"):
-        if not path.is_file():
-            continue
-        if path.suffix.lower() in MODEL_SUFFIXES:
-            components.append(
-                {
-                    "component_id": str(uuid.uuid4()),
-                    "type": "model",
-                    "name": str(path.relative_to(base)),
-                    "origin": {"git": git, "path": str(path)},
-                    "fingerprint": {"algorithm": "sha256", "hash": sha256_file(path)},
-                }
-            )
-        elif path.suffix.lower() in DATA_SUFFIXES:
-            components.append(
-                {
-                    "component_id": str(uuid.uuid4()),
-                    "type": "dataset",
-                    "name": str(path.relative_to(base)),
-                    "origin": {"git": git, "path": str(path)},
-                    "fingerprint": {"algorithm": "sha256", "hash": _fingerprint_small(path)},
-                }
-            )
 
-    bom = {
-        "bom_id": str(uuid.uuid4()),
-        "project_id": str(uuid.uuid4()),
+def bom_header(dir: str = ".", deterministic: bool = False) -> dict[str, Any]:
+    """BOM fields other than ``components`` for a scan of ``dir``.
+
+    With ``deterministic``, ``bom_id`` is left for :func:`finalize_deterministic` to derive
+    and ``created_by`` is fixed rather than taken from ``$USER``.
+    """
+    base = pathlib.Path(dir)
+    return {
+        "bom_id": "" if deterministic else str(uuid.uuid4()),
+        "project_id": stable_project_id(base) if deterministic else read_project_id(base) or str(uuid.uuid4()),
         "name": base.name,
         "version": "0.1.0",
         "description": f"Auto-scanned BOM for {base.name}",
-        "components": components,
-        "created_by": os.getenv("USER", "cli-user"),
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_by": DETERMINISTIC_CREATED_BY if deterministic else os.getenv("USER", "cli-user"),
+        "created_at": stable_created_at() if deterministic else datetime.now(timezone.utc).isoformat(),
     }
-    return bom
 
+
+def scan_repository(
+    dir: str = ".",
+    cache: FingerprintCache | None = None,
+    options: ScanOptions | None = None,
+    remote_cache: RemoteFingerprintCache | None = None,
+    compact: bool = False,
+    **overrides: Any,
+) -> dict[str, Any]:
+    """Scan ``dir`` for dependencies, models and datasets.
+
+    Files are hashed on ``options.jobs`` threads; component order follows the walk
+    order regardless of which hash finishes first. See :func:`iter_components`.
+    With ``compact``, components are collected into a :class:`ComponentTable`.
+    """
+    options = options or ScanOptions(**overrides)
+    bom = bom_header(dir, options.deterministic)
+    components = iter_components(dir, cache=cache, options=options, remote_cache=remote_cache)
+    bom["components"] = ComponentTable(components) if compact else list(components)
+    return finalize_deterministic(bom) if options.deterministic else bom
@@ -1,15 +1,38 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import json
+import os
 import pathlib
+import threading
 import uuid
+from collections.abc import Callable, Iterator
 from datetime import datetime, timezone
-from typing import Any, Tuple
+from typing import Any
 
+import orjson
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
 
-from ai_bom.core.utils import aggregate_bom_hash, canonical_json
+from ai_bom.core.utils import (
+    aggregate_bom_hash,
+    canonical_json,
+    iter_json_members,
+    merkle_leaf,
+    merkle_proof,
+    merkle_root,
+    merkle_root_from_proof,
+)
+
+
+SIGNATURE_ALGORITHM = "ed25519-sha256"
+# Signs a Merkle root over the components plus a header hash; see merkle_digest.
+MERKLE_SIGNATURE_ALGORITHM = "ed25519-merkle-sha256"
+_MERKLE_DOMAIN = b"ai-bom-merkle-v1\0"
+# A detached signature for ``bom.json`` lives next to it in ``bom.json.sig``.
+DETACHED_SUFFIX = ".sig"
 
 
 def ed25519_keygen(outdir: str | pathlib.Path) -> tuple[str, str, str]:
@@ -38,54 +61,413 @@ def load_private_key(path: str | pathlib.Path) -> Ed25519PrivateKey:
     return serialization.load_pem_private_key(data, password=None)
 
 
+class Keyring:
+    """Public keys parsed once and reused, keyed by PEM bytes, raw ``key_id`` and file.
+
+    A key file is re-read only when its mtime or size changes. Safe to share
+    between threads; each worker process of a bulk verify keeps its own.
+    """
+
+    def __init__(self) -> None:
+        self._pem: dict[bytes, Ed25519PublicKey] = {}
+        self._key_ids: dict[str, Ed25519PublicKey] = {}
+        self._files: dict[str, tuple[int, int, Ed25519PublicKey]] = {}
+        self._lock = threading.Lock()
+
+    def from_pem(self, data: bytes) -> Ed25519PublicKey:
+        key = self._pem.get(data)
+        if key is None:
+            key = serialization.load_pem_public_key(data)
+            with self._lock:
+                self._pem[data] = key
+        return key
+
+    def from_key_id(self, key_id: str) -> Ed25519PublicKey:
+        """The key a ``sign_bom`` signature names: its raw ed25519 bytes in base64url."""
+        key = self._key_ids.get(key_id)
+        if key is None:
+            key = Ed25519PublicKey.from_public_bytes(base64.urlsafe_b64decode(key_id))
+            with self._lock:
+                self._key_ids[key_id] = key
+        return key
+
+    def load(self, path: str | pathlib.Path) -> Ed25519PublicKey:
+        name = os.fspath(path)
+        st = os.stat(name)
+        cached = self._files.get(name)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        key = self.from_pem(pathlib.Path(name).read_bytes())
+        with self._lock:
+            self._files[name] = (st.st_mtime_ns, st.st_size, key)
+        return key
+
+
+_keyring = Keyring()
+
+
+def get_keyring() -> Keyring:
+    return _keyring
+
+
 def load_public_key(path: str | pathlib.Path) -> Ed25519PublicKey:
-    data = pathlib.Path(path).read_bytes()
-    return serialization.load_pem_public_key(data)
+    return _keyring.load(path)
+
+
+def public_key_id(public_key: Ed25519PublicKey) -> str:
+    public_bytes = public_key.public_bytes(encoding=serialization.Encoding.Raw, format=serialization.PublicFormat.Raw)
+    return base64.urlsafe_b64encode(public_bytes).decode()
 
 
 def compute_bom_hash(bom: dict[str, Any]) -> str:
     return aggregate_bom_hash(bom)
 
 
-def sign_bom(bom: dict[str, Any], private_key: Ed25519PrivateKey) -> dict[str, Any]:
-    payload = {k: v for k, v in bom.items() if k != "signatures"}
-    digest_hex = compute_bom_hash(payload)
-    signature = private_key.sign(bytes.fromhex(digest_hex))
-    public_key = private_key.public_key()
-    public_bytes = public_key.public_bytes(
-        encoding=serialization.Encoding.Raw, format=serialization.PublicFormat.Raw
-    )
-    key_id = base64.urlsafe_b64encode(public_bytes).decode()
+def component_leaf(component: dict[str, Any]) -> bytes:
+    return merkle_leaf(canonical_json(component))
+
+
+def header_hash(bom: dict[str, Any]) -> str:
+    """Hash of everything in ``bom`` except its components and signatures."""
+    return aggregate_bom_hash({k: v for k, v in bom.items() if k not in ("components", "signatures")})
+
+
+def merkle_digest(header_hex: str, count: int, components_root: bytes) -> bytes:
+    """The digest an ``ed25519-merkle-sha256`` signature signs."""
+    return hashlib.sha256(_MERKLE_DOMAIN + bytes.fromhex(header_hex) + count.to_bytes(8, "big") + components_root).digest()
+
+
+def merkle_fields(bom: dict[str, Any]) -> dict[str, Any]:
+    """Header hash, component count and Merkle root of ``bom``'s components, in BOM order."""
+    components = bom.get("components") or []
+    root = merkle_root([component_leaf(c) for c in components])
+    return {"header_hash": header_hash(bom), "component_count": len(components), "components_root": root.hex()}
+
+
+def sign_bom(bom: dict[str, Any], private_key: Ed25519PrivateKey, merkle: bool = False) -> dict[str, Any]:
+    """Append a signature over the aggregate BOM hash, or with ``merkle`` over the component Merkle root.
+
+    A Merkle signature lets a single component be checked against the signed BOM
+    with :func:`component_proof` / :func:`verify_component_proof`.
+    """
+    record: dict[str, Any] = {"key_id": public_key_id(private_key.public_key())}
+    if merkle:
+        fields = merkle_fields(bom)
+        digest = merkle_digest(fields["header_hash"], fields["component_count"], bytes.fromhex(fields["components_root"]))
+        record["algorithm"] = MERKLE_SIGNATURE_ALGORITHM
+        record["merkle"] = fields
+    else:
+        digest = bytes.fromhex(compute_bom_hash({k: v for k, v in bom.items() if k != "signatures"}))
+        record["algorithm"] = SIGNATURE_ALGORITHM
+    record["signature"] = base64.b64encode(private_key.sign(digest)).decode()
+    record["signed_at"] = datetime.now(timezone.utc).isoformat()
     signed = dict(bom)
-    signatures = list(bom.get("signatures", []))
-    signatures.append(
-        {
-            "key_id": key_id,
-            "algorithm": "ed25519-sha256",
-            "signature": base64.b64encode(signature).decode(),
-            "signed_at": datetime.now(timezone.utc).isoformat(),
-        }
-    )
-    signed["signatures"] = signatures
+    signed["signatures"] = [*bom.get("signatures", []), record]
     return signed
 
 
+def _signed_digest(bom: dict[str, Any], sig: dict[str, Any], digests: dict[str, bytes]) -> bytes:
+    # Each digest is computed at most once per BOM, however many signatures use it.
+    algorithm = sig.get("algorithm") or SIGNATURE_ALGORITHM
+    if algorithm not in digests:
+        if algorithm == MERKLE_SIGNATURE_ALGORITHM:
+            fields = merkle_fields(bom)
+            digests[algorithm] = merkle_digest(
+                fields["header_hash"], fields["component_count"], bytes.fromhex(fields["components_root"])
+            )
+        elif algorithm == SIGNATURE_ALGORITHM:
+            digests[algorithm] = bytes.fromhex(compute_bom_hash({k: v for k, v in bom.items() if k != "signatures"}))
+        else:
+            raise ValueError(f"unsupported algorithm {algorithm!r}")
+    return digests[algorithm]
+
+
 def verify_bom_signature(bom: dict[str, Any], public_key_path: str | None = None) -> bool:
     signatures = bom.get("signatures") or []
     if not signatures:
         return False
     sig = signatures[-1]
-    digest_hex = compute_bom_hash({k: v for k, v in bom.items() if k != "signatures"})
     signature = base64.b64decode(sig.get("signature", ""))
     try:
+        digest = _signed_digest(bom, sig, {})
         if public_key_path:
             public_key = load_public_key(public_key_path)
         else:
             # Attempt to reconstruct from key_id (raw ed25519 key in base64url)
-            key_bytes = base64.urlsafe_b64decode(sig["key_id"])  # type: ignore[arg-type]
-            public_key = Ed25519PublicKey.from_public_bytes(key_bytes)
-        public_key.verify(signature, bytes.fromhex(digest_hex))
+            public_key = _keyring.from_key_id(sig["key_id"])
+        public_key.verify(signature, digest)
         return True
     except Exception:
         return False
 
+
+def verify_signatures(
+    bom: dict[str, Any],
+    public_key: Ed25519PublicKey | None = None,
+    keyring: Keyring | None = None,
+    digest_hex: str | None = None,
+) -> list[dict[str, Any]]:
+    """Check every signature on ``bom``; one ``{key_id, algorithm, ok[, error]}`` per signature.
+
+    Each signature is checked against the key its ``key_id`` names, except that
+    signatures by ``public_key`` use that key directly. ``digest_hex`` skips
+    re-hashing when the caller already has the BOM hash.
+    """
+    digests = {SIGNATURE_ALGORITHM: bytes.fromhex(digest_hex)} if digest_hex is not None else {}
+    return _check_signatures(bom.get("signatures") or [], lambda sig: _signed_digest(bom, sig, digests), public_key, keyring)
+
+
+def _check_signatures(
+    signatures: list[dict[str, Any]],
+    digest_for: Callable[[dict[str, Any]], bytes],
+    public_key: Ed25519PublicKey | None,
+    keyring: Keyring | None,
+) -> list[dict[str, Any]]:
+    keyring = keyring or _keyring
+    trusted_id = public_key_id(public_key) if public_key is not None else None
+    results = []
+    for sig in signatures:
+        key_id = sig.get("key_id", "")
+        result: dict[str, Any] = {"key_id": key_id, "algorithm": sig.get("algorithm"), "ok": False}
+        try:
+            key = public_key if public_key is not None and key_id == trusted_id else keyring.from_key_id(key_id)
+            key.verify(base64.b64decode(sig.get("signature", "")), digest_for(sig))
+            result["ok"] = True
+        except InvalidSignature:
+            result["error"] = "invalid signature"
+        except (ValueError, TypeError) as exc:
+            result["error"] = f"cannot verify: {exc}"
+        results.append(result)
+    return results
+
+
+def signed_digests(bom: dict[str, Any]) -> dict[str, str]:
+    """Hex digest, by algorithm, that the signatures on ``bom`` sign; unsupported algorithms are left out.
+
+    Record these from the document as it was signed to check its signatures
+    later with :func:`verify_signed_digests`, without keeping the document.
+    """
+    digests: dict[str, bytes] = {}
+    for sig in bom.get("signatures") or []:
+        try:
+            _signed_digest(bom, sig, digests)
+        except ValueError:
+            continue
+    return {algorithm: digest.hex() for algorithm, digest in digests.items()}
+
+
+def verify_signed_digests(
+    signatures: list[dict[str, Any]],
+    digests: dict[str, str],
+    public_key: Ed25519PublicKey | None = None,
+    keyring: Keyring | None = None,
+) -> list[dict[str, Any]]:
+    """Check ``signatures`` against digests recorded with :func:`signed_digests`; results as from :func:`verify_signatures`."""
+
+    def digest_for(sig: dict[str, Any]) -> bytes:
+        algorithm = sig.get("algorithm") or SIGNATURE_ALGORITHM
+        if algorithm not in digests:
+            raise ValueError(f"no signed digest recorded for {algorithm!r}")
+        return bytes.fromhex(digests[algorithm])
+
+    return _check_signatures(signatures, digest_for, public_key, keyring)
+
+
+def signatures_valid(results: list[dict[str, Any]], public_key: Ed25519PublicKey | None = None) -> bool:
+    """True when there is at least one signature, all verify, and one is by ``public_key`` if given."""
+    if not results or not all(r["ok"] for r in results):
+        return False
+    return public_key is None or any(r["key_id"] == public_key_id(public_key) for r in results)
+
+
+def component_proof(bom: dict[str, Any], index: int, header_hex: str | None = None) -> dict[str, Any]:
+    """An inclusion proof for ``bom["components"][index]`` under the BOM's Merkle signatures.
+
+    The proof holds the component, the sibling hashes up to the root and the
+    Merkle signatures, so a verifier needs neither the other components nor
+    the header. ``header_hex`` defaults to :func:`header_hash` of ``bom``; pass
+    the signed value when only the components are at hand. Raises
+    ``ValueError`` when the BOM has no Merkle signature.
+    """
+    signatures = [s for s in bom.get("signatures") or [] if s.get("algorithm") == MERKLE_SIGNATURE_ALGORITHM]
+    if not signatures:
+        raise ValueError("BOM has no Merkle signature")
+    components = bom.get("components") or []
+    if not -len(components) <= index < len(components):
+        raise IndexError("component index out of range")
+    index %= len(components)
+    leaves = [component_leaf(c) for c in components]
+    return {
+        "bom_id": bom.get("bom_id"),
+        "algorithm": MERKLE_SIGNATURE_ALGORITHM,
+        "header_hash": header_hex or header_hash(bom),
+        "component_count": len(leaves),
+        "index": index,
+        "component": components[index],
+        "siblings": [h.hex() for h in merkle_proof(leaves, index)],
+        "signatures": signatures,
+    }
+
+
+def verify_component_proof(
+    proof: dict[str, Any], public_key: Ed25519PublicKey | None = None, keyring: Keyring | None = None
+) -> list[dict[str, Any]]:
+    """Check a :func:`component_proof`; per-signature results as from :func:`verify_signatures`.
+
+    The root is rebuilt from the component and its siblings, so a proof for a
+    modified component, the wrong position or another BOM fails every signature.
+    Pass the results to :func:`signatures_valid` for a single verdict.
+    """
+    try:
+        root = merkle_root_from_proof(
+            component_leaf(proof["component"]),
+            int(proof["index"]),
+            int(proof["component_count"]),
+            [bytes.fromhex(h) for h in proof["siblings"]],
+        )
+        digest = merkle_digest(proof["header_hash"], int(proof["component_count"]), root)
+    except (KeyError, TypeError, ValueError) as exc:
+        return [{"key_id": "", "algorithm": MERKLE_SIGNATURE_ALGORITHM, "ok": False, "error": f"malformed proof: {exc}"}]
+
+    def digest_for(sig: dict[str, Any]) -> bytes:
+        if sig.get("algorithm") != MERKLE_SIGNATURE_ALGORITHM:
+            raise ValueError(f"unsupported algorithm {sig.get('algorithm')!r}")
+        return digest
+
+    return _check_signatures(proof.get("signatures") or [], digest_for, public_key, keyring)
+
+
+
+class _KeyOrder(Exception):
+    """A key sorting before ``components`` appeared after it; the header must be read first."""
+
+
+def _canonical_file_pieces(path: str | pathlib.Path, header: dict[str, Any] | None) -> Iterator[bytes]:
+    # canonical_json of the BOM file without signatures: sorted keys, components one at a time.
+    # ``header`` (every other member) is needed up front only when keys are out of order.
+    known: dict[str, Any] = dict(header or {})
+    emitted: set[str] = set()
+
+    def opening() -> bytes:
+        return b"," if emitted else b"{"
+
+    for key, value in iter_json_members(path, "components"):
+        if key == "signatures":
+            continue
+        if key != "components" or not isinstance(value, Iterator):
+            if header is None and key < "components" and "components" in emitted:
+                raise _KeyOrder
+            known[key] = value
+            continue
+        for name in sorted(k for k in known if k < "components"):
+            yield opening() + orjson.dumps(name) + b":" + orjson.dumps(known[name], option=orjson.OPT_SORT_KEYS)
+            emitted.add(name)
+        yield opening() + b'"components":['
+        emitted.add("components")
+        for i, component in enumerate(value):
+            yield (b"," if i else b"") + orjson.dumps(component, option=orjson.OPT_SORT_KEYS)
+        yield b"]"
+    for name in sorted(k for k in known if k not in emitted):
+        yield opening() + orjson.dumps(name) + b":" + orjson.dumps(known[name], option=orjson.OPT_SORT_KEYS)
+        emitted.add(name)
+    yield b"}" if emitted else b"{}"
+
+
+def bom_file_hash(path: str | pathlib.Path) -> str:
+    """:func:`compute_bom_hash` of the BOM file at ``path`` without its signatures, streamed.
+
+    Components are decoded and hashed one at a time, so memory stays flat for
+    BOMs of any size. Files written by ai-bom put ``components`` after the keys
+    that sort before it and are read once; otherwise the other members are
+    read in a first pass.
+    """
+    hasher = hashlib.sha256()
+    try:
+        for piece in _canonical_file_pieces(path, None):
+            hasher.update(piece)
+    except _KeyOrder:
+        header = {k: v for k, v in iter_json_members(path, "components") if k not in ("components", "signatures")}
+        hasher = hashlib.sha256()
+        for piece in _canonical_file_pieces(path, header):
+            hasher.update(piece)
+    return hasher.hexdigest()
+
+
+def detached_signature_path(bom_path: str | pathlib.Path) -> pathlib.Path:
+    bom_path = pathlib.Path(bom_path)
+    return bom_path.with_name(bom_path.name + DETACHED_SUFFIX)
+
+
+def read_detached_signature(sig_path: str | pathlib.Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(pathlib.Path(sig_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def sign_detached(
+    bom_path: str | pathlib.Path, private_key: Ed25519PrivateKey, sig_path: str | pathlib.Path | None = None
+) -> pathlib.Path:
+    """Sign the BOM at ``bom_path`` without rewriting it; the signature goes to a ``.sig`` sidecar.
+
+    The sidecar records the digest and ``ed25519-sha256`` signatures over it, the
+    same digest an embedded signature signs. Signing again with another key adds
+    a signature; a sidecar left over from different content is replaced. The
+    sidecar is replaced atomically.
+    """
+    sig_path = pathlib.Path(sig_path) if sig_path is not None else detached_signature_path(bom_path)
+    digest_hex = bom_file_hash(bom_path)
+    existing = read_detached_signature(sig_path) or {}
+    signatures = existing.get("signatures", []) if existing.get("digest", {}).get("hash") == digest_hex else []
+    signatures.append(
+        {
+            "key_id": public_key_id(private_key.public_key()),
+            "algorithm": SIGNATURE_ALGORITHM,
+            "signature": base64.b64encode(private_key.sign(bytes.fromhex(digest_hex))).decode(),
+            "signed_at": datetime.now(timezone.utc).isoformat(),
+        }
+    )
+    document = {
+        "bom": pathlib.Path(bom_path).name,
+        "digest": {"algorithm": "sha256", "hash": digest_hex},
+        "signatures": signatures,
+    }
+    tmp = sig_path.with_name(f"{sig_path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, sig_path)
+    return sig_path
+
+
+def verify_detached(
+    bom_path: str | pathlib.Path,
+    sig_path: str | pathlib.Path | None = None,
+    public_key: Ed25519PublicKey | None = None,
+    keyring: Keyring | None = None,
+    digest_hex: str | None = None,
+) -> list[dict[str, Any]]:
+    """Check the sidecar signatures of ``bom_path``; per-signature results as from :func:`verify_signatures`.
+
+    The BOM is re-hashed (streamed) unless the caller passes ``digest_hex``;
+    content that changed since signing fails every signature. No sidecar
+    means no results.
+    """
+    sig_path = pathlib.Path(sig_path) if sig_path is not None else detached_signature_path(bom_path)
+    document = read_detached_signature(sig_path)
+    if document is None:
+        return []
+    signatures = document.get("signatures") or []
+    if digest_hex is None:
+        digest_hex = bom_file_hash(bom_path)
+    if (document.get("digest") or {}).get("hash") != digest_hex:
+        return [
+            {"key_id": sig.get("key_id", ""), "algorithm": sig.get("algorithm"), "ok": False, "error": "BOM changed since it was signed"}
+            for sig in signatures
+        ]
+
+    def digest_for(sig: dict[str, Any]) -> bytes:
+        if (sig.get("algorithm") or SIGNATURE_ALGORITHM) != SIGNATURE_ALGORITHM:
+            raise ValueError(f"unsupported algorithm {sig.get('algorithm')!r}")
+        return bytes.fromhex(digest_hex)
+
+    return _check_signatures(signatures, digest_for, public_key, keyring)
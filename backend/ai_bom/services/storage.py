@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import timedelta, datetime
 from typing import Any
 
@@ -84,3 +85,48 @@ def complete_multipart_upload(key: str, upload_id: str, parts: list[dict[str, An
     )
     return {'etag': resp.get('ETag')}
 
+
+
+def put_object(key: str, data: bytes, content_type: str = 'application/octet-stream', content_encoding: str | None = None) -> None:  # pragma: no cover - external
+    s3 = get_s3()
+    settings = get_settings()
+    params: dict[str, Any] = {
+        'Bucket': settings.s3.bucket,
+        'Key': key,
+        'Body': data,
+        'ContentType': content_type,
+    }
+    if content_encoding:
+        params['ContentEncoding'] = content_encoding
+    params.update(_sse_params())
+    s3.put_object(**params)
+
+
+def iter_object(key: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:  # pragma: no cover - external
+    s3 = get_s3()
+    settings = get_settings()
+    body = s3.get_object(Bucket=settings.s3.bucket, Key=key)['Body']
+    try:
+        yield from body.iter_chunks(chunk_size)
+    finally:
+        body.close()
+
+
+def get_object(key: str) -> bytes | None:  # pragma: no cover - external
+    s3 = get_s3()
+    settings = get_settings()
+    try:
+        resp = s3.get_object(Bucket=settings.s3.bucket, Key=key)
+    except s3.exceptions.NoSuchKey:
+        return None
+    body = resp['Body']
+    try:
+        return body.read()
+    finally:
+        body.close()
+
+
+def delete_object(key: str) -> None:  # pragma: no cover - external
+    s3 = get_s3()
+    settings = get_settings()
+    s3.delete_object(Bucket=settings.s3.bucket, Key=key)
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import os
+import re
+import stat
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from ai_bom.core.git import GitIndex, IndexEntry
+
+
+# Directories that never contain artifacts worth fingerprinting.
+DEFAULT_PRUNE_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".ai-bom",
+        ".tox",
+        ".nox",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".idea",
+    }
+)
+IGNORE_FILENAME = ".ai-bombignore"
+GITIGNORE_FILENAME = ".gitignore"
+
+
+class WalkEntry(NamedTuple):
+    path: str
+    rel: str
+    stat: os.stat_result
+    is_link: bool = False
+    # Suffixes from ``companion_suffixes`` for which ``name + suffix`` exists alongside this file.
+    companions: tuple[str, ...] = ()
+    # Git blob id, set only when the file is tracked and its stat data matches the index.
+    oid: str | None = None
+
+
+class _Rule(NamedTuple):
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+    base: str
+    dirs_only_source: bool
+
+
+def _translate(pattern: str) -> str:
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            j = pattern.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1 : j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """Minimal gitignore-style matcher (``*``, ``**``, ``?``, classes, ``!`` and trailing ``/``).
+
+    Rules read from ``.gitignore`` only prune directories: model weights are often
+    git-ignored and still belong in the BOM. ``.ai-bombignore`` rules apply to files too.
+    """
+
+    def __init__(self, rules: Iterable[_Rule] = ()) -> None:
+        self.rules = list(rules)
+
+    def extended(self, lines: Iterable[str], base: str = "", dirs_only: bool = False) -> IgnoreRules:
+        rules = list(self.rules)
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            line = line.lstrip("/")
+            prefix = "" if anchored else "(?:.*/)?"
+            regex = re.compile(f"^{prefix}{_translate(line)}$")
+            rules.append(_Rule(regex, negate, dir_only, base, dirs_only))
+        return IgnoreRules(rules)
+
+    def extended_from_file(self, path: str, base: str = "", dirs_only: bool = False) -> IgnoreRules:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return self.extended(f.readlines(), base=base, dirs_only=dirs_only)
+        except OSError:
+            return self
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        result = False
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.dirs_only_source and not is_dir:
+                continue
+            if rule.base:
+                if not rel.startswith(rule.base + "/"):
+                    continue
+                candidate = rel[len(rule.base) + 1 :]
+            else:
+                candidate = rel
+            if rule.regex.match(candidate):
+                result = not rule.negate
+        return result
+
+
+def walk_files(
+    root: str | os.PathLike[str],
+    suffixes: Iterable[str] | None = None,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+    use_gitignore: bool = True,
+    companion_suffixes: Iterable[str] = (),
+) -> Iterator[WalkEntry]:
+    """Yield regular files under ``root`` using ``os.scandir``.
+
+    Entries are filtered on their name (lower-cased suffix) before anything else,
+    so only candidate files cost a ``stat``. Directories are pruned by name, by
+    ``pyvenv.cfg`` (virtualenvs), and by ignore rules. Output is sorted by name
+    within each directory so walks are deterministic. ``companion_suffixes`` are
+    reported per entry from the directory listing, without extra syscalls.
+    """
+    root = os.fspath(root)
+    wanted = frozenset(s.lower() for s in suffixes) if suffixes is not None else None
+    prune = frozenset(prune_dirs)
+    companion_suffixes = tuple(companion_suffixes)
+    rules = IgnoreRules().extended_from_file(os.path.join(root, IGNORE_FILENAME))
+
+    stack: list[tuple[str, str, IgnoreRules]] = [(root, "", rules)]
+    while stack:
+        dir_path, dir_rel, dir_rules = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        names = {e.name for e in entries}
+        if dir_rel and "pyvenv.cfg" in names:
+            continue
+        if use_gitignore and GITIGNORE_FILENAME in names:
+            dir_rules = dir_rules.extended_from_file(os.path.join(dir_path, GITIGNORE_FILENAME), base=dir_rel, dirs_only=True)
+        subdirs: list[tuple[str, str, IgnoreRules]] = []
+        for entry in entries:
+            name = entry.name
+            rel = f"{dir_rel}/{name}" if dir_rel else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name in prune or dir_rules.ignored(rel, is_dir=True):
+                        continue
+                    subdirs.append((entry.path, rel, dir_rules))
+                    continue
+                if wanted is not None and os.path.splitext(name)[1].lower() not in wanted:
+                    continue
+                if not entry.is_file():
+                    continue
+                if dir_rules.rules and dir_rules.ignored(rel, is_dir=False):
+                    continue
+                companions = tuple(s for s in companion_suffixes if name + s in names) if companion_suffixes else ()
+                yield WalkEntry(entry.path, rel, entry.stat(), entry.is_symlink(), companions)
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+def _index_tree(tracked: dict[str, IndexEntry]) -> tuple[dict[str, dict[str, IndexEntry]], dict[str, set[str]]]:
+    # Directory -> its tracked files by name, and directory -> names of subdirectories holding tracked files.
+    files: dict[str, dict[str, IndexEntry]] = {}
+    subdirs: dict[str, set[str]] = {}
+    for rel, entry in tracked.items():
+        dir_rel, _, name = rel.rpartition("/")
+        files.setdefault(dir_rel, {})[name] = entry
+        while dir_rel:
+            parent, _, name = dir_rel.rpartition("/")
+            children = subdirs.setdefault(parent, set())
+            if name in children:
+                break
+            children.add(name)
+            dir_rel = parent
+    return files, subdirs
+
+
+def walk_git_index(
+    root: str | os.PathLike[str],
+    index: GitIndex,
+    suffixes: Iterable[str] | None = None,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+    companion_suffixes: Iterable[str] = (),
+    include_untracked: bool = False,
+) -> Iterator[WalkEntry]:
+    """Yield tracked files under ``root`` from the git index, in :func:`walk_files` order.
+
+    Directories come from the index rather than listings, and only candidate
+    files are stat'ed, once each. Tracked files whose stat data still matches the
+    index carry their blob id (racily-clean entries do not). Pruning and ignore
+    rules are those of :func:`walk_files`. With ``include_untracked`` every
+    directory is listed as well, so files the index does not know about are
+    yielded in their place; tracked files are still stat'ed only once.
+    """
+    root = os.fspath(root)
+    try:
+        prefix = Path(root).resolve().relative_to(index.root).as_posix()
+    except ValueError:
+        yield from walk_files(root, suffixes, prune_dirs, companion_suffixes=companion_suffixes)
+        return
+    prefix = "" if prefix == "." else prefix + "/"
+    wanted = frozenset(s.lower() for s in suffixes) if suffixes is not None else None
+    prune = frozenset(prune_dirs)
+    companion_suffixes = tuple(companion_suffixes)
+    rules = IgnoreRules().extended_from_file(os.path.join(root, IGNORE_FILENAME))
+    tree_files, tree_dirs = _index_tree({e.path[len(prefix) :]: e for e in index.entries if e.path.startswith(prefix)})
+
+    stack: list[tuple[str, str, IgnoreRules]] = [(root, "", rules)]
+    while stack:
+        dir_path, dir_rel, dir_rules = stack.pop()
+        tracked = tree_files.get(dir_rel, {})
+        tracked_dirs = tree_dirs.get(dir_rel, set())
+        listing: dict[str, os.DirEntry[str]] | None = None
+        if include_untracked:
+            try:
+                with os.scandir(dir_path) as it:
+                    listing = {e.name: e for e in it}
+            except OSError:
+                continue
+            names = set(listing)
+        else:
+            names = tracked.keys() | tracked_dirs
+        if dir_rel and "pyvenv.cfg" in names:
+            continue
+        if GITIGNORE_FILENAME in names:
+            dir_rules = dir_rules.extended_from_file(os.path.join(dir_path, GITIGNORE_FILENAME), base=dir_rel, dirs_only=True)
+        subdirs: list[tuple[str, str, IgnoreRules]] = []
+        for name in sorted(names):
+            rel = f"{dir_rel}/{name}" if dir_rel else name
+            path = os.path.join(dir_path, name)
+            dir_entry = listing.get(name) if listing is not None else None
+            index_entry = tracked.get(name)
+            try:
+                is_dir = dir_entry.is_dir(follow_symlinks=False) if dir_entry is not None else name in tracked_dirs
+                if is_dir:
+                    if name in prune or dir_rules.ignored(rel, is_dir=True):
+                        continue
+                    subdirs.append((path, rel, dir_rules))
+                    continue
+                if wanted is not None and os.path.splitext(name)[1].lower() not in wanted:
+                    continue
+                if dir_rules.rules and dir_rules.ignored(rel, is_dir=False):
+                    continue
+                companions = tuple(s for s in companion_suffixes if name + s in names) if companion_suffixes else ()
+                if index_entry is None:
+                    if dir_entry is None or not dir_entry.is_file():
+                        continue
+                    yield WalkEntry(dir_entry.path, rel, dir_entry.stat(), dir_entry.is_symlink(), companions)
+                    continue
+                st = os.stat(path)
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                clean = not index_entry.is_symlink and index_entry.matches(st) and not index.is_racy(index_entry)
+                yield WalkEntry(path, rel, st, index_entry.is_symlink, companions, index_entry.oid if clean else None)
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+def walk_paths(
+    root: str | os.PathLike[str],
+    rels: Iterable[str],
+    companion_suffixes: Iterable[str] = (),
+) -> Iterator[WalkEntry]:
+    """Yield entries for the given repo-relative files, in the order given; missing files are skipped."""
+    root = os.fspath(root)
+    companion_suffixes = tuple(companion_suffixes)
+    for rel in rels:
+        path = os.path.join(root, rel)
+        try:
+            is_link = stat.S_ISLNK(os.lstat(path).st_mode)
+            st = os.stat(path)
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
+        companions = tuple(s for s in companion_suffixes if os.path.lexists(path + s))
+        yield WalkEntry(path, rel, st, is_link, companions)
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 from typing import Any
 
-from celery import Celery
+from celery import Celery, chord
 
 from ai_bom.core.config import get_settings
-from ai_bom.services.scanner import scan_repository
+from ai_bom.core.utils import get_git_info
+from ai_bom.services.partition import merge_partitions, partition_scan, scan_partition
+from ai_bom.services.results import delete_result, load_result, store_result
+from ai_bom.services.scan_jobs import run_scan
+from ai_bom.services.scanner import ScanOptions, ScanProgress, bom_header
 
 
 settings = get_settings()
@@ -18,7 +24,70 @@ celery_app = Celery(
 celery_app.conf.task_queues = {"ai_bom"}
 
 
-@celery_app.task(name="ai_bom.scan_repo")
-def task_scan_repo(path: str) -> dict[str, Any]:  # pragma: no cover - worker side
-    return scan_repository(path)
+PROGRESS_INTERVAL_SECONDS = 0.5
 
+
+@celery_app.task(name="ai_bom.scan_repo", bind=True)
+def task_scan_repo(self: Any, path: str, options: dict[str, Any] | None = None) -> dict[str, Any]:  # pragma: no cover - worker side
+    progress = ScanProgress()
+    last = 0.0
+
+    def report() -> None:
+        nonlocal last
+        now = time.monotonic()
+        if now - last >= PROGRESS_INTERVAL_SECONDS:
+            last = now
+            self.update_state(state="PROGRESS", meta=progress.snapshot())
+
+    bom = run_scan(path, ScanOptions(**(options or {})), progress, on_component=report, compact=True)
+    return store_result(bom, "scans")
+
+
+
+@celery_app.task(
+    name="ai_bom.scan_partition",
+    autoretry_for=(OSError,),
+    retry_backoff=True,
+    max_retries=3,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def task_scan_partition(
+    path: str, paths: list[str], index: int, options: dict[str, Any], git: dict[str, Any]
+) -> dict[str, Any]:  # pragma: no cover - worker side
+    return store_result(scan_partition(path, paths, index, ScanOptions(**options), git), "scan-partitions")
+
+
+@celery_app.task(name="ai_bom.merge_scan")
+def task_merge_scan(
+    refs: list[dict[str, Any]], header: dict[str, Any], deterministic: bool = False
+) -> dict[str, Any]:  # pragma: no cover - worker side
+    bom = merge_partitions(header, [load_result(ref) for ref in refs], deterministic)
+    merged = store_result(bom, "scans")
+    for ref in refs:
+        delete_result(ref)
+    return merged
+
+
+@celery_app.task(name="ai_bom.distributed_scan", bind=True)
+def task_distributed_scan(self: Any, path: str, options: dict[str, Any] | None = None) -> dict[str, Any]:  # pragma: no cover - worker side
+    """Partition ``path``, hash the partitions across the pool and merge them; the result references the merged BOM."""
+    options = ScanOptions(**(options or {})).model_dump()
+    partitions = partition_scan(
+        path,
+        ScanOptions(**options),
+        max_files=settings.scan_partition_files,
+        max_bytes=settings.scan_partition_bytes,
+    )
+    git = get_git_info(path)
+    header = bom_header(path, options["deterministic"])
+    parts = [task_scan_partition.s(path, p.paths, p.index, options, git) for p in partitions]
+    raise self.replace(chord(parts, task_merge_scan.s(header, options["deterministic"])))
+
+
+@celery_app.task(name="ai_bom.backfill_bom_digests")
+def task_backfill_bom_digests(batch_size: int = 200, pause_seconds: float = 0.5) -> int:  # pragma: no cover - worker side
+    """Fill ``BOMVersion.digest`` for rows created before migration 0003, a batch at a time."""
+    from ai_bom.services.bom_digest import backfill_digests
+
+    return asyncio.run(backfill_digests(batch_size=batch_size, pause_seconds=pause_seconds))
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable so the upgrade is instant on large tables; existing rows are filled in by the
+    # batched, throttled ai_bom.backfill_bom_digests task (services.bom_digest.backfill_digests).
+    op.add_column('bomversion', sa.Column('digest', sa.String(length=64), nullable=True))
+    op.create_index('ix_bomversion_digest', 'bomversion', ['digest'])
+
+
+def downgrade():
+    op.drop_index('ix_bomversion_digest', table_name='bomversion')
+    op.drop_column('bomversion', 'digest')
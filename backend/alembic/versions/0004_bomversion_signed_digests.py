@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Only known for uploads from now on: the signed documents of existing rows were not kept,
+    # so their signatures report "no signed digest recorded" rather than failing as invalid.
+    op.add_column('bomversion', sa.Column('signed_digests', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade():
+    op.drop_column('bomversion', 'signed_digests')
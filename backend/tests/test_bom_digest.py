@@ -0,0 +1,87 @@
+import json
+
+from typer.testing import CliRunner
+
+from ai_bom.cli import app
+from ai_bom.db.models import BOMVersion
+from ai_bom.services.bom_digest import version_content, version_digest
+from ai_bom.services.exporter import export_bom
+from ai_bom.services.signer import (
+    MERKLE_SIGNATURE_ALGORITHM,
+    SIGNATURE_ALGORITHM,
+    ed25519_keygen,
+    signatures_valid,
+    signed_digests,
+    verify_signatures,
+    verify_signed_digests,
+)
+
+
+def _version(**overrides) -> BOMVersion:
+    fields = {
+        "version": "1.0",
+        "components": [{"component_id": "c1", "type": "model", "name": "m.pt", "fingerprint": {"algorithm": "sha256", "hash": "ab" * 32}}],
+        "evaluations": [],
+        "risk_assessment": None,
+        "signatures": None,
+        **overrides,
+    }
+    return BOMVersion(**fields)
+
+
+def test_version_digest_covers_content_not_signatures():
+    version = _version()
+    digest = version_digest("bom", None, version)
+    assert digest == version_digest("bom", None, _version(signatures=[{"key_id": "k"}]))
+    assert digest != version_digest("bom", "described", version)
+    assert digest != version_digest("bom", None, _version(version="1.1"))
+
+
+# The fields BOMIn keeps on a component, with their defaults; anything else is dropped on upload.
+_STORED_COMPONENT_FIELDS = {"component_id": None, "type": None, "name": None, "description": None, "origin": None, "fingerprint": None, "license": None, "tags": None, "metadata": None}
+
+
+def test_uploaded_signatures_verify_against_the_signed_document(tmp_path):
+    priv, _, _ = ed25519_keygen(tmp_path / "keys")
+    components = [
+        {"component_id": f"c{i}", "type": "model", "name": f"m{i}.pt", "fingerprint": {"algorithm": "sha256", "hash": "ab" * 32}, "fingerprints": [{"algorithm": "sha256", "hash": "ab" * 32}]}
+        for i in range(3)
+    ]
+    bom = {"bom_id": "b", "project_id": "p", "name": "bom", "version": "1.0", "components": components, "created_by": "ai-bom", "created_at": "2024-01-01T00:00:00+00:00", "signatures": []}
+    bom_path = tmp_path / "bom.json"
+    bom_path.write_text(json.dumps(bom))
+    runner = CliRunner()
+    assert runner.invoke(app, ["sign", str(bom_path), priv]).exit_code == 0
+    assert runner.invoke(app, ["sign", str(bom_path), priv, "--merkle"]).exit_code == 0
+    uploaded = json.loads(bom_path.read_text())
+
+    # What create_bom stores: the normalized content plus the digests of the document as sent.
+    version = _version(
+        components=[{k: c.get(k, default) for k, default in _STORED_COMPONENT_FIELDS.items()} for c in uploaded["components"]],
+        signatures=uploaded["signatures"],
+        signed_digests=signed_digests(uploaded),
+    )
+    version.digest = version_digest("bom", None, version)
+    assert set(version.signed_digests) == {SIGNATURE_ALGORITHM, MERKLE_SIGNATURE_ALGORITHM}
+
+    results = verify_signed_digests(version.signatures, version.signed_digests)
+    assert signatures_valid(results) and len(results) == 2
+    # The content digest covers different fields, so the signatures do not check against it.
+    content = {**version_content("bom", None, version), "signatures": version.signatures}
+    assert not any(r["ok"] for r in verify_signatures(content, digest_hex=version.digest))
+
+    tampered = {**version.signed_digests, SIGNATURE_ALGORITHM: version.digest}
+    assert [r["ok"] for r in verify_signed_digests(version.signatures, tampered)] == [False, True]
+    # Versions uploaded before the digests were recorded cannot be checked.
+    unrecorded = verify_signed_digests(version.signatures, {})
+    assert not signatures_valid(unrecorded) and all(r["error"].startswith("cannot verify") for r in unrecorded)
+
+
+def test_export_reuses_file_for_cache_key(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bom = {"name": "bom", "version": "1.0", "components": [], "created_at": "2024-01-01T00:00:00Z"}
+    first = export_bom(bom, "jsonld", cache_key="abc")
+    mtime = (tmp_path / first).stat().st_mtime_ns
+    assert export_bom({**bom, "created_at": "later"}, "jsonld", cache_key="abc") == first
+    assert (tmp_path / first).stat().st_mtime_ns == mtime
+    assert export_bom(bom, "jsonld", cache_key="def") != first
@@ -0,0 +1,136 @@
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+from ai_bom.services.cache import FingerprintCache
+from ai_bom.services.fingerprint import merkle_method
+from ai_bom.services.remote_cache import LocalRemoteStore, RemoteFingerprintCache
+from ai_bom.services.scanner import ScanOptions, scan_repository
+
+
+def test_rescan_hits_cache_and_evicts_deleted(tmp_path: Path):
+    (tmp_path / "model.pt").write_bytes(b"abc")
+    (tmp_path / "data.csv").write_text("a,b\n1,2\n")
+    with FingerprintCache.for_directory(tmp_path) as cache:
+        first = scan_repository(str(tmp_path), cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    with FingerprintCache.for_directory(tmp_path) as cache:
+        second = scan_repository(str(tmp_path), cache=cache)
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert [c["fingerprint"] for c in first["components"]] == [c["fingerprint"] for c in second["components"]]
+
+    (tmp_path / "data.csv").unlink()
+    with FingerprintCache.for_directory(tmp_path) as cache:
+        scan_repository(str(tmp_path), cache=cache)
+        rows = cache._conn.execute("SELECT path FROM fingerprints").fetchall()
+    assert rows == [("model.pt",)]
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def test_git_index_walk_matches_walk_files_order(tmp_path: Path, monkeypatch):
+    from ai_bom.core.git import read_git_index
+    from ai_bom.services import walker
+
+    _git(tmp_path, "init", "-q")
+    for rel in ("b.pt", "a/z.pt", "a/b/c.pt", "a/b.pt", "c.pt", "vendor/x.pt", "node_modules/y.pt"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_bytes(rel.encode())
+    (tmp_path / ".gitignore").write_text("vendor/\n")
+    _git(tmp_path, "add", "-f", ".")
+    for rel in ("a/new.pt", "untracked/d.pt"):
+        (tmp_path / rel).parent.mkdir(exist_ok=True)
+        (tmp_path / rel).write_bytes(b"new")
+    index = read_git_index(tmp_path)
+    assert index is not None
+
+    def rels(entries) -> list[str]:
+        return [e.rel for e in entries]
+
+    everything = rels(walker.walk_files(tmp_path, {".pt"}))
+    assert everything == ["b.pt", "c.pt", "a/b.pt", "a/new.pt", "a/z.pt", "a/b/c.pt", "untracked/d.pt"]
+    assert rels(walker.walk_git_index(tmp_path, index, {".pt"}, include_untracked=True)) == everything
+    # Without untracked files nothing is listed: the index supplies the tree.
+    monkeypatch.setattr(walker.os, "scandir", None)
+    assert rels(walker.walk_git_index(tmp_path, index, {".pt"})) == ["b.pt", "c.pt", "a/b.pt", "a/z.pt", "a/b/c.pt"]
+
+
+def test_git_index_scan_reuses_blob_fingerprints_across_clones(tmp_path: Path):
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    _git(origin, "init", "-q")
+    (origin / "model.pt").write_bytes(b"weights")
+    # Back-date the file so the index entry is not racily clean.
+    os.utime(origin / "model.pt", (1_000_000_000, 1_000_000_000))
+    _git(origin, "add", "model.pt")
+    _git(origin, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-m", "init")
+    (origin / "extra.bin").write_bytes(b"untracked")
+
+    with FingerprintCache.for_directory(origin) as cache:
+        bom = scan_repository(str(origin), cache=cache, use_git_index=True, include_untracked=True)
+    assert sorted(c["name"] for c in bom["components"]) == ["extra.bin", "model.pt"]
+    assert bom["components"][0]["origin"]["git"]["commit"]
+
+    clone = tmp_path / "clone"
+    _git(tmp_path, "clone", "-q", str(origin), str(clone))
+    os.utime(clone / "model.pt", (1_000_000_000, 1_000_000_000))
+    _git(clone, "update-index", "-q", "--refresh")
+    (clone / ".ai-bom").mkdir()
+    shutil.copy(origin / ".ai-bom" / "fingerprints.db", clone / ".ai-bom" / "fingerprints.db")
+    with FingerprintCache.for_directory(clone) as cache:
+        cloned = scan_repository(str(clone), cache=cache, use_git_index=True, include_untracked=False)
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert [c["fingerprint"] for c in cloned["components"]] == [
+        c["fingerprint"] for c in bom["components"] if c["name"] == "model.pt"
+    ]
+
+
+def test_remote_cache_shares_full_digests_between_runners(tmp_path: Path):
+    store = LocalRemoteStore(tmp_path / "remote")
+    runners = []
+    for name in ("runner-a", "runner-b"):
+        repo = tmp_path / name
+        repo.mkdir()
+        (repo / "model.pt").write_bytes(b"checkpoint" * 10_000)
+        runners.append(repo)
+
+    first = RemoteFingerprintCache(store, min_bytes=0)
+    bom_a = scan_repository(str(runners[0]), remote_cache=first)
+    assert (first.hits, first.misses) == (0, 1)
+
+    second = RemoteFingerprintCache(store, min_bytes=0, verify_fraction=0)
+    bom_b = scan_repository(str(runners[1]), remote_cache=second)
+    assert (second.hits, second.misses) == (1, 0)
+    # Hits are tagged; only re-hashed ones are marked verified.
+    assert bom_b["components"][0]["fingerprint"] == {**bom_a["components"][0]["fingerprint"], "source": "remote-cache"}
+    checked = RemoteFingerprintCache(store, min_bytes=0, verify_fraction=1.0)
+    bom_v = scan_repository(str(runners[1]), remote_cache=checked)
+    assert bom_v["components"][0]["fingerprint"]["verified"] is True
+
+    # A poisoned entry is caught by re-verification and replaced.
+    (entry,) = (tmp_path / "remote").rglob("*.json")
+    entry.write_text(entry.read_text().replace(bom_a["components"][0]["fingerprint"]["hash"], "0" * 64))
+    verifying = RemoteFingerprintCache(store, min_bytes=0, verify_fraction=1.0)
+    bom_c = scan_repository(str(runners[1]), remote_cache=verifying)
+    assert (verifying.verified, verifying.mismatches) == (1, 1)
+    assert bom_c["components"][0]["fingerprint"] == bom_a["components"][0]["fingerprint"]
+
+    # Only whole-file digests are shared; chunked and archive results depend on local state.
+    full = ScanOptions(dataset_strategy="full", algorithms=["sha256", "sha512"])
+    cdc = ScanOptions(dataset_strategy="cdc", scan_archives=True)
+    assert verifying.accepts(full.whole_file_method(), 1)
+    assert verifying.accepts(full.dataset_methods()("x.csv"), 1)
+    assert verifying.accepts(merkle_method(1024), 1)
+    assert not verifying.accepts(cdc.dataset_methods()("x.csv"), 1)
+    assert not verifying.accepts(cdc.archive_method(), 1)
+    assert RemoteFingerprintCache(store).verify_fraction > 0
+
+    expired = RemoteFingerprintCache(store, min_bytes=0, ttl_seconds=0)
+    time.sleep(0.01)
+    scan_repository(str(runners[1]), remote_cache=expired)
+    assert (expired.hits, expired.misses) == (0, 1)
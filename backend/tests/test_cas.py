@@ -0,0 +1,89 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from ai_bom.schemas.bom import Fingerprint
+from ai_bom.services.scanner import scan_repository
+
+
+def test_trusted_digests_from_lfs_hf_and_dvc(tmp_path: Path):
+    weights = b"weights" * 100
+    oid = hashlib.sha256(weights).hexdigest()
+    (tmp_path / "lfs.pt").write_text(
+        f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {len(weights)}\n"
+    )
+    blobs = tmp_path / "hub" / "models--org--m" / "blobs"
+    snapshot = tmp_path / "hub" / "models--org--m" / "snapshots" / "rev"
+    blobs.mkdir(parents=True)
+    snapshot.mkdir(parents=True)
+    (blobs / oid).write_bytes(weights)
+    os.symlink(f"../../blobs/{oid}", snapshot / "model.bin")
+    data = b"a,b\n1,2\n"
+    (tmp_path / "train.csv").write_bytes(data)
+    (tmp_path / "train.csv.dvc").write_text(
+        f"outs:\n- md5: {hashlib.md5(data).hexdigest()}\n  size: {len(data)}\n  hash: md5\n  path: train.csv\n"
+    )
+
+    bom = scan_repository(str(tmp_path), cas_verify_fraction=1.0)
+    found = {c["name"]: c["fingerprint"] for c in bom["components"]}
+    assert found["lfs.pt"] == {"algorithm": "sha256", "hash": oid, "source": "git-lfs"}
+    assert found["hub/models--org--m/snapshots/rev/model.bin"]["verified"] is True
+    assert found["train.csv"]["source"] == "dvc" and found["train.csv"]["verified"] is True
+    for fingerprint in found.values():
+        Fingerprint(**fingerprint)
+
+    (tmp_path / "train.csv").write_bytes(b"tampered")
+    with pytest.raises(ValueError):
+        scan_repository(str(tmp_path), cas_verify_fraction=1.0)
+
+
+def test_dvc_outs_outside_the_scan_root_are_skipped(tmp_path: Path):
+    repo = tmp_path / "repo"
+    (repo / "sub").mkdir(parents=True)
+    data = b"a,b\n1,2\n"
+    (repo / "sub" / "train.csv").write_bytes(data)
+    md5 = hashlib.md5(data).hexdigest()
+    outs = "".join(f"- md5: {md5}\n  path: {path}\n" for path in ("train.csv", "../../outside.csv", "/etc/passwd"))
+    (repo / "sub" / "train.csv.dvc").write_text(f"outs:\n{outs}")
+
+    bom = scan_repository(str(repo))
+    assert [c["name"] for c in bom["components"]] == ["sub/train.csv"]
+    assert bom["components"][0]["fingerprint"]["source"] == "dvc"
+
+
+def test_verify_fingerprints_checks_cas_sources(tmp_path: Path):
+    from ai_bom.services.fingerprint_verify import verify_fingerprints
+
+    weights = b"weights" * 100
+    oid = hashlib.sha256(weights).hexdigest()
+    pointer = tmp_path / "model.safetensors"
+    pointer.write_text(f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {len(weights)}\n")
+    blobs = tmp_path / "hub" / "blobs"
+    blobs.mkdir(parents=True)
+    (blobs / oid).write_bytes(weights)
+    os.symlink(f"blobs/{oid}", tmp_path / "hub" / "model.bin")
+    data = b"a,b\n1,2\n"
+    (tmp_path / "train.csv").write_bytes(data)
+    (tmp_path / "train.csv.dvc").write_text(f"outs:\n- md5: {hashlib.md5(data).hexdigest()}\n  hash: md5\n  path: train.csv\n")
+    components = scan_repository(str(tmp_path))["components"]
+
+    # Pointer checkout without the object: the pointer's oid is compared, nothing is hashed.
+    report = verify_fingerprints(components, root=tmp_path)
+    assert report["matched"] == 2 and report["skipped"] == 1 and not report["mismatched"]
+    assert report["bytes"] == len(weights)
+
+    lfs_object = Path(tmp_path, ".git", "lfs", "objects", oid[:2], oid[2:4], oid)
+    lfs_object.parent.mkdir(parents=True)
+    lfs_object.write_bytes(weights)
+    assert verify_fingerprints(components, root=tmp_path)["bytes"] == 2 * len(weights)
+    lfs_object.write_bytes(b"corrupt")
+    assert [m["name"] for m in verify_fingerprints(components, root=tmp_path)["mismatched"]] == ["model.safetensors"]
+
+    pointer.write_text(f"version https://git-lfs.github.com/spec/v1\noid sha256:{'cd' * 32}\nsize 1\n")
+    mismatched = verify_fingerprints(components, root=tmp_path)["mismatched"]
+    assert mismatched[0]["expected"] == {"sha256": oid} and mismatched[0]["actual"] == {"sha256": "cd" * 32}
+    # A smudged checkout holds the content itself.
+    pointer.write_bytes(weights)
+    assert not verify_fingerprints(components, root=tmp_path)["mismatched"]
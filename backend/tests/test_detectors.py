@@ -0,0 +1,50 @@
+import hashlib
+import json
+from pathlib import Path
+
+from ai_bom.services import detectors
+from ai_bom.services.detectors import Detector, DetectorRegistry
+from ai_bom.services.scanner import scan_repository
+
+
+def _safetensors(header: dict) -> bytes:
+    data = json.dumps(header).encode()
+    return len(data).to_bytes(8, "little") + data + b"\0" * 64
+
+
+def test_scan_detects_formats_and_sniffs_suffixless_files(tmp_path: Path):
+    weights = _safetensors({"w": {"dtype": "F32", "shape": [4, 4], "data_offsets": [0, 64]}})
+    (tmp_path / "model.safetensors").write_bytes(weights)
+    (tmp_path / "weights").write_bytes(weights)
+    (tmp_path / "model.gguf").write_bytes(b"GGUF" + b"\0" * 32)
+    (tmp_path / "table.arrow").write_bytes(b"ARROW1\0\0")
+    (tmp_path / "LICENSE").write_text("MIT\n")
+
+    bom = scan_repository(str(tmp_path))
+    found = {c["name"]: (c["type"], c["metadata"]["format"], c["fingerprint"]["hash"]) for c in bom["components"]}
+    assert found == {
+        "model.gguf": ("model", "gguf", hashlib.sha256(b"GGUF" + b"\0" * 32).hexdigest()),
+        "model.safetensors": ("model", "safetensors", hashlib.sha256(weights).hexdigest()),
+        "table.arrow": ("dataset", "arrow", hashlib.sha256(b"ARROW1\0\0").hexdigest()),
+        "weights": ("model", "safetensors", hashlib.sha256(weights).hexdigest()),
+    }
+
+
+def test_registry_reads_each_file_once(tmp_path: Path, monkeypatch):
+    reads = []
+    original = detectors.read_head
+    monkeypatch.setattr(detectors, "read_head", lambda path, size=detectors.SNIFF_BYTES: reads.append(path) or original(path, size))
+    many = [Detector(f"fmt{i}", "model", (".bin",), magic=(f"MAGIC{i:02d}:".encode(),), content_required=True) for i in range(40)]
+    registry = DetectorRegistry([*many, Detector("fallback", "artifact", (".bin",))])
+    path = tmp_path / "x.bin"
+    path.write_bytes(b"MAGIC39: payload")
+
+    detection = registry.classify(str(path))
+    assert detection.detector.name == "fmt39" and detection.head == b"MAGIC39: payload"
+    path.write_bytes(b"other")
+    assert registry.classify(str(path)).detector.name == "fallback"
+    assert len(reads) == 2
+
+    registry.register(Detector("preferred", "dataset", (".bin",), priority=10))
+    assert registry.classify(str(path)).detector.name == "preferred"
+    assert len(reads) == 2
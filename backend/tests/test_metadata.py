@@ -0,0 +1,125 @@
+import json
+import struct
+from pathlib import Path
+
+from ai_bom.services.metadata import gguf_metadata, onnx_metadata, parquet_metadata, safetensors_metadata
+from ai_bom.services.scanner import scan_repository
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        out.append(b | (0x80 if n else 0))
+        if not n:
+            return bytes(out)
+
+
+def _pb(field: int, value: int | bytes) -> bytes:
+    if isinstance(value, int):
+        return _varint(field << 3) + _varint(value)
+    return _varint(field << 3 | 2) + _varint(len(value)) + value
+
+
+def _zz(n: int) -> bytes:
+    return _varint((n << 1) ^ (n >> 63))
+
+
+def _gguf_str(s: str) -> bytes:
+    return struct.pack("<Q", len(s)) + s.encode()
+
+
+def test_safetensors_header_of_sparse_file(tmp_path: Path):
+    header = {
+        "__metadata__": {"format": "pt"},
+        "a": {"dtype": "F16", "shape": [1024, 1024], "data_offsets": [0, 2 * 1024 * 1024]},
+        "b": {"dtype": "F32", "shape": [10], "data_offsets": [0, 40]},
+    }
+    raw = json.dumps(header).encode()
+    path = tmp_path / "big.safetensors"
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(raw)) + raw)
+        f.truncate(8 * 1024**3)
+    meta = safetensors_metadata(path)
+    assert meta["tensor_count"] == 2
+    assert meta["parameter_count"] == 1024 * 1024 + 10
+    assert meta["dtypes"] == {"F16": 1, "F32": 1}
+    assert meta["user_metadata"] == {"format": "pt"}
+
+
+def test_gguf_kv_header_stops_at_vocabulary(tmp_path: Path):
+    tokens = b"".join(_gguf_str(f"tok{i}") for i in range(5000))
+    data = (
+        b"GGUF"
+        + struct.pack("<IQQ", 3, 291, 4)
+        + _gguf_str("general.architecture") + struct.pack("<I", 8) + _gguf_str("llama")
+        + _gguf_str("llama.block_count") + struct.pack("<II", 4, 32)
+        + _gguf_str("llama.rope.freqs") + struct.pack("<IIQ", 9, 6, 3) + struct.pack("<3f", 1, 2, 3)
+        + _gguf_str("tokenizer.ggml.tokens") + struct.pack("<IIQ", 9, 8, 5000) + tokens
+    )
+    path = tmp_path / "m.gguf"
+    path.write_bytes(data)
+    meta = gguf_metadata(path)
+    assert meta["version"] == 3 and meta["tensor_count"] == 291
+    assert meta["kv"]["general.architecture"] == "llama"
+    assert meta["kv"]["llama.block_count"] == 32
+    assert meta["kv"]["llama.rope.freqs"] == {"type": "float32", "length": 3}
+    assert meta["kv"]["tokenizer.ggml.tokens"] == {"type": "string", "length": 5000}
+    assert meta["kv_truncated"] is True
+
+
+def test_onnx_graph_inputs_and_outputs(tmp_path: Path):
+    def value_info(name: str, elem: int, dims: list) -> bytes:
+        shape = b"".join(_pb(1, _pb(1, d) if isinstance(d, int) else _pb(2, d.encode())) for d in dims)
+        return _pb(1, name.encode()) + _pb(2, _pb(1, _pb(1, elem) + _pb(2, shape)))
+
+    graph = (
+        _pb(1, b"node-a")
+        + _pb(1, b"node-b")
+        + _pb(2, b"main")
+        + _pb(5, b"\0" * 100_000)
+        + _pb(11, value_info("x", 1, ["N", 3, 224, 224]))
+        + _pb(12, value_info("y", 7, ["N"]))
+    )
+    model = _pb(1, 8) + _pb(2, b"pytorch") + _pb(3, b"2.3") + _pb(7, graph) + _pb(8, _pb(1, b"") + _pb(2, 17))
+    path = tmp_path / "m.onnx"
+    path.write_bytes(model)
+    meta = onnx_metadata(path)
+    assert meta["ir_version"] == 8 and meta["producer_name"] == "pytorch"
+    assert meta["opset"] == {"ai.onnx": 17}
+    assert meta["node_count"] == 2 and meta["initializer_count"] == 1
+    assert meta["inputs"] == [{"name": "x", "elem_type": "float", "shape": ["N", 3, 224, 224]}]
+    assert meta["outputs"] == [{"name": "y", "elem_type": "int64", "shape": ["N"]}]
+
+
+def test_parquet_footer_and_scan_metadata(tmp_path: Path):
+    def name(field_delta: int, text: str) -> bytes:
+        return bytes([field_delta << 4 | 8]) + _varint(len(text)) + text.encode()
+
+    root = name(4, "schema") + bytes([0x15]) + _zz(2) + b"\0"
+    col_id = bytes([0x15]) + _zz(2) + bytes([0x25]) + _zz(0) + name(1, "id") + b"\0"
+    col_text = bytes([0x15]) + _zz(6) + bytes([0x25]) + _zz(1) + name(1, "text") + b"\0"
+    footer = (
+        bytes([0x15]) + _zz(1)
+        + bytes([0x19, 0x3C]) + root + col_id + col_text
+        + bytes([0x16]) + _zz(100)
+        + bytes([0x19, 0x0C])
+        + name(2, "parquet-cpp-arrow version 15.0.0")
+        + b"\0"
+    )
+    path = tmp_path / "data.parquet"
+    path.write_bytes(b"PAR1" + b"\0" * 1000 + footer + struct.pack("<I", len(footer)) + b"PAR1")
+    meta = parquet_metadata(path)
+    assert meta["version"] == 1 and meta["num_rows"] == 100 and meta["num_row_groups"] == 0
+    assert meta["columns"] == [
+        {"name": "id", "type": "INT64", "repetition": "REQUIRED"},
+        {"name": "text", "type": "BYTE_ARRAY", "repetition": "OPTIONAL"},
+    ]
+    assert meta["created_by"].startswith("parquet-cpp-arrow")
+
+    (tmp_path / "broken.gguf").write_bytes(b"GGUF\x01\0\0\0")
+    components = {c["name"]: c for c in scan_repository(str(tmp_path))["components"]}
+    assert components["data.parquet"]["metadata"]["num_rows"] == 100
+    assert components["data.parquet"]["metadata"]["format"] == "parquet"
+    assert "metadata_error" in components["broken.gguf"]["metadata"]
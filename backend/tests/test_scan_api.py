@@ -0,0 +1,126 @@
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_bom.api.v1.scan import router
+from ai_bom.core.config import get_settings
+from ai_bom.services import results
+from ai_bom.services.results import LocalResultStore, load_result, store_result
+from ai_bom.services.scan_jobs import ThreadScanJobs, get_scan_jobs
+
+
+def _client(jobs: ThreadScanJobs) -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_scan_jobs] = lambda: jobs
+    return TestClient(app)
+
+
+def _wait(client: TestClient, job_id: str) -> dict:
+    for _ in range(200):
+        job = client.get(f"/api/v1/scan/{job_id}").json()
+        if job["status"] not in ("pending", "running"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("scan job did not finish")
+
+
+def test_scan_job_reports_progress_and_result(tmp_path: Path):
+    (tmp_path / "model.pt").write_bytes(b"abc")
+    (tmp_path / "data.csv").write_text("a,b\n1,2\n")
+    jobs = ThreadScanJobs()
+    client = _client(jobs)
+    response = client.post("/api/v1/scan", json={"dir": str(tmp_path), "options": {"jobs": 1}})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    job = _wait(client, job_id)
+    assert job["status"] == "succeeded"
+    assert job["progress"]["components"] == 2
+    assert job["progress"]["bytes"] == 3 + 8
+    assert "result" not in job
+    result = client.get(f"/api/v1/scan/{job_id}/result").json()
+    assert sorted(c["name"] for c in result["components"]) == ["data.csv", "model.pt"]
+
+    with client.stream("GET", f"/api/v1/scan/{job_id}/events") as events:
+        body = "".join(events.iter_text())
+    assert body.startswith("event: done\n")
+    assert '"result"' not in body
+    assert client.get("/api/v1/scan/missing").status_code == 404
+    jobs.shutdown()
+
+
+def test_scan_jobs_are_capped_by_server_setting(tmp_path: Path):
+    jobs = ThreadScanJobs()
+    client = _client(jobs)
+    settings = get_settings()
+    max_jobs = settings.scan_max_jobs
+    for requested, expected in ((10_000, max_jobs), (None, max_jobs), (1, 1)):
+        job_id = client.post("/api/v1/scan", json={"dir": str(tmp_path), "options": {"jobs": requested}}).json()["job_id"]
+        assert jobs._jobs[job_id].options.jobs == expected
+    assert client.post("/api/v1/scan", json={"dir": str(tmp_path), "options": {"jobs": 0}}).status_code == 422
+
+    options = {"scan_archives": True, "archive_max_bytes": 64 * 1024**3, "archive_max_depth": 50}
+    job_id = client.post("/api/v1/scan", json={"dir": str(tmp_path), "options": options}).json()["job_id"]
+    scan_options = jobs._jobs[job_id].options
+    assert scan_options.scan_archives
+    assert scan_options.archive_max_bytes == settings.scan_max_archive_bytes
+    assert scan_options.archive_max_depth == settings.scan_max_archive_depth
+    # Only allow-listed options are accepted.
+    for options in ({"dataset_strategy": "full"}, {"algorithms": ["sha256", "sha512"]}, {"merkle_chunk_size": 1}):
+        assert client.post("/api/v1/scan", json={"dir": str(tmp_path), "options": options}).status_code == 422
+    jobs.shutdown()
+
+
+def test_finished_scan_jobs_expire(tmp_path: Path):
+    jobs = ThreadScanJobs(ttl_seconds=60)
+    client = _client(jobs)
+    job_id = client.post("/api/v1/scan", json={"dir": str(tmp_path)}).json()["job_id"]
+    assert _wait(client, job_id)["status"] == "succeeded"
+    jobs._jobs[job_id].finished_at -= 61
+    assert client.get(f"/api/v1/scan/{job_id}").status_code == 404
+    jobs.shutdown()
+
+
+def test_cancel_pending_scan_job(tmp_path: Path):
+    jobs = ThreadScanJobs(max_workers=1)
+    client = _client(jobs)
+    # Occupy the only worker so the next job stays pending.
+    blocker = jobs._pool.submit(time.sleep, 0.3)
+    job_id = client.post("/api/v1/scan", json={"dir": str(tmp_path)}).json()["job_id"]
+    assert client.delete(f"/api/v1/scan/{job_id}").json()["status"] == "cancelled"
+    blocker.result()
+    assert _wait(client, job_id)["status"] == "cancelled"
+    jobs.shutdown()
+
+
+class _StubJobs:
+    def __init__(self, ref: dict) -> None:
+        self.ref = ref
+
+    def get(self, job_id: str, include_result: bool = True) -> dict:
+        return {"job_id": job_id, "status": "succeeded", "result_ref": self.ref, "result": None}
+
+
+def test_result_endpoint_streams_stored_payload(tmp_path: Path, monkeypatch):
+    store = LocalResultStore(tmp_path / "results")
+    monkeypatch.setattr(results, "get_result_store", lambda: store)
+    bom = {"name": "x", "components": [{"name": f"m{i}.pt"} for i in range(500)]}
+    ref = store_result(bom, "scans")
+    assert results.is_result_ref(ref) and ref["stored_size"] < ref["size"]
+    assert load_result(ref) == bom
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_scan_jobs] = lambda: _StubJobs(ref)
+    client = TestClient(app)
+    plain = client.get("/api/v1/scan/j/result", headers={"Accept-Encoding": "identity"})
+    assert plain.headers.get("content-encoding") is None
+    assert plain.json() == bom
+    zipped = client.get("/api/v1/scan/j/result", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.json() == bom
+    etag = zipped.headers["etag"]
+    assert client.get("/api/v1/scan/j/result", headers={"If-None-Match": etag}).status_code == 304
@@ -1,6 +1,12 @@
+import hashlib
 from pathlib import Path
 
-from ai_bom.services.scanner import scan_repository
+from ai_bom.core.utils import aggregate_bom_hash, canonical_json, merkle_verify_file
+from ai_bom.schemas.bom import Component, Fingerprint
+from ai_bom.services.cache import FingerprintCache
+from ai_bom.services.identity import ensure_project_config
+from ai_bom.services.partition import merge_partitions, partition_scan, scan_partition
+from ai_bom.services.scanner import iter_components, scan_repository
 
 
 def test_scan_creates_bom(tmp_path: Path):
@@ -11,3 +17,395 @@ def test_scan_creates_bom(tmp_path: Path):
     assert result["name"] == tmp_path.name
     assert any(c["type"] == "model" for c in result["components"])  # type: ignore[index]
 
+
+
+def test_parallel_scan_keeps_walk_order(tmp_path: Path):
+    for i in range(20):
+        (tmp_path / f"m{i}.pt").write_bytes(bytes([i]) * (i + 1) * 1000)
+    serial = scan_repository(str(tmp_path), jobs=1)
+    parallel = scan_repository(str(tmp_path), jobs=8)
+    assert [(c["name"], c["fingerprint"]) for c in serial["components"]] == [
+        (c["name"], c["fingerprint"]) for c in parallel["components"]
+    ]
+
+
+def test_walker_prunes_ignored_directories(tmp_path: Path):
+    for d in (".git", "node_modules", "venv_custom", "ckpt", "skip"):
+        (tmp_path / d).mkdir()
+        (tmp_path / d / "w.pt").write_bytes(b"x")
+    (tmp_path / "venv_custom" / "pyvenv.cfg").write_text("home = /usr")
+    (tmp_path / ".gitignore").write_text("ckpt/\n*.pt\n")
+    (tmp_path / ".ai-bombignore").write_text("skip/\n")
+    (tmp_path / "top.pt").write_bytes(b"y")
+    names = sorted(c["name"] for c in scan_repository(str(tmp_path))["components"])
+    # .gitignore prunes directories only; git-ignored weights at the top level are still tracked
+    assert names == ["top.pt"]
+
+
+def test_iter_components_streams_in_walk_order(tmp_path: Path):
+    for i in range(5):
+        (tmp_path / f"d{i}.csv").write_text(f"{i}\n")
+    stream = iter_components(str(tmp_path), jobs=2)
+    first = next(stream)
+    assert first["name"] == "d0.csv" and first["fingerprint"]["hash"]
+    assert [c["name"] for c in stream] == [f"d{i}.csv" for i in range(1, 5)]
+
+
+def test_merkle_fingerprint_detects_changed_chunk(tmp_path: Path):
+    model = tmp_path / "model.pt"
+    model.write_bytes(b"a" * 5000)
+    bom = scan_repository(str(tmp_path), model_algorithm="sha256-merkle", merkle_chunk_size=1024, merkle_keep_chunks=True)
+    fingerprint = Fingerprint(**bom["components"][0]["fingerprint"])
+    assert fingerprint.chunk_size == 1024 and len(fingerprint.chunks or []) == 5
+    assert merkle_verify_file(model, fingerprint.model_dump()) == []
+    model.write_bytes(b"a" * 3000 + b"b" + b"a" * 1999)
+    assert merkle_verify_file(model, fingerprint.model_dump()) == [2]
+
+
+def test_merkle_scan_hashes_chunks_on_the_scan_threads(tmp_path: Path, monkeypatch):
+    from ai_bom.core import utils
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("merkle chunks hashed on an extra thread pool")
+
+    monkeypatch.setattr(utils, "ThreadPoolExecutor", no_pool)
+    monkeypatch.setattr(utils.os, "cpu_count", lambda: 8)
+    (tmp_path / "model.pt").write_bytes(b"a" * 5000)
+    bom = scan_repository(str(tmp_path), model_algorithm="sha256-merkle", merkle_chunk_size=1024, jobs=1)
+    assert bom["components"][0]["fingerprint"]["algorithm"] == "sha256-merkle"
+
+
+def test_hash_backends_agree(tmp_path: Path):
+    data = bytes(range(256)) * 9000
+    (tmp_path / "model.pt").write_bytes(data)
+    digests = {
+        backend: scan_repository(str(tmp_path), hash_backend=backend, drop_page_cache=True)["components"][0]["fingerprint"]
+        for backend in ("readinto", "mmap")
+    }
+    assert digests["readinto"] == digests["mmap"] == {"algorithm": "sha256", "hash": hashlib.sha256(data).hexdigest()}
+
+
+def test_dataset_strategies_are_recorded_and_detect_tail_edits(tmp_path: Path):
+    data = tmp_path / "big" / "data.csv"
+    data.parent.mkdir()
+    data.write_bytes(b"x" * 3_000_000)
+    (tmp_path / "small.csv").write_text("a,b\n")
+
+    def scan() -> dict:
+        bom = scan_repository(str(tmp_path), dataset_strategy_rules=[("big/*", "sampled")])
+        return {c["name"]: c["fingerprint"] for c in bom["components"]}
+
+    before = scan()
+    assert before["small.csv"]["strategy"] == "head"
+    assert before["big/data.csv"]["strategy"] == "sampled"
+    assert before["big/data.csv"]["params"] == {"block_size": 65536, "samples": 16}
+    Fingerprint(**before["big/data.csv"])
+
+    with open(data, "ab") as f:
+        f.write(b"appended")
+    assert scan()["big/data.csv"]["hash"] != before["big/data.csv"]["hash"]
+
+
+def test_extra_algorithms_are_computed_in_the_same_pass(tmp_path: Path, monkeypatch):
+    payload = b"weights" * 100_000
+    (tmp_path / "model.bin").write_bytes(payload)
+    (tmp_path / "rows.csv").write_bytes(b"a,b\n" * 1000)
+    opened: list[str] = []
+    real_open = open
+
+    def counting_open(file, *args, **kwargs):
+        if str(file).endswith("model.bin"):
+            opened.append(str(file))
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    bom = scan_repository(str(tmp_path), algorithms=["sha256", "sha512", "blake2b"], sniff_no_suffix=False)
+    monkeypatch.undo()
+    components = {c["name"]: c for c in bom["components"]}
+
+    model = components["model.bin"]
+    assert model["fingerprint"] == {"algorithm": "sha256", "hash": hashlib.sha256(payload).hexdigest()}
+    assert model["fingerprints"] == [
+        {"algorithm": "sha512", "hash": hashlib.sha512(payload).hexdigest()},
+        {"algorithm": "blake2b", "hash": hashlib.blake2b(payload).hexdigest()},
+    ]
+    assert len(opened) == 1
+    dataset = components["rows.csv"]
+    assert [f["algorithm"] for f in dataset["fingerprints"]] == ["sha512", "blake2b"]
+    assert all(f["strategy"] == "head" for f in dataset["fingerprints"])
+    Component.model_validate({**model, "origin": None})
+
+
+def test_deterministic_scans_are_byte_identical(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    (tmp_path / "b_model.pt").write_bytes(b"weights")
+    (tmp_path / "a_rows.csv").write_text("a,b\n")
+    (tmp_path / "requirements.txt").write_text("torch\n")
+    project_id = ensure_project_config(tmp_path)
+
+    first = scan_repository(str(tmp_path), deterministic=True)
+    with FingerprintCache.for_directory(tmp_path) as cache:
+        second = scan_repository(str(tmp_path), cache=cache, deterministic=True, jobs=1)
+    assert canonical_json(first) == canonical_json(second)
+    assert aggregate_bom_hash(first) == aggregate_bom_hash(second)
+    assert first["project_id"] == project_id
+    assert first["created_at"] == "2023-11-14T22:13:20+00:00"
+    assert [c["name"] for c in first["components"]] == ["a_rows.csv", "b_model.pt", "requirements.txt"]
+
+    (tmp_path / "b_model.pt").write_bytes(b"retrained")
+    third = scan_repository(str(tmp_path), deterministic=True)
+    ids = {c["name"]: c["component_id"] for c in first["components"]}
+    assert {c["name"]: c["component_id"] for c in third["components"]} != ids
+    assert third["components"][0]["component_id"] == ids["a_rows.csv"]
+    assert third["bom_id"] != first["bom_id"]
+
+
+def test_deterministic_scans_do_not_depend_on_checkout_or_user(tmp_path: Path, monkeypatch):
+    import io
+    import zipfile
+
+    boms = []
+    for parent, user in (("ci", "runner"), ("home", "alice")):
+        root = tmp_path / parent / "repo"
+        (root / "data").mkdir(parents=True)
+        (root / "model.pt").write_bytes(b"weights")
+        (root / "data" / "rows.csv").write_text("a,b\n")
+        (root / "requirements.txt").write_text("torch\n")
+        bundle = io.BytesIO()
+        with zipfile.ZipFile(bundle, "w") as zf:
+            zf.writestr("inner.gguf", b"GGUF")
+        (root / "bundle.zip").write_bytes(bundle.getvalue())
+        monkeypatch.setenv("USER", user)
+        boms.append(scan_repository(str(root), deterministic=True, scan_archives=True))
+    assert canonical_json(boms[0]) == canonical_json(boms[1])
+    assert boms[0]["created_by"] == "ai-bom"
+    paths = {c["name"]: c["origin"]["path"] for c in boms[0]["components"]}
+    assert paths == {
+        "bundle.zip": "bundle.zip",
+        "bundle.zip!/inner.gguf": "bundle.zip",
+        "data/rows.csv": "data/rows.csv",
+        "model.pt": "model.pt",
+        "requirements.txt": "requirements.txt",
+    }
+    assert scan_repository(str(tmp_path / "ci" / "repo"))["created_by"] == "alice"
+
+
+def test_cdc_strategy_reports_changed_bytes_on_rescan(tmp_path: Path):
+    import random
+
+    rng = random.Random(7)
+    rows = [f"{i},{rng.random():.12f},{rng.getrandbits(64):x}\n".encode() for i in range(60_000)]
+    data = tmp_path / "rows.csv"
+    data.write_bytes(b"".join(rows))
+    cache = FingerprintCache.for_directory(tmp_path)
+
+    def scan() -> dict:
+        components = iter_components(str(tmp_path), cache, dataset_strategy="cdc", dataset_cdc_avg_size=64 * 1024)
+        return {c["name"]: c for c in components}
+
+    first = scan()["rows.csv"]
+    assert first["fingerprint"]["strategy"] == "cdc"
+    assert first["fingerprint"]["algorithm"] == "sha256-cdc"
+    assert first["metadata"]["changes"]["bytes_changed"] == data.stat().st_size
+    Fingerprint(**first["fingerprint"])
+
+    # Insert a row near the start: every chunk after the edited one re-aligns.
+    rows.insert(100, b"inserted,0,0\n")
+    data.write_bytes(b"".join(rows))
+    second = scan()["rows.csv"]
+    changes = second["metadata"]["changes"]
+    assert second["fingerprint"]["hash"] != first["fingerprint"]["hash"]
+    assert changes["chunks_reused"] >= changes["chunk_count"] - 2
+    assert changes["bytes_changed"] < 256 * 1024
+    assert "changes" not in scan()["rows.csv"]["metadata"]
+    cache.close()
+
+
+def test_cdc_rescan_reuses_unchanged_chunks(tmp_path: Path, monkeypatch):
+    import random
+
+    from ai_bom.services import cdc
+
+    rng = random.Random(3)
+    rows = [f"{i},{rng.random():.12f},{rng.getrandbits(64):x}\n".encode() for i in range(40_000)]
+    data = tmp_path / "rows.csv"
+    data.write_bytes(b"".join(rows))
+    params = cdc.cdc_params(16 * 1024)
+    _, first = cdc.cdc_chunks(data, **params)
+
+    searched: list[int] = []
+    next_cut = cdc.next_cut
+    monkeypatch.setattr(cdc, "next_cut", lambda mm, start, *args: searched.append(start) or next_cut(mm, start, *args))
+    for edit in ("append", "insert", "delete"):
+        edited = list(rows)
+        if edit == "append":
+            edited += [b"appended,0,0\n"] * 50
+        elif edit == "insert":
+            edited.insert(20_000, b"inserted,0,0\n")
+        else:
+            del edited[30_000]
+        data.write_bytes(b"".join(edited))
+        fresh = cdc.cdc_chunks(data, **params)
+        searched.clear()
+        assert cdc.cdc_chunks(data, **params, previous=first) == fresh
+        # Only the chunks around the edit are searched and hashed again.
+        assert 0 < len(searched) <= 3 < len(list(cdc.iter_chunks(fresh[1])))
+
+
+def test_partitioned_scan_merges_in_walk_order(tmp_path: Path):
+    (tmp_path / "requirements.txt").write_text("numpy\n")
+    for i in range(7):
+        sub = tmp_path / f"d{i % 3}"
+        sub.mkdir(exist_ok=True)
+        (sub / f"m{i}.pt").write_bytes(bytes([i]) * (i + 1) * 10)
+    (tmp_path / "d1" / "big.bin").write_bytes(b"x" * 100)
+
+    partitions = partition_scan(str(tmp_path), max_files=3, max_bytes=90)
+    assert partitions[0].paths[0] == "requirements.txt"
+    assert ["d1/big.bin"] in [p.paths for p in partitions]
+    assert all(len(p.paths) <= 3 for p in partitions)
+
+    partials = [scan_partition(str(tmp_path), p.paths, p.index) for p in partitions]
+    merged = merge_partitions({"name": "x"}, list(reversed(partials)))
+    expected = scan_repository(str(tmp_path))
+
+    def key(c: dict) -> tuple:
+        return c["name"], c["type"], c["fingerprint"]
+
+    assert [key(c) for c in merged["components"]] == [key(c) for c in expected["components"]]
+    assert [t["partition"] for t in merged["scan_stats"]["partitions"]] == [p.index for p in partitions]
+
+
+def test_archive_members_become_child_components(tmp_path: Path):
+    import io
+    import tarfile
+    import zipfile
+
+    inner = io.BytesIO()
+    with tarfile.open(fileobj=inner, mode="w:gz") as tf:
+        data = b"GGUF" + b"\0" * 60
+        info = tarfile.TarInfo("weights/model.gguf")
+        info.size = len(data)
+        tf.addfile(info, io.BytesIO(data))
+    with zipfile.ZipFile(tmp_path / "bundle.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("README.md", "hello")
+        zf.writestr("data/train.csv", "a,b\n1,2\n")
+        zf.writestr("inner.tar.gz", inner.getvalue())
+
+    bom = scan_repository(str(tmp_path), scan_archives=True)
+    by_name = {c["name"]: c for c in bom["components"]}
+    assert list(by_name) == [
+        "bundle.zip",
+        "bundle.zip!/README.md",
+        "bundle.zip!/data/train.csv",
+        "bundle.zip!/inner.tar.gz",
+        "bundle.zip!/inner.tar.gz!/weights/model.gguf",
+    ]
+    assert by_name["bundle.zip"]["metadata"]["member_count"] == 4
+    gguf = by_name["bundle.zip!/inner.tar.gz!/weights/model.gguf"]
+    assert gguf["type"] == "model" and gguf["metadata"]["format"] == "gguf"
+    assert gguf["metadata"]["archive_member"] == ["inner.tar.gz", "weights/model.gguf"]
+    assert gguf["fingerprint"]["hash"] == hashlib.sha256(data).hexdigest()
+    assert by_name["bundle.zip!/inner.tar.gz"]["fingerprint"]["hash"] == hashlib.sha256(inner.getvalue()).hexdigest()
+    assert by_name["bundle.zip!/data/train.csv"]["type"] == "dataset"
+
+    limited = scan_repository(str(tmp_path), scan_archives=True, archive_max_depth=1, archive_max_bytes=10)
+    assert limited["components"][0]["metadata"] == {"format": "zip", "truncated": "max_bytes", "member_count": 1}
+    assert [c["name"] for c in scan_repository(str(tmp_path))["components"]] == []
+
+
+def test_nested_zip_members_are_read_once(tmp_path: Path):
+    import io
+    import tarfile
+    import zipfile
+
+    from ai_bom.services.archives import list_archive_members
+    from ai_bom.services.detectors import default_registry
+
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("weights.bin", b"w" * 4000)
+    inner_bytes = inner.getvalue()
+    with zipfile.ZipFile(tmp_path / "outer.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("inner.zip", inner_bytes)
+    with tarfile.open(tmp_path / "outer.tar", "w") as tf:
+        info = tarfile.TarInfo("inner.zip")
+        info.size = len(inner_bytes)
+        tf.addfile(info, io.BytesIO(inner_bytes))
+
+    # Each decompressed byte is charged once: the nested zip plus its member.
+    total = len(inner_bytes) + 4000
+    for name in ("outer.zip", "outer.tar"):
+        listing = list_archive_members(tmp_path / name, default_registry(), max_bytes=total)
+        assert "truncated" not in listing
+        assert [m["name"] for m in listing["members"]] == ["inner.zip", "weights.bin"]
+        assert listing["members"][0]["sha256"] == hashlib.sha256(inner_bytes).hexdigest()
+        assert listing["members"][1]["sha256"] == hashlib.sha256(b"w" * 4000).hexdigest()
+        short = list_archive_members(tmp_path / name, default_registry(), max_bytes=total - 1)
+        assert short["truncated"] == "max_bytes"
+
+
+def test_component_table_round_trips_scan_output(tmp_path: Path):
+    import json
+
+    from ai_bom.services.component_table import ComponentTable, iter_json
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "rows.csv").write_text("a,b\n1,2\n")
+    (tmp_path / "model.pt").write_bytes(b"weights")
+    (tmp_path / "requirements.txt").write_text("torch\n")
+    plain = scan_repository(str(tmp_path), jobs=1)
+    compact = scan_repository(str(tmp_path), jobs=1, compact=True)
+    table = compact["components"]
+    assert isinstance(table, ComponentTable)
+    assert len(table) == len(plain["components"])
+
+    def strip(c: dict) -> dict:
+        return {k: v for k, v in c.items() if k != "component_id"}
+
+    assert [strip(c) for c in table] == [strip(c) for c in plain["components"]]
+    assert ComponentTable(plain["components"])[:] == plain["components"]
+
+    as_lists = {**compact, "components": list(table)}
+    assert "".join(iter_json(compact, indent=2)) == json.dumps(as_lists, indent=2)
+    assert aggregate_bom_hash(compact) == aggregate_bom_hash(as_lists)
+
+    # Top-level values orjson encodes natively hash as they did before streaming.
+    import uuid
+    from datetime import datetime, timezone
+
+    typed = {
+        **as_lists,
+        "created_at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+        "project_id": uuid.UUID(int=7),
+        "tags": ("a", "b"),
+    }
+    assert aggregate_bom_hash(typed) == hashlib.sha256(canonical_json(typed)).hexdigest()
+    assert aggregate_bom_hash({**typed, "components": table}) == aggregate_bom_hash(typed)
+
+
+def test_verify_fingerprints_rehashes_origin_paths(tmp_path: Path):
+    from ai_bom.services.fingerprint_verify import verify_fingerprints
+
+    (tmp_path / "model.pt").write_bytes(b"weights" * 1000)
+    (tmp_path / "rows.csv").write_text("a,b\n1,2\n")
+    (tmp_path / "requirements.txt").write_text("torch\n")
+    bom = scan_repository(str(tmp_path), algorithms=["sha256", "sha512"])
+
+    report = verify_fingerprints(bom["components"], root=tmp_path, jobs=2)
+    assert report["checked"] == 3 and report["matched"] == 3
+    assert not report["mismatched"] and not report["missing"]
+
+    (tmp_path / "model.pt").write_bytes(b"retrained" * 1000)
+    (tmp_path / "rows.csv").unlink()
+    with FingerprintCache.for_directory(tmp_path) as cache:
+        report = verify_fingerprints(bom["components"], root=tmp_path, cache=cache)
+        assert [m["name"] for m in report["mismatched"]] == ["model.pt"]
+        assert report["mismatched"][0]["algorithms"] == ["sha256", "sha512"]
+        assert [m["name"] for m in report["missing"]] == ["rows.csv"]
+        again = verify_fingerprints(bom["components"], root=tmp_path, cache=cache)
+        assert again["cached"] == 2 and again["bytes"] == 0
+
+    first_failure = verify_fingerprints(bom["components"], root=tmp_path, fail_fast=True, jobs=1)
+    assert first_failure["stopped_early"]
+    assert len(first_failure["mismatched"]) + len(first_failure["missing"]) == 1
@@ -1,3 +1,5 @@
+import pathlib
+
 from ai_bom.services.signer import ed25519_keygen, load_private_key, sign_bom, verify_bom_signature
 
 
@@ -8,3 +10,112 @@ def test_sign_and_verify(tmp_path):
     signed = sign_bom(bom, private_key)
     assert verify_bom_signature(signed)
 
+
+
+def test_bulk_verify_checks_every_signature(tmp_path):
+    import json
+
+    from ai_bom.services.bulk_verify import expand_targets, verify_many
+    from ai_bom.services.signer import load_public_key
+
+    keys = tmp_path / "keys"
+    first_priv, first_pub, _ = ed25519_keygen(keys)
+    second_priv, _, _ = ed25519_keygen(keys)
+    first, second = load_private_key(first_priv), load_private_key(second_priv)
+    assert load_public_key(first_pub) is load_public_key(first_pub)
+
+    boms = tmp_path / "boms"
+    boms.mkdir()
+    base = {"name": "x", "version": "1", "components": [], "project_id": "p"}
+    docs = {
+        "a.json": sign_bom(sign_bom({**base, "bom_id": "a"}, first), second),
+        "b.json": sign_bom({**base, "bom_id": "b"}, second),
+        "c.json": sign_bom({**base, "bom_id": "c"}, first),
+        "d.json": {**base, "bom_id": "d"},
+    }
+    docs["c.json"]["name"] = "tampered"
+    for name, doc in docs.items():
+        (boms / name).write_text(json.dumps(doc))
+    (boms / "e.json").write_text("not json")
+
+    paths = expand_targets([str(boms), str(boms / "a.json"), str(boms / "*.json")])
+    assert [p.name for p in paths] == ["a.json", "b.json", "c.json", "d.json", "e.json"]
+    records = list(verify_many(paths, jobs=2))
+    assert [r["ok"] for r in records] == [True, True, False, False, False]
+    assert [s["ok"] for s in records[0]["signatures"]] == [True, True]
+    assert records[2]["signatures"][0]["error"] == "invalid signature"
+    assert records[3]["error"] == "no signatures"
+    assert "error" in records[4] and all("elapsed_ms" in r for r in records)
+
+    pem = pathlib.Path(first_pub).read_bytes()
+    trusted = list(verify_many(paths[:2], public_key_pem=pem, jobs=1))
+    assert [r["ok"] for r in trusted] == [True, False]
+    assert trusted[1]["error"] == "no signature by the trusted key"
+
+
+def test_merkle_signature_component_proofs(tmp_path):
+    from ai_bom.services.signer import component_proof, signatures_valid, verify_component_proof, verify_signatures
+
+    priv, _, _ = ed25519_keygen(tmp_path)
+    components = [
+        {"component_id": str(i), "type": "dataset", "name": f"shard-{i}", "fingerprint": {"algorithm": "sha256", "hash": f"{i:064x}"}}
+        for i in range(13)
+    ]
+    bom = {"bom_id": "b", "name": "x", "version": "1", "components": components}
+    signed = sign_bom(sign_bom(bom, load_private_key(priv), merkle=True), load_private_key(priv))
+    assert verify_bom_signature(signed)
+    assert [r["ok"] for r in verify_signatures(signed)] == [True, True]
+
+    for index in range(len(components)):
+        proof = component_proof(signed, index)
+        assert len(proof["siblings"]) <= 4
+        assert signatures_valid(verify_component_proof(proof))
+
+    proof = component_proof(signed, 5)
+    assert not signatures_valid(verify_component_proof({**proof, "component": components[6]}))
+    assert not signatures_valid(verify_component_proof({**proof, "index": 6}))
+    assert not signatures_valid(verify_component_proof({**proof, "siblings": proof["siblings"][:-1]}))
+    assert not signatures_valid(verify_component_proof({**proof, "header_hash": "00" * 32}))
+
+    signed["components"][5] = {**components[5], "name": "swapped"}
+    assert [r["ok"] for r in verify_signatures(signed)] == [False, False]
+
+
+def test_detached_signature_streams_the_bom(tmp_path):
+    import json
+
+    from typer.testing import CliRunner
+
+    from ai_bom.cli import app
+    from ai_bom.services.bulk_verify import verify_bom_file
+    from ai_bom.services.signer import (
+        bom_file_hash,
+        compute_bom_hash,
+        detached_signature_path,
+        sign_detached,
+        verify_detached,
+    )
+
+    priv, pub, _ = ed25519_keygen(tmp_path / "keys")
+    components = [{"component_id": str(i), "type": "model", "name": f"m{i}.pt", "metadata": {"size": i * 1.5}} for i in range(50)]
+    # "bom_id" sorts before "components" but is written after it, which needs a second pass.
+    bom = {"name": "x", "components": components, "version": "1", "bom_id": "b", "signatures": []}
+    bom_path = tmp_path / "bom.json"
+    bom_path.write_text(json.dumps(bom, indent=2))
+    assert bom_file_hash(bom_path) == compute_bom_hash({k: v for k, v in bom.items() if k != "signatures"})
+
+    before = bom_path.read_bytes()
+    sig_path = sign_detached(bom_path, load_private_key(priv))
+    sign_detached(bom_path, load_private_key(priv))
+    assert sig_path == detached_signature_path(bom_path) and bom_path.read_bytes() == before
+    assert [r["ok"] for r in verify_detached(bom_path)] == [True, True]
+    assert verify_bom_file(bom_path)["ok"]
+
+    runner = CliRunner()
+    assert runner.invoke(app, ["verify", str(bom_path), "--public-key-path", pub]).exit_code == 0
+    assert runner.invoke(app, ["deploy-check", "--dir", str(tmp_path)]).exit_code == 0
+
+    bom_path.write_text(json.dumps({**bom, "version": "2"}))
+    assert verify_detached(bom_path)[0]["error"] == "BOM changed since it was signed"
+    assert runner.invoke(app, ["verify", str(bom_path)]).exit_code == 1
+    assert runner.invoke(app, ["deploy-check", "--dir", str(tmp_path)]).exit_code == 3
@@ -0,0 +1,72 @@
+"""Measure the per-component memory of a list of component dicts against a ComponentTable.
+
+Usage (from the repo root, with backend/ on PYTHONPATH):
+
+    PYTHONPATH=backend python scripts/bench_components.py --count 1000000
+
+Components are synthetic dataset shards shaped like the scanner's output
+(shared git info, head-strategy fingerprint, format metadata). Memory is the
+tracemalloc delta of building each container, divided by the row count.
+"""
+
+import argparse
+import gc
+import hashlib
+import time
+import tracemalloc
+import uuid
+
+from ai_bom.services.component_table import ComponentTable
+
+
+def make_components(count, base):
+    git = {"repo": "https://github.com/example/datasets.git", "commit": "3f" * 20}
+    for i in range(count):
+        name = f"shards/train/part-{i // 1000:05d}/shard-{i:08d}.parquet"
+        yield {
+            "component_id": str(uuid.uuid4()),
+            "type": "dataset",
+            "name": name,
+            "origin": {"git": git, "path": f"{base}/{name}"},
+            "fingerprint": {
+                "algorithm": "sha256",
+                "hash": hashlib.sha256(name.encode()).hexdigest(),
+                "strategy": "head",
+                "params": {"bytes": 2 * 1024 * 1024},
+            },
+            "metadata": {"format": "parquet"},
+        }
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = build()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return container, size, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--base", default="/srv/checkout")
+    args = parser.parse_args()
+
+    print(f"{'container':>16} {'rows':>10} {'MiB':>9} {'bytes/row':>10} {'build s':>8}")
+    results = {}
+    for label, build in (
+        ("list of dicts", lambda: list(make_components(args.count, args.base))),
+        ("ComponentTable", lambda: ComponentTable(make_components(args.count, args.base))),
+    ):
+        container, size, seconds = measure(build)
+        results[label] = size / args.count
+        print(f"{label:>16} {args.count:>10} {size / 1024**2:>9.1f} {size / args.count:>10.0f} {seconds:>8.2f}")
+        del container
+    print(f"ComponentTable uses {results['list of dicts'] / results['ComponentTable']:.1f}x less memory per component")
+
+
+if __name__ == "__main__":
+    main()